@@ -0,0 +1,40 @@
+-- Moves messages stored in the conversations.messages JSON column into the messages table.
+-- Requires MySQL 8.0+ (JSON_TABLE). Safe to re-run: only conversations that still have a
+-- non-NULL messages column are migrated, and the column is cleared in the same transaction.
+
+USE p1_database;
+
+CREATE TABLE IF NOT EXISTS messages (
+    message_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    convo_id INT NOT NULL,
+    sender VARCHAR(100) NOT NULL,
+    text TEXT NOT NULL,
+    timestamp VARCHAR(50) NOT NULL,
+    INDEX idx_messages_convo_id (convo_id, message_id),
+    CONSTRAINT fk_messages_convo_id FOREIGN KEY (convo_id)
+        REFERENCES conversations (convo_id) ON DELETE CASCADE
+);
+
+START TRANSACTION;
+
+-- Lock the rows being migrated so concurrent writers cannot change them mid-migration.
+SELECT convo_id FROM conversations WHERE messages IS NOT NULL FOR UPDATE;
+
+-- Preserve the original array order through the ordinality column.
+INSERT INTO messages (convo_id, sender, text, timestamp)
+SELECT c.convo_id, m.sender, m.text, m.timestamp
+FROM conversations AS c,
+     JSON_TABLE(
+         c.messages, '$[*]' COLUMNS (
+             position FOR ORDINALITY,
+             sender VARCHAR(100) PATH '$.sender' DEFAULT '""' ON EMPTY,
+             text TEXT PATH '$.text' DEFAULT '""' ON EMPTY,
+             timestamp VARCHAR(50) PATH '$.timestamp' DEFAULT '""' ON EMPTY
+         )
+     ) AS m
+WHERE c.messages IS NOT NULL
+ORDER BY c.convo_id, m.position;
+
+UPDATE conversations SET messages = NULL WHERE messages IS NOT NULL;
+
+COMMIT;
@@ -0,0 +1,7 @@
+-- Adds the row version used for ETags and If-Match optimistic concurrency.
+-- Every change to a conversation or its messages increments it.
+
+USE p1_database;
+
+ALTER TABLE conversations
+    ADD COLUMN version INT NOT NULL DEFAULT 1;
@@ -6,6 +6,18 @@ CREATE TABLE IF NOT EXISTS conversations (
     convo_id INT AUTO_INCREMENT PRIMARY KEY,
     name VARCHAR(100) NOT NULL,
     participants JSON NOT NULL,  -- Assuming participants are stored as a JSON array
-    messages JSON DEFAULT NULL,    -- Assuming messages are stored as a JSON array
-    isGroup BOOLEAN NOT NULL DEFAULT FALSE
+    messages JSON DEFAULT NULL,    -- Legacy JSON array of messages; superseded by the messages table
+    isGroup BOOLEAN NOT NULL DEFAULT FALSE,
+    version INT NOT NULL DEFAULT 1  -- Incremented on every change to the conversation or its messages
+);
+
+CREATE TABLE IF NOT EXISTS messages (
+    message_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    convo_id INT NOT NULL,
+    sender VARCHAR(100) NOT NULL,
+    text TEXT NOT NULL,
+    timestamp VARCHAR(50) NOT NULL,
+    INDEX idx_messages_convo_id (convo_id, message_id),  -- Reads a conversation's messages in order
+    CONSTRAINT fk_messages_convo_id FOREIGN KEY (convo_id)
+        REFERENCES conversations (convo_id) ON DELETE CASCADE
 );
\ No newline at end of file
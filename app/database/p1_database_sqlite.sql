@@ -0,0 +1,22 @@
+-- SQLite schema of p1_database, for DB_BACKEND=sqlite. SQLiteRDBDataService attaches the
+-- database file under the name p1_database and runs this script on startup.
+
+CREATE TABLE IF NOT EXISTS p1_database.conversations (
+    convo_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(100) NOT NULL,
+    participants TEXT NOT NULL,    -- JSON array of participant names
+    messages TEXT DEFAULT NULL,    -- Legacy JSON array of messages; superseded by the messages table
+    isGroup BOOLEAN NOT NULL DEFAULT FALSE,
+    version INT NOT NULL DEFAULT 1  -- Incremented on every change to the conversation or its messages
+);
+
+CREATE TABLE IF NOT EXISTS p1_database.messages (
+    message_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    convo_id INT NOT NULL REFERENCES conversations (convo_id) ON DELETE CASCADE,
+    sender VARCHAR(100) NOT NULL,
+    text TEXT NOT NULL,
+    timestamp VARCHAR(50) NOT NULL
+);
+
+-- Reads a conversation's messages in order
+CREATE INDEX IF NOT EXISTS p1_database.idx_messages_convo_id ON messages (convo_id, message_id);
@@ -1,14 +1,35 @@
 import uuid
+from contextlib import asynccontextmanager
 from fastapi import Depends, FastAPI, Request
 import logging
 import uvicorn
 import time
-from app.routers import conversations
+from app.routers import conversations, diagnostics, metrics
+from framework.utils.CodecJSONResponse import CodecJSONResponse
+from framework.middleware.MetricsMiddleware import MetricsMiddleware
+from framework.utils.StructuredLogging import configure_logging, trace_id_var
+from framework.services.data_access.ReplicatedDataService import prefer_primary
+from app.services.service_factory import ServiceFactory
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 
+# .env settings apply to logging too, so load them first
+ServiceFactory.load_environment()
+# JSON log records, written by a background thread; see framework/utils/StructuredLogging.py
+configure_logging()
+logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open DB connections and fill caches before the instance takes traffic ...
+    await ServiceFactory.startup()
+    yield
+    # ... and let in-flight work finish before the connections close
+    await ServiceFactory.shutdown()
+
+
+app = FastAPI(default_response_class=CodecJSONResponse, lifespan=lifespan)
 
 
 # Configure CORS
@@ -21,30 +42,55 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+# Request latency histograms, served with the other metrics at /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(conversations.router)
+app.include_router(diagnostics.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 async def root():
     return {"message": "Chat service running"}
 
+# Clients that wrote recently read from the primary, not from a replica that may lag behind
+read_your_writes = ServiceFactory.get_service('ReadYourWrites')
+
+
+@app.middleware("http")
+async def route_reads(request: Request, call_next):
+    # Only clients that send a stable X-Client-Id are pinned; an address may be a shared proxy
+    client_key = read_your_writes.client_key(request.headers)
+    writes = request.method not in ("GET", "HEAD", "OPTIONS")
+    if writes or read_your_writes.pinned(client_key):
+        prefer_primary.set(True)
+    response = await call_next(request)
+    if writes and response.status_code < 400:
+        read_your_writes.record_write(client_key)
+    return response
+
 @app.middleware("http")
 async def log_requests (request: Request, call_next):
     trace_id = str(uuid.uuid4())
     request.state.trace_id = trace_id  # Attach trace_id to request state for access within handlers
-    logging.info(f"TRACE_ID={trace_id} - Incoming Request: {request.method} {request.url}")
+    trace_id_var.set(trace_id)  # ... and to every log record written while handling the request
+    path = request.url.path
+    logger.debug("TRACE_ID=%s - Incoming Request: %s %s", trace_id, request.method, path)
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     response = await call_next(request)
-    processing_time = time.time() - start_time
+    processing_time = time.perf_counter() - start_time
 
-    logging.info(
-        f"TRACE_ID={trace_id} - Completed Request: {request.method} {request.url} "
-        f"with Status {response.status_code} in {processing_time:.4f}s"
+    # Arguments are only formatted if the record is written, on the logging thread
+    logger.info(
+        "TRACE_ID=%s - Completed Request: %s %s with Status %s in %.4fs",
+        trace_id, request.method, path, response.status_code, processing_time,
+        extra={"method": request.method, "path": path, "status": response.status_code,
+               "duration_s": round(processing_time, 6)},
     )
     response.headers["X-Trace-Id"] = trace_id  # Include trace ID in response headers
     return response
 
-
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8080)
\ No newline at end of file
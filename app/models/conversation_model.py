@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 from typing import Optional, List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class Message(BaseModel):
     text: str
-    sender: str
-    timestamp: str
+    sender: str = Field(max_length=100)  # Column sizes of the messages table
+    timestamp: str = Field(max_length=50)
 
 class Conversation(BaseModel):
     id: Optional[int] = None  # Optional for cases when creating a new conversation
@@ -28,4 +28,11 @@ class Conversation(BaseModel):
                 ],
                 "is_group": False
             }
-        }
\ No newline at end of file
+        }
+
+class ConversationCreate(BaseModel):
+    """Request body of one conversation in a bulk creation request."""
+    name: str = Field(max_length=100)
+    participants: List[str]
+    messages: List[Message] = []
+    isGroup: bool = False
@@ -1,54 +1,402 @@
+import asyncio
 import logging
+import os
+import time
+from contextlib import aclosing
 from typing import Any, List, Optional
-import asyncio
+from framework.services.data_access.AsyncDataService import AsyncDataService
+from framework.services.data_access.BaseDataService import StaleRecordError
+from framework.services.data_access.ReplicatedDataService import prefer_primary
+from framework.utils.JSONCodec import get_codec
 
 # Configure logger
 logger = logging.getLogger("ConversationResource")
 logger.setLevel(logging.INFO)  # Adjust log level as needed
 
+# Fields of a conversation as returned by the API
+CONVERSATION_FIELDS = ("convo_id", "name", "participants", "messages", "isGroup", "version")
+
+# Summary view: everything except the message history
+SUMMARY_FIELDS = ("convo_id", "name", "participants", "isGroup", "version")
+
+# Fields holding JSON text (MySQL JSON columns, or assembled as JSON like messages)
+JSON_FIELDS = ("participants", "messages")
+
+# Reads that take longer than this many seconds do not fill the cache (see _may_fill)
+FILL_HORIZON = 60.0
+
 class ConversationResource:
-    def __init__(self):
+    def __init__(self, data_service=None, cache=None, replica_lag: Optional[float] = None):
+        """
+        :param replica_lag: Seconds a read replica may lag behind the primary. Defaults to
+            DB_READ_YOUR_WRITES_WINDOW when the data service has replicas, else 0.
+        """
         from app.services.service_factory import ServiceFactory
-        self.data_service = ServiceFactory.get_service('ConversationResourceService')
+        if data_service is None:
+            data_service = ServiceFactory.get_service('ConversationResourceService')
+        # Read-through cache for single conversations, invalidated on every write
+        self.cache = cache if cache is not None else ServiceFactory.get_service('ConversationCache')
+        if replica_lag is None:
+            replica_lag = float(os.getenv("DB_READ_YOUR_WRITES_WINDOW", 5)) if getattr(data_service, "replicas", None) else 0.0
+        self.replica_lag = replica_lag
+        # convo_id -> time.monotonic() of its last write, oldest first; fences out stale cache fills
+        self._written = {}
+        # All database calls run on the data service executor, never on the event loop thread.
+        self.data_service = AsyncDataService(
+            data_service,
+            timeout=getattr(data_service, "context", {}).get("query_timeout", 30.0)
+        )
 
-    async def create_conversation(self, conversation: dict) -> dict:
+    async def start(self):
+        """
+        Open the pooled connections and, if CACHE_WARM_CONVERSATIONS is set, load that many
+        conversations into the cache, so that the first requests do not pay for either.
+        Failures are logged; the instance still starts and warms up on demand.
+        """
+        warm = getattr(self.data_service.data_service, "warm", None)
         try:
-            inserted_id = await asyncio.to_thread(
-                self.data_service.insert,
+            if warm is not None:
+                await self.data_service.run(warm)
+            count = int(os.getenv("CACHE_WARM_CONVERSATIONS", 0))
+            if count > 0:
+                conversations = await self.get_conversations_after(None, count)
+                await asyncio.gather(*[self.cache.set(self._cache_key(conversation["convo_id"]), conversation)
+                                       for conversation in conversations])
+                logger.info("Cached %s conversations ahead of traffic.", len(conversations))
+        except Exception as e:
+            logger.warning(f"Could not warm up the conversation resource: {str(e)}")
+
+    async def stop(self):
+        """Wait for the data service calls in flight, then stop its executor."""
+        await asyncio.to_thread(self.data_service.shutdown, True)
+
+    @staticmethod
+    def _message_rows(conversation_id: int, messages: List[dict]) -> List[dict]:
+        """Map API message objects onto rows of the messages table."""
+        return [
+            {
+                "convo_id": conversation_id,
+                "sender": message["sender"],
+                "text": message["text"],
+                "timestamp": message["timestamp"]
+            }
+            for message in messages
+        ]
+
+    async def _attach_messages(self, conversations: List[dict]) -> List[dict]:
+        """
+        Assemble the messages of each conversation from the messages table, oldest first.
+
+        The result is stored in the conversation's messages field as a JSON array string,
+        the same representation the legacy JSON column has. Conversations that have no rows
+        in the messages table but still carry a legacy column value (i.e. have not been
+        migrated yet) keep that value. Appends move that value into the table first (see
+        _move_legacy_messages), so a conversation never has messages in both.
+        """
+        if not conversations:
+            return conversations
+        rows = await self.data_service.fetch_many(
+            database_name="p1_database",
+            table="messages",
+            key_field="convo_id",
+            key_values=[conversation["convo_id"] for conversation in conversations],
+            order_by="convo_id, message_id"
+        )
+        by_conversation = {}
+        for row in rows:
+            by_conversation.setdefault(row["convo_id"], []).append(
+                {"text": row["text"], "sender": row["sender"], "timestamp": row["timestamp"]}
+            )
+        for conversation in conversations:
+            messages = by_conversation.get(conversation["convo_id"])
+            if messages is not None or conversation.get("messages") is None:
+                conversation["messages"] = get_codec().dumps_str(messages or [])
+        return conversations
+
+    def _move_legacy_messages(self, data_service, connection, conversation_ids: List[int]) -> set:
+        """
+        Move the legacy messages column of the given conversations into the messages table and
+        clear it, as migrations/001_messages_table.sql does. Call it in the transaction of a write
+        to the table, after the conversation rows are locked, so the legacy messages get the lower
+        message_ids and keep their place before the new ones.
+
+        :return: The IDs of the conversations that exist.
+        """
+        rows = data_service.fetch_many(
+            database_name="p1_database",
+            table="conversations",
+            key_field="convo_id",
+            key_values=conversation_ids,
+            columns=["convo_id", "messages"],
+            connection=connection
+        )
+        for row in rows:
+            if row["messages"] is None:
+                continue
+            legacy = get_codec().loads(row["messages"]) or []
+            if legacy:
+                data_service.insert_many(
+                    database_name="p1_database",
+                    table="messages",
+                    rows=self._message_rows(row["convo_id"], [
+                        {field: message.get(field, "") for field in ("sender", "text", "timestamp")}
+                        for message in legacy
+                    ]),
+                    connection=connection,
+                    return_ids=False
+                )
+            data_service.update(
                 database_name="p1_database",
                 table="conversations",
-                data=conversation
+                data={"messages": None},
+                key_field="convo_id",
+                key_value=row["convo_id"],
+                connection=connection
             )
-            logger.info(f"Conversation created successfully with ID {inserted_id}.")
+            logger.info("Moved %s legacy messages of conversation %s into the messages table.",
+                        len(legacy), row["convo_id"])
+        return {row["convo_id"] for row in rows}
+
+    @staticmethod
+    def _columns(fields: Optional[List[str]]) -> Optional[List[str]]:
+        """
+        SQL column list for a field selection; convo_id and version (needed for the ETag) are
+        always included. None selects every column.
+        """
+        if fields is None:
+            return None
+        return ["convo_id", "version"] + [field for field in fields if field not in ("convo_id", "version")]
+
+    async def _complete(self, conversations: List[dict], fields: Optional[List[str]] = None) -> List[dict]:
+        """Attach messages to freshly read conversations, unless the field selection leaves them out."""
+        if fields is None or "messages" in fields:
+            await self._attach_messages(conversations)
+        return conversations
+
+    @classmethod
+    def _project(cls, conversation: dict, fields: Optional[List[str]]) -> dict:
+        """Reduce a full conversation (e.g. from the cache) to the selected fields."""
+        if fields is None:
+            return conversation
+        return {field: conversation[field] for field in cls._columns(fields) if field in conversation}
+
+    @staticmethod
+    def _cache_key(conversation_id: int) -> str:
+        return f"conversation:{conversation_id}"
+
+    async def invalidate_conversation(self, conversation_id: int) -> None:
+        """Drop a conversation from the cache after it has been written."""
+        now = time.monotonic()
+        self._written.pop(conversation_id, None)
+        self._written[conversation_id] = now
+        # Writes older than any read that may still fill the cache can no longer fence one out
+        while len(self._written) > 1024:
+            oldest = next(iter(self._written))
+            if self._written[oldest] >= now - self.replica_lag - FILL_HORIZON:
+                break
+            del self._written[oldest]
+        await self.cache.delete(self._cache_key(conversation_id))
+
+    def _may_fill(self, conversation_id: int, read_started: float) -> bool:
+        """
+        Whether a row read at read_started may be cached. Not if the conversation was written
+        since (the row may predate the write, and the writer's invalidation has already run),
+        nor shortly before, within replica_lag (the row may come from a replica that has not
+        applied the write yet). Writes made by other instances sharing the cache are not seen.
+        """
+        if time.monotonic() - read_started > FILL_HORIZON:
+            return False
+        written = self._written.get(conversation_id)
+        return written is None or written < read_started - self.replica_lag
+
+    async def _fill(self, conversations: List[dict], read_started: float) -> None:
+        """Cache the full conversations read at read_started, unless a write fences them out."""
+        conversations = [c for c in conversations if self._may_fill(c["convo_id"], read_started)]
+        await asyncio.gather(*[self.cache.set(self._cache_key(c["convo_id"]), c) for c in conversations])
+        # A write may have invalidated an entry while it was being stored; drop it again
+        stale = [c["convo_id"] for c in conversations if not self._may_fill(c["convo_id"], read_started)]
+        await asyncio.gather(*[self.cache.delete(self._cache_key(i)) for i in stale])
+
+    def cache_stats(self) -> dict:
+        """Hit, miss and eviction counters of the conversation cache."""
+        return self.cache.stats()
+
+    def pool_stats(self) -> Optional[dict]:
+        """Connection pool metrics of the underlying data service, if it has a pool."""
+        pool_stats = getattr(self.data_service.data_service, "pool_stats", None)
+        return pool_stats() if pool_stats else None
+
+    def statement_stats(self) -> Optional[dict]:
+        """Statement cache metrics of the underlying data service, if it has a statement cache."""
+        statement_stats = getattr(self.data_service.data_service, "statement_stats", None)
+        return statement_stats() if statement_stats else None
+
+    def query_report(self, limit: int = 20, sort: str = "total") -> Optional[dict]:
+        """Most expensive statement shapes and recent slow queries, if the data service profiles its queries."""
+        query_report = getattr(self.data_service.data_service, "query_report", None)
+        return query_report(limit, sort) if query_report else None
+
+    def reset_query_report(self) -> None:
+        """Start the query profile over, e.g. before a load test."""
+        profiler = getattr(self.data_service.data_service, "profiler", None)
+        if profiler is not None:
+            profiler.reset()
+
+    async def create_conversation(self, conversation: dict, messages: Optional[List[dict]] = None) -> dict:
+        def create(data_service, connection):
+            convo_id = data_service.insert(
+                database_name="p1_database",
+                table="conversations",
+                data=conversation,
+                connection=connection
+            )
+            if messages:
+                data_service.insert_many(
+                    database_name="p1_database",
+                    table="messages",
+                    rows=self._message_rows(convo_id, messages),
+                    connection=connection,
+                    return_ids=False
+                )
+            return convo_id
+
+        try:
+            inserted_id = await self.data_service.run_in_transaction(create)
+            logger.info("Conversation created successfully with ID %s.", inserted_id)
             return {"convo_id": inserted_id}  # Return as a dictionary for consistency
         except Exception as e:
             logger.error(f"Error creating conversation: {str(e)}")
             raise Exception(f"{str(e)}")
     
-    def update_conversation(self, conversation_id: int, conversation: dict) -> dict:
+    async def create_conversations(self, conversations: List[dict], messages: List[List[dict]]) -> List[int]:
+        """
+        Create many conversations in one transaction using multi-row INSERTs.
+
+        :param conversations: Conversation rows to insert.
+        :param messages: For each conversation, its messages (may be empty).
+        :return: The new conversation IDs, in the order of conversations.
+        """
+        def create(data_service, connection):
+            convo_ids = data_service.insert_many(
+                database_name="p1_database",
+                table="conversations",
+                rows=conversations,
+                connection=connection
+            )
+            message_rows = [
+                row
+                for convo_id, conversation_messages in zip(convo_ids, messages)
+                for row in self._message_rows(convo_id, conversation_messages)
+            ]
+            data_service.insert_many(
+                database_name="p1_database",
+                table="messages",
+                rows=message_rows,
+                connection=connection,
+                return_ids=False
+            )
+            return convo_ids
+
         try:
-            self.data_service.update(
+            convo_ids = await self.data_service.run_in_transaction(create)
+            logger.info("Created %s conversations in bulk.", len(convo_ids))
+            return convo_ids
+        except Exception as e:
+            logger.error(f"Error creating conversations in bulk: {str(e)}")
+            raise Exception(f"{str(e)}")
+
+    async def update_conversation(self, conversation_id: int, conversation: dict,
+                                  messages: Optional[List[dict]] = None,
+                                  expected_version: Optional[int] = None) -> dict:
+        """
+        Update a conversation and increment its version. When messages is given, it replaces the
+        stored message history. When expected_version is given, the update only applies if the
+        stored version still equals it; otherwise StaleRecordError is raised.
+        """
+        def update(data_service, connection):
+            data_service.update(
                 database_name="p1_database",
                 table="conversations",
-                data=conversation, 
+                data=conversation,
                 key_field="convo_id",
-                key_value=conversation_id
+                key_value=conversation_id,
+                connection=connection,
+                match={"version": expected_version} if expected_version is not None else None,
+                increment="version"
             )
-            logger.info(f"Conversation with ID {conversation_id} updated successfully.")
+            if messages is not None:
+                data_service.delete_where(
+                    database_name="p1_database",
+                    table="messages",
+                    key_field="convo_id",
+                    key_value=conversation_id,
+                    connection=connection
+                )
+                data_service.insert_many(
+                    database_name="p1_database",
+                    table="messages",
+                    rows=self._message_rows(conversation_id, messages),
+                    connection=connection,
+                    return_ids=False
+                )
+
+        try:
+            await self.data_service.run_in_transaction(update)
+            await self.invalidate_conversation(conversation_id)
+            logger.info("Conversation with ID %s updated successfully.", conversation_id)
+        except StaleRecordError:
+            logger.warning(f"Conversation with ID {conversation_id} was modified since version {expected_version}.")
+            raise
         except Exception as e:
             logger.error(f"Error updating conversation with ID {conversation_id}: {str(e)}")
             raise Exception(f"{str(e)}")
 
-    def get_conversation(self, conversation_id: int) -> Optional[dict]:
+    async def get_conversation_version(self, conversation_id: int) -> Optional[int]:
+        """
+        Return the conversation's current version, or None if it does not exist. Reads only the
+        primary key and version column, from the primary: conditional requests must not be
+        decided on a cached or replicated copy that may be behind.
+        """
+        token = prefer_primary.set(True)
         try:
-            result = self.data_service.fetch_one(
+            row = await self.data_service.fetch_one(
                 database_name="p1_database",
                 table="conversations",
                 key_field="convo_id",
-                key_value=conversation_id
+                key_value=conversation_id,
+                columns=["convo_id", "version"]
+            )
+            return row["version"] if row else None
+        except Exception as e:
+            logger.error(f"Error retrieving version of conversation with ID {conversation_id}: {str(e)}")
+            raise Exception(f"{str(e)}")
+        finally:
+            prefer_primary.reset(token)
+
+    async def get_conversation(self, conversation_id: int, fields: Optional[List[str]] = None) -> Optional[dict]:
+        """
+        Fetch one conversation, optionally only the given fields. Only full reads populate
+        the cache, but projected reads are served from it when the entry is present.
+        """
+        try:
+            cached = await self.cache.get(self._cache_key(conversation_id))
+            if cached is not None:
+                logger.info("Conversation with ID %s served from cache.", conversation_id)
+                return self._project(cached, fields)
+
+            read_started = time.monotonic()
+            result = await self.data_service.fetch_one(
+                database_name="p1_database",
+                table="conversations",
+                key_field="convo_id",
+                key_value=conversation_id,
+                columns=self._columns(fields)
             )
             if result:
-                logger.info(f"Conversation with ID {conversation_id} retrieved successfully.")
+                await self._complete([result], fields)
+                if fields is None:
+                    await self._fill([result], read_started)
+                logger.info("Conversation with ID %s retrieved successfully.", conversation_id)
             else:
                 logger.warning(f"No conversation found with ID {conversation_id}.")
             return result
@@ -56,54 +404,237 @@ class ConversationResource:
             logger.error(f"Error retrieving conversation with ID {conversation_id}: {str(e)}")
             raise Exception(f"{str(e)}")
 
-    def get_all_conversations(self) -> List[dict]:
+    async def get_conversations(self, conversation_ids: List[int], fields: Optional[List[str]] = None) -> dict:
+        """
+        Fetch many conversations at once: cached ones from the cache, the rest with a single
+        IN query.
+
+        :return: A dict mapping convo_id to conversation for every ID that exists.
+        """
+        try:
+            cached = await asyncio.gather(*[self.cache.get(self._cache_key(i)) for i in conversation_ids])
+            found = {i: self._project(conversation, fields)
+                     for i, conversation in zip(conversation_ids, cached) if conversation is not None}
+            misses = [i for i in conversation_ids if i not in found]
+            if misses:
+                read_started = time.monotonic()
+                rows = await self.data_service.fetch_many(
+                    database_name="p1_database",
+                    table="conversations",
+                    key_field="convo_id",
+                    key_values=misses,
+                    columns=self._columns(fields)
+                )
+                await self._complete(rows, fields)
+                if fields is None:
+                    await self._fill(rows, read_started)
+                found.update((row["convo_id"], row) for row in rows)
+            logger.info("Retrieved %s of %s conversations (%s from cache).",
+                        len(found), len(conversation_ids), len(conversation_ids) - len(misses))
+            return found
+        except Exception as e:
+            logger.error(f"Error retrieving conversations {conversation_ids}: {str(e)}")
+            raise Exception(f"{str(e)}")
+
+    async def get_all_conversations(self, fields: Optional[List[str]] = None) -> List[dict]:
         try:
-            result = self.data_service.fetch_all(
+            result = await self.data_service.fetch_all(
                 database_name="p1_database",
-                table="conversations"
+                table="conversations",
+                columns=self._columns(fields)
             )
-            logger.info(f"Successfully retrieved {len(result)} conversations.")
+            await self._complete(result, fields)
+            logger.info("Successfully retrieved %s conversations.", len(result))
             return result
         except Exception as e:
             logger.error(f"Error retrieving all conversations: {str(e)}")
             raise Exception(f"{str(e)}")
 
-    def get_paginated_conversations(self, page: int, limit: int) -> List[dict]:
+    async def stream_conversations(self, batch_size: int = 500, fields: Optional[List[str]] = None):
+        """Async generator yielding all conversations, with their messages, in batches of batch_size."""
+        streamed = 0
+        try:
+            async with aclosing(self.data_service.stream(
+                "stream_all",
+                database_name="p1_database",
+                table="conversations",
+                batch_size=batch_size,
+                order_by="convo_id",
+                columns=self._columns(fields)
+            )) as batches:
+                async for conversations in batches:
+                    await self._complete(conversations, fields)
+                    streamed += len(conversations)
+                    yield conversations
+            logger.info("Successfully streamed %s conversations.", streamed)
+        except Exception as e:
+            logger.error(f"Error streaming conversations after {streamed} rows: {str(e)}")
+            raise Exception(f"{str(e)}")
+
+    async def get_paginated_conversations(self, page: int, limit: int, fields: Optional[List[str]] = None) -> List[dict]:
         try:
             offset = (page - 1) * limit
-            conversations = self.data_service.fetch_paginated(
+            conversations = await self.data_service.fetch_paginated(
                 database_name="p1_database",
                 table="conversations",
                 offset=offset,
-                limit=limit
+                limit=limit,
+                order_by="convo_id",  # Stable page boundaries
+                columns=self._columns(fields)
             )
-            logger.info(f"Successfully retrieved {len(conversations)} conversations (page: {page}, limit: {limit}).")
+            await self._complete(conversations, fields)
+            logger.info("Successfully retrieved %s conversations (page: %s, limit: %s).", len(conversations), page, limit)
             return conversations
         except Exception as e:
             logger.error(f"Error retrieving paginated conversations: {str(e)}")
             raise Exception(f"{str(e)}")
 
-    def delete_conversation(self, conversation_id: int) -> None:
+    async def get_conversations_after(self, last_convo_id: Optional[int], limit: int,
+                                      fields: Optional[List[str]] = None) -> List[dict]:
+        """
+        Fetch up to limit conversations with convo_id greater than last_convo_id, in convo_id
+        order. Pass None to start from the beginning.
+        """
         try:
-            self.data_service.delete(
+            conversations = await self.data_service.fetch_range(
+                database_name="p1_database",
+                table="conversations",
+                key_field="convo_id",
+                limit=limit,
+                after=last_convo_id,
+                columns=self._columns(fields)
+            )
+            await self._complete(conversations, fields)
+            logger.info("Successfully retrieved %s conversations after ID %s (limit: %s).", len(conversations), last_convo_id, limit)
+            return conversations
+        except Exception as e:
+            logger.error(f"Error retrieving conversations after ID {last_convo_id}: {str(e)}")
+            raise Exception(f"{str(e)}")
+
+    async def get_messages_before(self, conversation_id: int, before_message_id: Optional[int],
+                                  limit: int) -> Optional[List[dict]]:
+        """
+        Fetch up to limit messages of a conversation with message_id below before_message_id,
+        newest first. Pass None to start from the newest message. This is a range seek on the
+        (convo_id, message_id) index, so its cost depends on limit, not on the history length.
+
+        :return: The messages, or None if the conversation does not exist.
+        """
+        try:
+            rows = await self.data_service.fetch_range(
+                database_name="p1_database",
+                table="messages",
+                key_field="message_id",
+                limit=limit,
+                before=before_message_id,
+                descending=True,
+                columns=["message_id", "sender", "text", "timestamp"],
+                filters={"convo_id": conversation_id}
+            )
+            if not rows:
+                # Only an empty page needs to tell an empty conversation from a missing one.
+                existing = await self.data_service.existing_keys(
+                    database_name="p1_database",
+                    table="conversations",
+                    key_field="convo_id",
+                    key_values=[conversation_id]
+                )
+                if not existing:
+                    return None
+            logger.info("Retrieved %s messages of conversation %s before %s.", len(rows), conversation_id, before_message_id)
+            return rows
+        except Exception as e:
+            logger.error(f"Error retrieving messages of conversation {conversation_id}: {str(e)}")
+            raise Exception(f"{str(e)}")
+
+    async def append_messages(self, conversation_id: int, messages: List[dict]) -> Optional[List[int]]:
+        """
+        Append messages to a conversation without touching its existing history.
+
+        :return: The IDs of the new messages in order, or None if the conversation does not exist.
+        """
+        return (await self.append_messages_batch([(conversation_id, messages)]))[0]
+
+    async def append_messages_batch(self, appends: List[tuple]) -> List[Optional[List[int]]]:
+        """
+        Apply several message appends, possibly to different conversations, in one transaction
+        with one version bump, one existence check and one multi-row INSERT.
+
+        :param appends: (conversation_id, messages) pairs.
+        :return: For each pair, the IDs of its new messages, or None if the conversation does not exist.
+        """
+        def append(data_service, connection):
+            # The version bump locks the conversation rows before their legacy messages are read
+            data_service.increment(
+                database_name="p1_database",
+                table="conversations",
+                field="version",
+                key_field="convo_id",
+                key_values=conversation_ids,
+                connection=connection
+            )
+            existing = self._move_legacy_messages(data_service, connection, conversation_ids)
+            rows = [
+                row
+                for conversation_id, messages in appends if conversation_id in existing
+                for row in self._message_rows(conversation_id, messages)
+            ]
+            message_ids = iter(data_service.insert_many(
+                database_name="p1_database",
+                table="messages",
+                rows=rows,
+                connection=connection
+            ))
+            return [
+                [next(message_ids) for _ in messages] if conversation_id in existing else None
+                for conversation_id, messages in appends
+            ]
+
+        conversation_ids = sorted({conversation_id for conversation_id, _ in appends})
+        try:
+            results = await self.data_service.run_in_transaction(append)
+            await asyncio.gather(*[self.invalidate_conversation(i) for i in conversation_ids])
+            appended = sum(len(message_ids) for message_ids in results if message_ids is not None)
+            logger.info("Appended %s messages to conversations %s.", appended, conversation_ids)
+            return results
+        except Exception as e:
+            logger.error(f"Error appending messages to conversations {conversation_ids}: {str(e)}")
+            raise Exception(f"{str(e)}")
+
+    async def delete_conversation(self, conversation_id: int) -> None:
+        try:
+            await self.data_service.delete(
                 database_name="p1_database",
                 table="conversations",
                 key_field="convo_id",
                 key_value=conversation_id
             )
-            logger.info(f"Conversation with ID {conversation_id} deleted successfully.")
+            await self.invalidate_conversation(conversation_id)
+            logger.info("Conversation with ID %s deleted successfully.", conversation_id)
         except Exception as e:
             logger.error(f"Error deleting conversation with ID {conversation_id}: {str(e)}")
             raise Exception(f"Error deleting conversation: {str(e)}")
         
-    def get_total_conversation_count(self) -> int:
+    async def get_total_conversation_count(self) -> int:
         try:
-            count = self.data_service.count_all(
+            count = await self.data_service.count_all(
                 database_name="p1_database",
                 table="conversations"
             )
-            logger.info(f"Total conversations count: {count}.")
+            logger.info("Total conversations count: %s.", count)
             return count
         except Exception as e:
             logger.error(f"Error retrieving total conversation count: {str(e)}")
-            raise Exception(f"Error retrieving total conversation count: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error retrieving total conversation count: {str(e)}")
+
+    async def estimate_conversation_count(self) -> int:
+        try:
+            count = await self.data_service.estimate_count(
+                database_name="p1_database",
+                table="conversations"
+            )
+            logger.info("Estimated conversations count: %s.", count)
+            return count
+        except Exception as e:
+            logger.error(f"Error estimating conversation count: {str(e)}")
+            raise Exception(f"Error estimating conversation count: {str(e)}")
@@ -1,43 +1,104 @@
 import logging
 from urllib.parse import urlencode
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Request
-from typing import Optional
-from app.services.conversation_service import ConversationService
-from fastapi.responses import JSONResponse
-import uuid
-import asyncio
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,  # Set the logging level to INFO
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import List, Optional, Union
+from app.models.conversation_model import Message
+from app.services.conversation_service import conversation_channel
+from app.services.service_factory import ServiceFactory
+from framework.services.jobs.JobRunner import QueueFullError, TooManyWaitersError
+from framework.services.events.EventHub import SubscriptionClosed
+from fastapi.responses import Response, StreamingResponse
+from app.utils.etags import content_etag, conversation_etag, etag_matches, parse_conversation_etag
+from contextlib import aclosing
+from app.resources.conversation_resource import JSON_FIELDS
+from framework.utils.CodecJSONResponse import CodecJSONResponse
+from framework.utils.JSONCodec import RawJSON, get_codec
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-conversation_service = ConversationService()
+# Created and warmed up by the application's lifespan (see ServiceFactory.startup), or on first use
+conversation_service = ServiceFactory.lazy('ConversationService')
+
+# Page size used by cursor pagination when the client does not pass limit
+DEFAULT_PAGE_LIMIT = 20
+
+# Rows read from the database and flushed to the client at a time when streaming
+STREAM_BATCH_SIZE = 200
+
+# Largest number of conversations accepted by one bulk creation request
+BULK_MAX_ITEMS = 1000
+
+# Largest number of conversations fetched by one batch read
+BATCH_MAX_IDS = 100
+
+# Page size for GET /conversations/{id}/messages
+DEFAULT_MESSAGE_PAGE_LIMIT = 50
+MAX_MESSAGE_PAGE_LIMIT = 200
+
+# Seconds between keep-alive comments on an idle event stream
+EVENT_HEARTBEAT_INTERVAL = 15
+
+# Longest a GET /tasks/{task_id}?wait= request may be held open, in seconds
+MAX_TASK_WAIT = 60
 
-# Simulate a task store to track background task statuses
-task_store = {}
+# Longest a GET /tasks/{task_id}/events stream stays open, in seconds
+TASK_EVENTS_TIMEOUT = 300
 
-# To store background task if operation is too long
-async def process_conversation_creation(task_id: str, conversation: dict): 
+
+def spliced(conversation: dict) -> dict:
+    """
+    Return a copy of conversation whose JSON text columns are marked RawJSON, so the codec
+    writes them into the response as arrays without decoding and re-encoding them.
+    """
+    spliced_conversation = dict(conversation)
+    for field in JSON_FIELDS:
+        value = spliced_conversation.get(field)
+        if isinstance(value, (str, bytes)):
+            spliced_conversation[field] = RawJSON(value)
+    return spliced_conversation
+
+
+async def stream_conversations_body(trace_id: str, stream_format: str, fields: Optional[List[str]] = None):
     """
-    Simulate asynchronous processing of conversation creation.
+    Yield the body of a streamed listing one database batch at a time, as NDJSON (one
+    conversation per line) or as a chunked {"detail": [...]} JSON document. The next batch
+    is only read once the server has accepted the previous chunk, so a slow client slows
+    the database read down instead of buffering rows in memory.
     """
+    streamed = 0
+    first = True
+    if stream_format == "json":
+        yield b'{"detail": ['
     try:
-        await asyncio.sleep(5)  # Simulate a long-running task (e.g., database operation)
-        conversation_id = await conversation_service.create_conversation(conversation)
-        logger.info(f"Conversation created successfully for task_id: {task_id}")
-
-        task_store[task_id] = {
-            "status": "completed",
-            "status_code": 201,
-            "result": {"convo_id": conversation_id["convo_id"], "detail": "Conversation created successfully"}
-        }
+        async with aclosing(conversation_service.stream_conversations(STREAM_BATCH_SIZE, fields)) as batches:
+            async for conversations in batches:
+                encoded = [get_codec().dumps(spliced(conversation)) for conversation in conversations]
+                if stream_format == "json":
+                    yield (b", " if not first else b"") + b", ".join(encoded)
+                else:
+                    yield b"".join(line + b"\n" for line in encoded)
+                first = False
+                streamed += len(conversations)
     except Exception as e:
-        logger.error(f"Error processing conversation creation for task_id {task_id}: {str(e)}")
-        task_store[task_id] = {"status": "failed","status_code": 500, "error": str(e)}
+        # Headers are already sent, so the status cannot change; cut the stream short instead.
+        logger.error(f"TRACE_ID={trace_id} - Error streaming conversations after {streamed} rows: {str(e)}")
+        raise
+    if stream_format == "json":
+        yield b"]}"
+    logger.info("TRACE_ID=%s - Successfully streamed %s conversations.", trace_id, streamed)
+
+# Bounded background job pool with a persistent task table
+job_runner = ServiceFactory.lazy('JobRunner')
+
+
+async def process_conversation_creation(conversation: dict) -> dict:
+    """
+    Create a conversation as a background job. The returned dict becomes the task result.
+    """
+    conversation_id = await conversation_service.create_conversation(conversation)
+    logger.info("Conversation created successfully with ID %s by a background job.", conversation_id['convo_id'])
+    return {"convo_id": conversation_id["convo_id"], "detail": "Conversation created successfully"}
 
 
 @router.post(
@@ -46,23 +107,25 @@ async def process_conversation_creation(task_id: str, conversation: dict):
     responses={
         202: {"description": "Conversation creation request accepted for processing"},
         400: {"description": "Bad request - invalid parameters"},
-        409: {"description": "Conflict - conversation already exists"}
+        409: {"description": "Conflict - conversation already exists"},
+        503: {"description": "Background job queue is full"}
     },
 )
-async def create_conversation(conversation: dict, background_tasks: BackgroundTasks, request: Request):
+async def create_conversation(conversation: dict, request: Request):
     """
     Accept a conversation creation request and process it asynchronously.
     """
     trace_id = getattr(request.state, "trace_id", "UNKNOWN")
     
     try:
-        task_id = str(uuid.uuid4())
-        logger.info(f"TRACE_ID={trace_id} - Received conversation creation request. Task ID: {task_id}")
-        task_store[task_id] = {"status": "in_progress", "status_code": 202, "result": None}
-        background_tasks.add_task(process_conversation_creation, task_id, conversation)
-        logger.info(f"TRACE_ID={trace_id} - Conversation creation task {task_id} added to background tasks.")
+        logger.info("TRACE_ID=%s - Received conversation creation request.", trace_id)
+        try:
+            task_id = await job_runner.submit(process_conversation_creation, conversation, success_status=201)
+        except QueueFullError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        logger.info("TRACE_ID=%s - Conversation creation task %s queued.", trace_id, task_id)
         
-        return JSONResponse(
+        return CodecJSONResponse(
             content={
                 "task_id": task_id,
                 "status": "in_progress",
@@ -74,7 +137,15 @@ async def create_conversation(conversation: dict, background_tasks: BackgroundTa
                         "method": "POST"
                     },
                     "get_task_status": {
-                        "href": f"/conversations/tasks/{task_id}",
+                        "href": f"/tasks/{task_id}",
+                        "method": "GET"
+                    },
+                    "wait_for_task": {
+                        "href": f"/tasks/{task_id}?wait=30",
+                        "method": "GET"
+                    },
+                    "task_events": {
+                        "href": f"/tasks/{task_id}/events",
                         "method": "GET"
                     },
                     "get_created_conversation": {
@@ -105,6 +176,81 @@ async def create_conversation(conversation: dict, background_tasks: BackgroundTa
         logger.exception(f"TRACE_ID={trace_id} - Error starting conversation creation task: {str(e)}")
         raise HTTPException(status_code=500, detail="Error starting conversation creation task.")
 
+@router.post(
+    "/conversations/bulk",
+    tags=["conversations"],
+    responses={
+        201: {"description": "All conversations created"},
+        207: {"description": "Some conversations were rejected; see each result"},
+        400: {"description": "Bad request - body is not a JSON array or NDJSON stream"},
+        413: {"description": "Too many conversations in one request"}
+    },
+)
+async def create_conversations_bulk(request: Request):
+    """
+    Create many conversations in one request. The body is a JSON array of conversations, or
+    one conversation per line with Content-Type: application/x-ndjson. Generated IDs are
+    returned in input order; invalid entries are reported individually.
+    """
+    trace_id = getattr(request.state, "trace_id", "UNKNOWN")
+    try:
+        body = await request.body()
+        if "application/x-ndjson" in request.headers.get("content-type", ""):
+            items = []
+            for line_number, line in enumerate(body.splitlines(), start=1):
+                if not line.strip():
+                    continue
+                try:
+                    items.append(get_codec().loads(line))
+                except ValueError as e:
+                    items.append(ValueError(f"Line {line_number} is not valid JSON: {str(e)}"))
+        else:
+            try:
+                items = get_codec().loads(body)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Body must be a JSON array of conversations.")
+            if isinstance(items, dict):
+                items = items.get("conversations")
+            if not isinstance(items, list):
+                raise HTTPException(status_code=400, detail="Body must be a JSON array of conversations.")
+
+        if not items:
+            raise HTTPException(status_code=400, detail="At least one conversation is required.")
+        if len(items) > BULK_MAX_ITEMS:
+            raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ITEMS} conversations per request.")
+
+        results = await conversation_service.create_conversations_bulk(items)
+        created = sum(1 for result in results if "convo_id" in result)
+        logger.info("TRACE_ID=%s - Bulk creation: %s of %s conversations created.", trace_id, created, len(items))
+
+        return CodecJSONResponse(
+            content={
+                "detail": f"{created} of {len(items)} conversations created",
+                "created": created,
+                "failed": len(items) - created,
+                "results": results,
+                "_links": {
+                    "self": {
+                        "href": "/conversations/bulk",
+                        "method": "POST"
+                    },
+                    "list_conversations": {
+                        "href": "/conversations/",
+                        "method": "GET"
+                    }
+                }
+            },
+            status_code=201 if created == len(items) else 207
+        )
+
+    except HTTPException as e:
+        logger.error(f"TRACE_ID={trace_id} - HTTPException during bulk creation: {e.detail}")
+        raise e
+    except Exception as e:
+        logger.exception(f"TRACE_ID={trace_id} - Error during bulk creation: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
 @router.get(
     "/tasks/{task_id}",
     tags=["tasks"],
@@ -113,59 +259,163 @@ async def create_conversation(conversation: dict, background_tasks: BackgroundTa
         404: {"description": "Task not found"},
     },
 )
-async def get_task_status(task_id: str):
+async def get_task_status(
+    task_id: str,
+    wait: Optional[float] = Query(None, ge=0, le=MAX_TASK_WAIT,
+                                  description="Seconds to wait for the task to finish before responding")
+):
     """
-    Retrieve the status of a background task by its task_id.
+    Retrieve the status of a background task by its task_id. With wait, the request is held
+    open until the task finishes or wait seconds pass, and then answered with its status.
     """
-    task = task_store.get(task_id)
+    task = None
+    if wait:
+        try:
+            async with aclosing(job_runner.watch(task_id, wait)) as transitions:
+                async for task in transitions:
+                    pass
+        except TooManyWaitersError:
+            # Degrade to an immediate answer; the client simply polls again.
+            logger.warning(f"Too many task waiters; answering task {task_id} without waiting.")
+            task = await job_runner.get(task_id)
+    else:
+        task = await job_runner.get(task_id)
     if not task:
         logger.warning(f"Task with task_id {task_id} not found.")
         raise HTTPException(status_code=404, detail="Task not found.")
-    return JSONResponse(
-        content={
-            "status": task["status"],
-            "result": task["result"],
-            "_links": {
-                "self": {
-                    "href": f"/tasks/{task_id}",
-                    "method": "GET"
-                },
-                "get_created_conversation": {
-                    "href": f"/conversations/{task['result']['convo_id']}",
-                    "method": "GET"
-                },
-                "delete_conversation": {
-                    "href": f"/conversations/{task['result']['convo_id']}",
-                    "method": "DELETE"
-                },
-                "list_conversations": {
-                    "href": "/conversations/",
-                    "method": "GET"
-                },
-                "create_conversation": {
-                    "href": "/conversations/",
-                    "method": "POST"
-                }
-            }
-        },
-        status_code=task["status_code"]
+    return task_status_response(task)
+
+
+def task_phase(task: dict) -> str:
+    """queued, running, completed or failed."""
+    if task["status"] != "in_progress":
+        return task["status"]
+    return "running" if task["started_at"] else "queued"
+
+
+async def task_events_body(task_id: str):
+    """Yield a server-sent event for the task's current phase and for each later transition."""
+    try:
+        async with aclosing(job_runner.watch(task_id, TASK_EVENTS_TIMEOUT)) as transitions:
+            async for task in transitions:
+                payload = {"task_id": task_id, "status": task["status"], "result": task["result"]}
+                if task["error"]:
+                    payload["error"] = task["error"]
+                yield f"event: {task_phase(task)}\ndata: ".encode("utf-8") + get_codec().dumps(payload) + b"\n\n"
+    except TooManyWaitersError as e:
+        # Lost the race for the last waiter slot after the response started.
+        yield b"event: error\ndata: " + get_codec().dumps({"task_id": task_id, "error": str(e)}) + b"\n\n"
+
+
+@router.get(
+    "/tasks/{task_id}/events",
+    tags=["tasks"],
+    responses={
+        200: {"description": "Server-sent event stream of the task's status transitions"},
+        404: {"description": "Task not found"},
+        503: {"description": "Too many clients are waiting on tasks"},
+    },
+)
+async def get_task_events(task_id: str):
+    """
+    Stream the task's status transitions (queued, running, completed or failed) as
+    server-sent events. The stream ends when the task finishes.
+    """
+    if not await job_runner.get(task_id):
+        logger.warning(f"Task with task_id {task_id} not found.")
+        raise HTTPException(status_code=404, detail="Task not found.")
+    if job_runner.stats()["waiters"] >= job_runner.max_waiters:
+        raise HTTPException(status_code=503, detail="Too many clients are waiting on tasks.",
+                            headers={"Retry-After": "1"})
+    return StreamingResponse(
+        task_events_body(task_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
+def task_status_response(task: dict) -> CodecJSONResponse:
+    task_id = task["task_id"]
+    links = {
+        "self": {
+            "href": f"/tasks/{task_id}",
+            "method": "GET"
+        },
+        "list_conversations": {
+            "href": "/conversations/",
+            "method": "GET"
+        },
+        "create_conversation": {
+            "href": "/conversations/",
+            "method": "POST"
+        }
+    }
+    result = task["result"]
+    if result and "convo_id" in result:
+        links["get_created_conversation"] = {
+            "href": f"/conversations/{result['convo_id']}",
+            "method": "GET"
+        }
+        links["delete_conversation"] = {
+            "href": f"/conversations/{result['convo_id']}",
+            "method": "DELETE"
+        }
+    content = {
+        "status": task["status"],
+        "result": result,
+        "_links": links
+    }
+    if task["error"]:
+        content["error"] = task["error"]
+    return CodecJSONResponse(content=content, status_code=task["status_code"])
+
+
+def expected_version_from_if_match(if_match: Optional[str], conversation_id: int) -> Optional[int]:
+    """
+    Return the version an If-Match header requires, or None if the header is absent or "*".
+    Raises 412 if none of its ETags is a current-format ETag of this conversation.
+    """
+    if not if_match or if_match.strip() == "*":
+        return None
+    for candidate in if_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            continue  # If-Match uses strong comparison
+        parsed = parse_conversation_etag(candidate)
+        if parsed and parsed[0] == conversation_id:
+            return parsed[1]
+    raise HTTPException(status_code=412, detail="If-Match does not match the conversation.")
+
+
+def listing_etag(conversations: List[dict], fields: Optional[List[str]], *extra) -> str:
+    """ETag of a listing: a hash of its (convo_id, version) pairs, the field selection and extra response values."""
+    return content_etag([[c["convo_id"], c.get("version")] for c in conversations], fields, *extra)
+
+
 @router.put("/conversations/{conversation_id}",
             tags=["conversations"],
             responses={
                 200: {"description": "Conversation updated successfully"},
                 404: {"description": "Conversation not found"},
-                400: {"description": "Bad request - invalid parameters"}
+                400: {"description": "Bad request - invalid parameters"},
+                412: {"description": "If-Match does not match the current version of the conversation"}
             })
 async def update_conversation(conversation_id: int, conversation: dict, request: Request):
+    """
+    Update a conversation. Send the ETag from GET /conversations/{conversation_id} as If-Match
+    to have the update rejected with 412 if someone else changed the conversation meanwhile.
+    """
     try:
         trace_id = getattr(request.state, "trace_id", "UNKNOWN")
-        conversation_service.update_conversation(conversation_id, conversation)
-        logger.info(f"TRACE_ID={trace_id} - Conversation with ID {conversation_id} updated successfully.")
-        
-        return JSONResponse(
+        expected_version = expected_version_from_if_match(request.headers.get("if-match"), conversation_id)
+        await conversation_service.update_conversation(conversation_id, conversation, expected_version)
+        logger.info("TRACE_ID=%s - Conversation with ID %s updated successfully.", trace_id, conversation_id)
+
+        headers = {}
+        if expected_version is not None:
+            headers["ETag"] = conversation_etag(conversation_id, expected_version + 1)
+        return CodecJSONResponse(
+            headers=headers,
             content={
                 "detail": "Conversation updated successfully",
                 "_links": {
@@ -202,6 +452,179 @@ async def update_conversation(conversation_id: int, conversation: dict, request:
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+@router.post(
+    "/conversations/{conversation_id}/messages",
+    tags=["conversations"],
+    responses={
+        201: {"description": "Messages appended successfully"},
+        404: {"description": "Conversation not found"},
+        400: {"description": "Bad request - invalid parameters"}
+    },
+)
+async def append_messages(conversation_id: int, messages: Union[Message, List[Message]], request: Request):
+    """
+    Append one message, or a list of messages, to a conversation. Only the new messages are written.
+    """
+    trace_id = getattr(request.state, "trace_id", "UNKNOWN")
+    try:
+        if isinstance(messages, Message):
+            messages = [messages]
+        if not messages:
+            raise HTTPException(status_code=400, detail="At least one message is required.")
+
+        message_ids = await conversation_service.append_messages(
+            conversation_id, [message.model_dump() for message in messages]
+        )
+        logger.info("TRACE_ID=%s - Appended %s messages to conversation ID %s.", trace_id, len(message_ids), conversation_id)
+
+        return CodecJSONResponse(
+            content={
+                "detail": "Messages appended successfully",
+                "message_ids": message_ids,
+                "_links": {
+                    "self": {
+                        "href": f"/conversations/{conversation_id}/messages",
+                        "method": "POST"
+                    },
+                    "get_conversation": {
+                        "href": f"/conversations/{conversation_id}",
+                        "method": "GET"
+                    },
+                    "list_conversations": {
+                        "href": "/conversations/",
+                        "method": "GET"
+                    }
+                }
+            },
+            status_code=201
+        )
+
+    except HTTPException as e:
+        logger.error(f"TRACE_ID={trace_id} - HTTPException while appending messages to conversation ID {conversation_id}: {e.detail}")
+        raise e
+    except Exception as e:
+        logger.exception(f"TRACE_ID={trace_id} - Error appending messages to conversation ID {conversation_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get(
+    "/conversations/{conversation_id}/messages",
+    tags=["conversations"],
+    responses={
+        200: {"description": "Messages retrieved successfully"},
+        404: {"description": "Conversation not found"},
+        400: {"description": "Bad request - invalid parameters"},
+    },
+)
+async def get_messages(
+    conversation_id: int,
+    request: Request,
+    before: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_MESSAGE_PAGE_LIMIT, gt=0, le=MAX_MESSAGE_PAGE_LIMIT)
+):
+    """
+    Get the newest limit messages of a conversation, oldest first. Pass the returned
+    next_cursor as before to load the messages preceding them.
+    """
+    trace_id = getattr(request.state, "trace_id", "UNKNOWN")
+    try:
+        result = await conversation_service.get_messages(conversation_id, before, limit)
+        next_cursor = result["next_cursor"]
+        logger.info("TRACE_ID=%s - Retrieved %s messages of conversation ID %s.", trace_id, len(result['messages']), conversation_id)
+
+        links = {
+            "self": {
+                "href": request.url.path + "?" + urlencode({k: v for k, v in (("before", before), ("limit", limit)) if v}),
+                "method": "GET"
+            },
+            "append_messages": {
+                "href": f"/conversations/{conversation_id}/messages",
+                "method": "POST"
+            },
+            "get_conversation": {
+                "href": f"/conversations/{conversation_id}",
+                "method": "GET"
+            }
+        }
+        if next_cursor:
+            links["previous"] = {
+                "href": request.url.path + "?" + urlencode({"before": next_cursor, "limit": limit}),
+                "method": "GET"
+            }
+        return CodecJSONResponse(
+            content={
+                "detail": result["messages"],
+                "limit": limit,
+                "next_cursor": next_cursor,
+                "_links": links
+            },
+            status_code=200
+        )
+
+    except HTTPException as e:
+        logger.error(f"TRACE_ID={trace_id} - HTTPException while retrieving messages of conversation ID {conversation_id}: {e.detail}")
+        raise e
+    except Exception as e:
+        logger.exception(f"TRACE_ID={trace_id} - Error retrieving messages of conversation ID {conversation_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+async def conversation_events_body(conversation_id: int, trace_id: str):
+    """
+    Yield the conversation's change events as a text/event-stream until the client
+    disconnects or falls too far behind (a final "lagged" event is sent in that case).
+    """
+    subscription = await conversation_service.events.subscribe(conversation_channel(conversation_id))
+    delivered = 0
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            try:
+                event = await subscription.get(timeout=EVENT_HEARTBEAT_INTERVAL)
+            except SubscriptionClosed:
+                break
+            if event is None:
+                yield b": keep-alive\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: ".encode("utf-8") + get_codec().dumps(event) + b"\n\n"
+            delivered += 1
+    finally:
+        await subscription.close()
+        logger.info("TRACE_ID=%s - Event stream for conversation ID %s closed after %s events.", trace_id, conversation_id, delivered)
+
+
+@router.get(
+    "/conversations/{conversation_id}/events",
+    tags=["conversations"],
+    responses={
+        200: {"description": "Server-sent event stream of the conversation's changes"},
+        404: {"description": "Conversation not found"},
+    },
+)
+async def get_conversation_events(conversation_id: int, request: Request):
+    """
+    Stream changes to a conversation as server-sent events instead of polling it. Event
+    types are messages.appended (with the new messages), conversation.updated,
+    conversation.deleted and lagged (the client fell behind and should reload).
+    """
+    trace_id = getattr(request.state, "trace_id", "UNKNOWN")
+    try:
+        await conversation_service.get_conversation(conversation_id, ["convo_id"])
+        logger.info("TRACE_ID=%s - Opening event stream for conversation ID %s.", trace_id, conversation_id)
+        return StreamingResponse(
+            conversation_events_body(conversation_id, trace_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    except HTTPException as e:
+        logger.error(f"TRACE_ID={trace_id} - HTTPException while opening event stream for conversation ID {conversation_id}: {e.detail}")
+        raise e
+    except Exception as e:
+        logger.exception(f"TRACE_ID={trace_id} - Error opening event stream for conversation ID {conversation_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
 @router.get(
     "/conversations/{conversation_id}",
     tags=["conversations"],
@@ -211,19 +634,39 @@ async def update_conversation(conversation_id: int, conversation: dict, request:
         400: {"description": "Bad request - invalid parameters"},
     },
 )
-async def get_conversation(conversation_id: int, request: Request):
+async def get_conversation(
+    conversation_id: int,
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,participants"),
+    view: Optional[str] = Query(None, pattern="^(full|summary)$",
+                                description="summary leaves out the message history")
+):
     try:
         trace_id = getattr(request.state, "trace_id", "UNKNOWN")
-        conversation = conversation_service.get_conversation(conversation_id)
+        selected_fields = conversation_service.resolve_fields(fields, view)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            # Revalidation is answered from the version column, without reading messages.
+            version = await conversation_service.get_conversation_version(conversation_id)
+            etag = conversation_etag(conversation_id, version, selected_fields)
+            if etag_matches(if_none_match, etag):
+                logger.info("TRACE_ID=%s - Conversation with ID %s not modified.", trace_id, conversation_id)
+                return Response(status_code=304, headers={"ETag": etag})
+
+        conversation = await conversation_service.get_conversation(conversation_id, selected_fields)
         
         if not conversation:
             logger.warning(f"TRACE_ID={trace_id} - Conversation with ID {conversation_id} not found.")
             raise HTTPException(status_code=404, detail="Conversation not found")
         
-        logger.info(f"TRACE_ID={trace_id} - Successfully retrieved conversation with ID {conversation_id}")
-        return JSONResponse(
+        logger.info("TRACE_ID=%s - Successfully retrieved conversation with ID %s", trace_id, conversation_id)
+        headers = {}
+        if conversation.get("version") is not None:
+            headers["ETag"] = conversation_etag(conversation_id, conversation["version"], selected_fields)
+        return CodecJSONResponse(
+            headers=headers,
             content={
-                "detail": conversation,
+                "detail": spliced(conversation),
                 "_links": {
                     "self": {
                         "href": f"/conversations/{conversation_id}",
@@ -259,6 +702,106 @@ async def get_conversation(conversation_id: int, request: Request):
         raise HTTPException(status_code=500, detail="Internal Server Error")
         
 
+async def get_conversations_batch_response(conversation_ids: List[int], trace_id: str,
+                                           fields: Optional[List[str]] = None) -> CodecJSONResponse:
+    if not conversation_ids:
+        raise HTTPException(status_code=400, detail="At least one conversation ID is required.")
+    if len(conversation_ids) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_IDS} conversation IDs per request.")
+
+    result = await conversation_service.get_conversations_batch(conversation_ids, fields)
+    logger.info("TRACE_ID=%s - Retrieved %s conversations in batch, %s missing.",
+                trace_id, len(result['conversations']), len(result['missing']))
+    return CodecJSONResponse(
+        content={
+            "detail": [spliced(conversation) for conversation in result["conversations"]],
+            "missing": result["missing"],
+            "_links": {
+                "self": {
+                    "href": "/conversations:batch",
+                    "method": "GET"
+                },
+                "list_conversations": {
+                    "href": "/conversations/",
+                    "method": "GET"
+                }
+            }
+        },
+        status_code=200
+    )
+
+
+@router.get(
+    "/conversations:batch",
+    tags=["conversations"],
+    responses={
+        200: {"description": "Conversations retrieved; IDs that do not exist are listed in missing"},
+        400: {"description": "Bad request - invalid parameters"},
+    },
+)
+async def get_conversations_batch(
+    request: Request,
+    ids: List[str] = Query(..., description="Comma-separated conversation IDs"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    view: Optional[str] = Query(None, pattern="^(full|summary)$",
+                                description="summary leaves out the message history")
+):
+    """
+    Fetch many conversations in one request, e.g. /conversations:batch?ids=3,1,2. Conversations
+    are returned in the requested order.
+    """
+    trace_id = getattr(request.state, "trace_id", "UNKNOWN")
+    try:
+        try:
+            conversation_ids = [int(i) for value in ids for i in value.split(",") if i.strip()]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers.")
+        selected_fields = conversation_service.resolve_fields(fields, view)
+        return await get_conversations_batch_response(conversation_ids, trace_id, selected_fields)
+
+    except HTTPException as e:
+        logger.error(f"TRACE_ID={trace_id} - HTTPException while retrieving conversations in batch: {e.detail}")
+        raise e
+    except Exception as e:
+        logger.exception(f"TRACE_ID={trace_id} - Error retrieving conversations in batch: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post(
+    "/conversations:batch",
+    tags=["conversations"],
+    responses={
+        200: {"description": "Conversations retrieved; IDs that do not exist are listed in missing"},
+        400: {"description": "Bad request - invalid parameters"},
+    },
+)
+async def post_conversations_batch(request: Request, body: dict):
+    """
+    Same as GET /conversations:batch, with the IDs in the body: {"ids": [3, 1, 2]}. The body may
+    also carry "fields" (a list of field names) and "view".
+    """
+    trace_id = getattr(request.state, "trace_id", "UNKNOWN")
+    try:
+        conversation_ids = body.get("ids")
+        if not isinstance(conversation_ids, list) or not all(isinstance(i, int) for i in conversation_ids):
+            raise HTTPException(status_code=400, detail="ids must be a list of integers.")
+        fields = body.get("fields")
+        if fields is not None and (not isinstance(fields, list) or not all(isinstance(f, str) for f in fields)):
+            raise HTTPException(status_code=400, detail="fields must be a list of field names.")
+        view = body.get("view")
+        if view not in (None, "full", "summary"):
+            raise HTTPException(status_code=400, detail="view must be full or summary.")
+        selected_fields = conversation_service.resolve_fields(",".join(fields) if fields else None, view)
+        return await get_conversations_batch_response(conversation_ids, trace_id, selected_fields)
+
+    except HTTPException as e:
+        logger.error(f"TRACE_ID={trace_id} - HTTPException while retrieving conversations in batch: {e.detail}")
+        raise e
+    except Exception as e:
+        logger.exception(f"TRACE_ID={trace_id} - Error retrieving conversations in batch: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
 @router.get("/conversations/",
             tags=["conversations"],
             responses={
@@ -269,20 +812,80 @@ async def get_conversation(conversation_id: int, request: Request):
 async def get_all_conversations(
     request: Request,
     page: Optional[int] = Query(None, gt=0),
-    limit: Optional[int] = Query(None, gt=0)
+    limit: Optional[int] = Query(None, gt=0),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page"),
+    count: str = Query("cached", pattern="^(exact|cached|counter|estimate)$",
+                       description="How the total is computed in page/limit mode"),
+    stream: Optional[str] = Query(None, pattern="^(ndjson|json)$",
+                                  description="Stream every conversation as NDJSON or chunked JSON"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,participants"),
+    view: Optional[str] = Query(None, pattern="^(full|summary)$",
+                                description="summary leaves out the message history")
 ):
     try:
         trace_id = getattr(request.state, "trace_id", "UNKNOWN")
-        if page is not None and limit is not None:
-            total_conversations = conversation_service.get_total_conversation_count()
-            conversations = conversation_service.get_paginated_conversations(page, limit)
+        selected_fields = conversation_service.resolve_fields(fields, view)
+        if_none_match = request.headers.get("if-none-match")
+        if stream is None and page is None and limit is None and cursor is None \
+                and "application/x-ndjson" in request.headers.get("accept", ""):
+            stream = "ndjson"
+        if stream is not None:
+            logger.info("TRACE_ID=%s - Streaming all conversations as %s.", trace_id, stream)
+            return StreamingResponse(
+                stream_conversations_body(trace_id, stream, selected_fields),
+                media_type="application/x-ndjson" if stream == "ndjson" else "application/json"
+            )
+        if page is None and (cursor is not None or limit is not None):
+            # Keyset pagination: every page is an indexed range seek on convo_id.
+            limit = limit or DEFAULT_PAGE_LIMIT
+            if if_none_match:
+                probe = await conversation_service.get_conversations_by_cursor(cursor, limit, ["version"])
+                etag = listing_etag(probe["conversations"], selected_fields, probe["next_cursor"])
+                if etag_matches(if_none_match, etag):
+                    return Response(status_code=304, headers={"ETag": etag})
+            result = await conversation_service.get_conversations_by_cursor(cursor, limit, selected_fields)
+            next_cursor = result["next_cursor"]
+            logger.info("TRACE_ID=%s - Successfully retrieved cursor-paginated conversations: limit=%s", trace_id, limit)
+
+            selection = {k: v for k, v in (("fields", fields), ("view", view)) if v}
+            links = {
+                "self": {
+                    "href": request.url.path + "?" + urlencode({**{k: v for k, v in (("cursor", cursor), ("limit", limit)) if v}, **selection}),
+                    "method": "GET"
+                }
+            }
+            if next_cursor:
+                links["next"] = {
+                    "href": request.url.path + "?" + urlencode({"cursor": next_cursor, "limit": limit, **selection}),
+                    "method": "GET"
+                }
+            return CodecJSONResponse(
+                headers={"ETag": listing_etag(result["conversations"], selected_fields, next_cursor)},
+                content={
+                    "detail": [spliced(conversation) for conversation in result["conversations"]],
+                    "limit": limit,
+                    "next_cursor": next_cursor,
+                    "_links": links
+                },
+                status_code=200
+            )
+        elif page is not None and limit is not None:
+            total_conversations, count_strategy = await conversation_service.count_conversations(count)
+            if if_none_match:
+                probe = await conversation_service.get_paginated_conversations(page, limit, ["version"])
+                etag = listing_etag(probe, selected_fields, total_conversations, count_strategy)
+                if etag_matches(if_none_match, etag):
+                    return Response(status_code=304, headers={"ETag": etag})
+            conversations = await conversation_service.get_paginated_conversations(page, limit, selected_fields)
             total_pages = (total_conversations + limit - 1) // limit
-            logger.info(f"TRACE_ID={trace_id} - Successfully retrieved paginated conversations: page={page}, limit={limit}, total_pages={total_pages}")
+            logger.info("TRACE_ID=%s - Successfully retrieved paginated conversations: page=%s, limit=%s, total_pages=%s", trace_id, page, limit, total_pages)
             
-            return JSONResponse(
+            return CodecJSONResponse(
+                headers={"ETag": listing_etag(conversations, selected_fields, total_conversations, count_strategy)},
                 content={
-                    "detail": conversations,
+                    "detail": [spliced(conversation) for conversation in conversations],
                     "total": total_conversations,
+                    "total_strategy": count_strategy,
                     "page": page,
                     "limit": limit,
                     "total_pages": total_pages
@@ -290,12 +893,18 @@ async def get_all_conversations(
                 status_code=200
             )
         else:
-            conversations = conversation_service.get_all_conversations()
-            logger.info(f"TRACE_ID={trace_id} - Successfully retrieved all conversations without pagination.")
+            if if_none_match:
+                probe = await conversation_service.get_all_conversations(["version"])
+                etag = listing_etag(probe, selected_fields)
+                if etag_matches(if_none_match, etag):
+                    return Response(status_code=304, headers={"ETag": etag})
+            conversations = await conversation_service.get_all_conversations(selected_fields)
+            logger.info("TRACE_ID=%s - Successfully retrieved all conversations without pagination.", trace_id)
             
-        return JSONResponse(
+        return CodecJSONResponse(
+            headers={"ETag": listing_etag(conversations, selected_fields)},
             content={
-                "detail": conversations,
+                "detail": [spliced(conversation) for conversation in conversations],
                 "_links": {
                     "self": {
                         "href": f"/conversations/conversation_id",
@@ -346,11 +955,11 @@ async def delete_conversation(conversation_id: int, request: Request):
     """
     trace_id = getattr(request.state, "trace_id", "UNKNOWN")
     try:
-        conversation_service.delete_conversation(conversation_id)
-        logger.info(f"TRACE_ID={trace_id} - Conversation with ID {conversation_id} deleted successfully.")
+        await conversation_service.delete_conversation(conversation_id)
+        logger.info("TRACE_ID=%s - Conversation with ID %s deleted successfully.", trace_id, conversation_id)
         
         # Return response with HATEOAS links
-        return JSONResponse(
+        return CodecJSONResponse(
             content={
                 "detail": "Conversation deleted successfully",
                 "_links": {
@@ -0,0 +1,131 @@
+import hmac
+import logging
+import os
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response
+from framework.utils.CodecJSONResponse import CodecJSONResponse
+from app.routers.conversations import conversation_service, job_runner
+
+logger = logging.getLogger(__name__)
+
+
+async def require_diagnostics_token(x_diagnostics_token: str = Header(None)):
+    """
+    Admit only requests that carry the DIAGNOSTICS_TOKEN in X-Diagnostics-Token. The routes
+    expose internals and can reset the query profile, so they do not exist without a token.
+    """
+    token = os.getenv("DIAGNOSTICS_TOKEN")
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_diagnostics_token or not hmac.compare_digest(x_diagnostics_token.encode(), token.encode()):
+        raise HTTPException(status_code=401, detail="A valid X-Diagnostics-Token header is required.")
+
+
+router = APIRouter(dependencies=[Depends(require_diagnostics_token)])
+
+
+@router.get(
+    "/diagnostics/cache",
+    tags=["diagnostics"],
+    responses={200: {"description": "Conversation cache counters"}},
+)
+async def get_cache_stats():
+    """
+    Report hit, miss and eviction counters of the conversation cache.
+    """
+    return CodecJSONResponse(content=conversation_service.resource.cache_stats(), status_code=200)
+
+
+@router.get(
+    "/diagnostics/pool",
+    tags=["diagnostics"],
+    responses={200: {"description": "Database connection pool metrics"}},
+)
+async def get_pool_stats():
+    """
+    Report occupancy and wait metrics of the database connection pool.
+    """
+    return CodecJSONResponse(content=conversation_service.resource.pool_stats(), status_code=200)
+
+
+@router.get(
+    "/diagnostics/statements",
+    tags=["diagnostics"],
+    responses={200: {"description": "SQL statement cache metrics"}},
+)
+async def get_statement_stats():
+    """
+    Report hit and miss counters of the data service's SQL statement cache.
+    """
+    return CodecJSONResponse(content=conversation_service.resource.statement_stats(), status_code=200)
+
+
+@router.get(
+    "/diagnostics/jobs",
+    tags=["diagnostics"],
+    responses={200: {"description": "Background job queue metrics"}},
+)
+async def get_job_stats():
+    """
+    Report queue depth, throughput and latency of the background job runner.
+    """
+    return CodecJSONResponse(content=job_runner.stats(), status_code=200)
+
+
+@router.get(
+    "/diagnostics/message-writes",
+    tags=["diagnostics"],
+    responses={200: {"description": "Message write coalescing metrics"}},
+)
+async def get_message_write_stats():
+    """
+    Report batch sizes and flush latency of coalesced message appends.
+    """
+    return CodecJSONResponse(content=conversation_service.message_writes.stats(), status_code=200)
+
+
+@router.get(
+    "/diagnostics/events",
+    tags=["diagnostics"],
+    responses={200: {"description": "Event hub subscriber and delivery metrics"}},
+)
+async def get_event_stats():
+    """
+    Report subscriber counts and delivered, dropped and lagged events of the event hub.
+    """
+    return CodecJSONResponse(content=conversation_service.events.stats(), status_code=200)
+
+
+@router.get(
+    "/diagnostics/queries",
+    tags=["diagnostics"],
+    responses={
+        200: {"description": "Most expensive SQL statement shapes and recent slow queries"},
+        404: {"description": "Query profiling is disabled"},
+    },
+)
+async def get_query_stats(
+    limit: int = Query(20, ge=1, le=1000),
+    sort: str = Query("total", pattern="^(total|avg|max|calls|slow)$"),
+):
+    """
+    Report the limit statement shapes with the highest total (or avg, max, calls, slow) time,
+    with their row counts and connection wait, and the most recent slow queries.
+    """
+    report = conversation_service.resource.query_report(limit, sort)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Query profiling is disabled.")
+    return CodecJSONResponse(content=report, status_code=200)
+
+
+@router.delete(
+    "/diagnostics/queries",
+    tags=["diagnostics"],
+    responses={204: {"description": "Query profile cleared"}},
+)
+async def reset_query_stats():
+    """
+    Clear the query profile, e.g. before measuring a load test.
+    """
+    conversation_service.resource.reset_query_report()
+    return Response(status_code=204)
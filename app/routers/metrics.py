@@ -0,0 +1,86 @@
+import logging
+from fastapi import APIRouter
+from fastapi.responses import Response
+from framework.services.metrics.Metrics import registry
+from app.routers.conversations import conversation_service, job_runner
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# pool_stats() key -> (metric name, type, documentation)
+POOL_METRICS = {
+    "max_size": ("db_pool_max_connections", "gauge", "Largest number of connections the pool opens."),
+    "size": ("db_pool_connections", "gauge", "Open database connections."),
+    "idle": ("db_pool_idle_connections", "gauge", "Open database connections not checked out."),
+    "in_use": ("db_pool_in_use_connections", "gauge", "Database connections checked out."),
+    "checkouts": ("db_pool_checkouts_total", "counter", "Connections checked out of the pool."),
+    "waits": ("db_pool_waits_total", "counter", "Checkouts that waited for a free connection."),
+    "wait_time_total": ("db_pool_wait_seconds_total", "counter", "Time checkouts spent waiting for a connection."),
+    "timeouts": ("db_pool_timeouts_total", "counter", "Checkouts that gave up waiting for a connection."),
+    "created": ("db_pool_connections_created_total", "counter", "Database connections opened."),
+}
+
+# JobRunner.stats() key -> (metric name, type, documentation)
+JOB_METRICS = {
+    "queue_depth": ("job_queue_depth", "gauge", "Background jobs waiting to run."),
+    "running": ("jobs_running", "gauge", "Background jobs running."),
+    "waiters": ("job_waiters", "gauge", "Requests waiting for a background job to finish."),
+    "submitted": ("jobs_submitted_total", "counter", "Background jobs accepted."),
+    "completed": ("jobs_completed_total", "counter", "Background jobs that completed."),
+    "failed": ("jobs_failed_total", "counter", "Background jobs that failed."),
+    "rejected": ("jobs_rejected_total", "counter", "Background jobs rejected because the queue was full."),
+}
+
+
+def _pools(stats: dict) -> list:
+    """(pool label, stats) of every connection pool, including those of read replicas."""
+    if "replicas" not in stats:
+        return [("primary", stats)]
+    pools = [("primary", stats["primary"])]
+    pools.extend((name, replica["pool"]) for name, replica in stats["replicas"].items() if replica.get("pool"))
+    return pools
+
+
+def collect_pools():
+    stats = conversation_service.resource.pool_stats()
+    if not stats:
+        return
+    pools = _pools(stats)
+    for key, (name, metric_type, documentation) in POOL_METRICS.items():
+        samples = [({"pool": pool}, values[key]) for pool, values in pools if key in values]
+        if samples:
+            yield name, metric_type, documentation, samples
+    if "replicas" in stats:
+        replicas = stats["replicas"].items()
+        yield "db_replica_ejected", "gauge", "Whether a read replica is ejected (1) or receives reads (0).", [
+            ({"replica": name}, int(replica["ejected"])) for name, replica in replicas
+        ]
+        yield "db_replica_reads_in_flight", "gauge", "Reads in progress on a read replica.", [
+            ({"replica": name}, replica["in_flight"]) for name, replica in replicas
+        ]
+
+
+def collect_jobs():
+    stats = job_runner.stats()
+    for key, (name, metric_type, documentation) in JOB_METRICS.items():
+        yield name, metric_type, documentation, [({}, stats[key])]
+
+
+registry.register_collector(collect_pools)
+registry.register_collector(collect_jobs)
+
+
+@router.get(
+    "/metrics",
+    tags=["diagnostics"],
+    responses={200: {"description": "Metrics in the Prometheus text format"}},
+)
+async def get_metrics():
+    """
+    Report request and query latency histograms, connection pool occupancy and background
+    job queue depth for Prometheus to scrape.
+    """
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,75 +1,289 @@
 from app.services.service_factory import ServiceFactory
+from app.resources.conversation_resource import CONVERSATION_FIELDS, SUMMARY_FIELDS
+from framework.services.data_access.BaseDataService import StaleRecordError
+from framework.utils.JSONCodec import get_codec
+from app.models.conversation_model import ConversationCreate
+from pydantic import ValidationError
+from app.services.count_service import CountService
+from app.services.message_coalescer import MessageWriteCoalescer
+from app.utils.cursors import decode_cursor, encode_cursor
 from fastapi import HTTPException
-import json  # To handle messages as JSON
+from contextlib import aclosing
+import asyncio
 import logging  # For logging
-from typing import Optional  # Import Optional
+import os
+from typing import List, Optional  # Import Optional
 
 # Configure logger
 logger = logging.getLogger("ConversationService")
-logger.setLevel(logging.DEBUG)  
+logger.setLevel(logging.INFO)
+
+def conversation_channel(conversation_id: int) -> str:
+    """Name of the event channel carrying changes to one conversation."""
+    return f"conversation:{conversation_id}"
+
 
 class ConversationService:
-    def __init__(self):
-        self.resource = ServiceFactory.get_service('ConversationResource')
+    def __init__(self, resource=None, events=None):
+        self.resource = resource or ServiceFactory.get_service('ConversationResource')
+        # Pub/sub hub: every successful write is published to the conversation's channel
+        self.events = events or ServiceFactory.get_service('EventHub')
+        self.counts = CountService(
+            exact_count=self.resource.get_total_conversation_count,
+            estimate_count=self.resource.estimate_conversation_count
+        )
+        # Group commit: message appends arriving close together are written in one transaction
+        self.message_writes = MessageWriteCoalescer(
+            flush=self.resource.append_messages_batch,
+            window=float(os.getenv("MESSAGE_COALESCE_WINDOW_MS", 5)) / 1000,
+            max_batch=int(os.getenv("MESSAGE_COALESCE_MAX_BATCH", 500))
+        )
+
+    async def start(self):
+        """Warm up the resource before the first request."""
+        await self.resource.start()
+
+    async def stop(self):
+        """Write the appends still waiting for their batch to close."""
+        await self.message_writes.drain()
+
+    async def _publish(self, conversation_id: int, event_type: str, **payload):
+        """Publish a change event. The write has already committed, so a failure is only logged."""
+        try:
+            await self.events.publish(
+                conversation_channel(conversation_id),
+                {"type": event_type, "convo_id": conversation_id, **payload}
+            )
+        except Exception as e:
+            logger.warning(f"Could not publish {event_type} for conversation {conversation_id}: {str(e)}")
 
     async def create_conversation(self, conversation_data: dict) -> int:
         """Create a new conversation and return its ID."""
         try:
             formatted_conversation_data = {
                 "name": conversation_data["name"],
-                "participants": json.dumps(conversation_data["participants"]),  # Convert list to JSON string
-                "messages": json.dumps(conversation_data["messages"]),  # Convert list of messages to JSON string
+                "participants": get_codec().dumps_str(conversation_data["participants"]),  # Convert list to JSON string
                 "isGroup": bool(conversation_data["isGroup"])
             }
 
-            conversation_id = await self.resource.create_conversation(formatted_conversation_data)
+            # Messages are stored as rows of the messages table, not in the conversation row
+            conversation_id = await self.resource.create_conversation(
+                formatted_conversation_data, conversation_data.get("messages") or []
+            )
             if not conversation_id:
                 logger.error("Failed to retrieve conversation ID after creation")
                 raise Exception("Failed to retrieve conversation ID after creation.")
 
-            logger.info(f"Conversation created successfully with ID: {conversation_id}")
+            self.counts.record_insert()
+            await self._publish(conversation_id["convo_id"], "conversation.created")
+            logger.info("Conversation created successfully with ID: %s", conversation_id)
             return conversation_id
 
         except Exception as e:
             logger.exception("Error occurred while creating conversation")
             raise HTTPException(status_code=400, detail=f"Error creating conversation: {str(e)}")
 
-    def update_conversation(self, conversation_id: int, conversation_data: dict):
-        """Update an existing conversation."""
+    async def create_conversations_bulk(self, items: list) -> List[dict]:
+        """
+        Create many conversations at once.
+
+        Items are validated individually; invalid items are reported and skipped, and all
+        valid items are inserted together in one transaction.
+
+        :param items: Raw conversation objects. An item may be an Exception instance to
+            report an entry that could not even be parsed.
+        :return: One result per item, in input order, with either convo_id or error.
+        """
+        results = [None] * len(items)
+        valid_indexes, conversations, messages = [], [], []
+        for index, item in enumerate(items):
+            if isinstance(item, Exception):
+                results[index] = {"index": index, "status": 400, "error": str(item)}
+                continue
+            try:
+                conversation = ConversationCreate.model_validate(item)
+            except ValidationError as e:
+                errors = "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                                   for error in e.errors())
+                results[index] = {"index": index, "status": 400, "error": errors}
+                continue
+            valid_indexes.append(index)
+            conversations.append({
+                "name": conversation.name,
+                "participants": get_codec().dumps_str(conversation.participants),  # Convert list to JSON string
+                "isGroup": conversation.isGroup
+            })
+            messages.append([message.model_dump() for message in conversation.messages])
+
+        if conversations:
+            try:
+                convo_ids = await self.resource.create_conversations(conversations, messages)
+            except Exception as e:
+                logger.exception("Error occurred while creating conversations in bulk")
+                raise HTTPException(status_code=500, detail=f"Error creating conversations: {str(e)}")
+            for index, convo_id in zip(valid_indexes, convo_ids):
+                results[index] = {"index": index, "status": 201, "convo_id": convo_id}
+            self.counts.record_insert(len(convo_ids))
+            await asyncio.gather(*[self._publish(convo_id, "conversation.created") for convo_id in convo_ids])
+
+        logger.info("Bulk creation finished: %s created, %s rejected", len(conversations), len(items) - len(conversations))
+        return results
+
+    async def update_conversation(self, conversation_id: int, conversation_data: dict,
+                                  expected_version: Optional[int] = None):
+        """
+        Update an existing conversation. With expected_version, the update is rejected with 412
+        if the conversation has been changed since that version.
+        """
         try:
             formatted_conversation_data = {
                 "name": conversation_data["name"],
-                "participants": json.dumps(conversation_data["participants"]),  # Convert list to JSON string
-                "messages": json.dumps(conversation_data["messages"]),  # Convert list of messages to JSON string
+                "participants": get_codec().dumps_str(conversation_data["participants"]),  # Convert list to JSON string
+                "messages": None,  # Clear the legacy JSON column; history lives in the messages table
                 "isGroup": bool(conversation_data["isGroup"])
             }
-            self.resource.update_conversation(conversation_id, formatted_conversation_data)
-            logger.info(f"Conversation with ID {conversation_id} updated successfully")
+            await self.resource.update_conversation(
+                conversation_id, formatted_conversation_data, conversation_data["messages"], expected_version
+            )
+            await self._publish(conversation_id, "conversation.updated")
+            logger.info("Conversation with ID %s updated successfully", conversation_id)
 
+        except StaleRecordError:
+            raise HTTPException(status_code=412, detail="Conversation has been modified; fetch it again and retry.")
         except Exception as e:
             logger.exception(f"Error occurred while updating conversation with ID: {conversation_id}")
             raise HTTPException(status_code=400, detail=f"Error updating conversation: {str(e)}")
 
-    def get_conversation(self, conversation_id: int):
-        """Retrieve a conversation by its ID."""
+    async def append_messages(self, conversation_id: int, messages: List[dict]) -> List[int]:
+        """Append messages to an existing conversation and return their IDs."""
         try:
-            conversation = self.resource.get_conversation(conversation_id)
+            message_ids = await self.message_writes.append(conversation_id, messages)
+
+            if message_ids is None:
+                logger.warning(f"Conversation with ID {conversation_id} not found")
+                raise HTTPException(status_code=404, detail=f"Conversation with ID {conversation_id} not found")
+
+            await self._publish(conversation_id, "messages.appended", messages=[
+                {"message_id": message_id, **message} for message_id, message in zip(message_ids, messages)
+            ])
+            logger.info("Appended %s messages to conversation with ID %s", len(message_ids), conversation_id)
+            return message_ids
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.exception(f"Error occurred while appending messages to conversation with ID: {conversation_id}")
+            raise HTTPException(status_code=400, detail=f"Error appending messages: {str(e)}")
+
+    @staticmethod
+    def resolve_fields(fields: Optional[str] = None, view: Optional[str] = None) -> Optional[List[str]]:
+        """
+        Turn the fields and view query parameters into a field selection.
+
+        :param fields: Comma-separated field names, e.g. "name,participants".
+        :param view: "full" (default) or "summary", which leaves out the message history.
+        :return: The selected fields, or None for the full conversation.
+        """
+        if fields:
+            selected = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+            unknown = [field for field in selected if field not in CONVERSATION_FIELDS]
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+            return selected
+        if view == "summary":
+            return list(SUMMARY_FIELDS)
+        return None
+
+    async def get_messages(self, conversation_id: int, before: Optional[str], limit: int) -> dict:
+        """
+        Get the newest messages of a conversation, scrolling back with a cursor.
+
+        :param before: Opaque cursor returned as next_cursor by the previous page, or None for the newest messages.
+        :return: A dict with up to limit messages, oldest first, and the next_cursor pointing at
+            older messages (None once the start of the conversation is reached).
+        """
+        try:
+            before_message_id = None
+            if before:
+                try:
+                    before_message_id = int(decode_cursor(before)["message_id"])
+                except (ValueError, KeyError, TypeError):
+                    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+            # Fetch one extra row to learn whether older messages remain.
+            messages = await self.resource.get_messages_before(conversation_id, before_message_id, limit + 1)
+            if messages is None:
+                logger.warning(f"Conversation with ID {conversation_id} not found")
+                raise HTTPException(status_code=404, detail=f"Conversation with ID {conversation_id} not found")
+
+            next_cursor = None
+            if len(messages) > limit:
+                messages = messages[:limit]
+                next_cursor = encode_cursor({"message_id": messages[-1]["message_id"]})
+            messages.reverse()
+
+            logger.info("Retrieved %s messages of conversation %s", len(messages), conversation_id)
+            return {"messages": messages, "next_cursor": next_cursor}
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.exception(f"Error occurred while fetching messages of conversation with ID: {conversation_id}")
+            raise HTTPException(status_code=500, detail=f"Error retrieving messages: {str(e)}")
+
+    async def get_conversation_version(self, conversation_id: int) -> int:
+        """Return the conversation's current version without reading its messages; 404 if it does not exist."""
+        try:
+            version = await self.resource.get_conversation_version(conversation_id)
+        except Exception as e:
+            logger.exception(f"Error occurred while fetching version of conversation with ID: {conversation_id}")
+            raise HTTPException(status_code=500, detail=f"Error retrieving conversation: {str(e)}")
+        if version is None:
+            logger.warning(f"Conversation with ID {conversation_id} not found")
+            raise HTTPException(status_code=404, detail=f"Conversation with ID {conversation_id} not found")
+        return version
+
+    async def get_conversation(self, conversation_id: int, fields: Optional[List[str]] = None):
+        """Retrieve a conversation by its ID, optionally only the given fields."""
+        try:
+            conversation = await self.resource.get_conversation(conversation_id, fields)
 
             if not conversation:
                 logger.warning(f"Conversation with ID {conversation_id} not found")
                 raise HTTPException(status_code=404, detail=f"Conversation with ID {conversation_id} not found")
 
-            logger.info(f"Conversation with ID {conversation_id} retrieved successfully")
+            logger.info("Conversation with ID %s retrieved successfully", conversation_id)
             return conversation
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.exception(f"Error occurred while fetching conversation with ID: {conversation_id}")
             raise HTTPException(status_code=500, detail=f"Error retrieving conversation: {str(e)}")
 
-    def get_all_conversations(self):
+    async def get_conversations_batch(self, conversation_ids: List[int], fields: Optional[List[str]] = None) -> dict:
+        """
+        Retrieve many conversations in one round trip.
+
+        :return: A dict with the conversations in request order and the IDs that were not found.
+        """
+        try:
+            unique_ids = list(dict.fromkeys(conversation_ids))
+            found = await self.resource.get_conversations(unique_ids, fields)
+            conversations = [found[i] for i in unique_ids if i in found]
+            missing = [i for i in unique_ids if i not in found]
+
+            logger.info("Batch of %s conversations retrieved, %s missing", len(unique_ids), len(missing))
+            return {"conversations": conversations, "missing": missing}
+
+        except Exception as e:
+            logger.exception(f"Error occurred while fetching conversations: {conversation_ids}")
+            raise HTTPException(status_code=500, detail=f"Error retrieving conversations: {str(e)}")
+
+    async def get_all_conversations(self, fields: Optional[List[str]] = None):
         """Retrieve all conversations."""
         try:
-            conversations = self.resource.get_all_conversations()
+            conversations = await self.resource.get_all_conversations(fields)
 
             if not conversations:
                 logger.warning("No conversations found")
@@ -82,39 +296,96 @@ class ConversationService:
             logger.exception("Error occurred while fetching all conversations")
             raise HTTPException(status_code=500, detail=f"Error retrieving conversations: {str(e)}")
 
-    def delete_conversation(self, conversation_id: int):
+    async def stream_conversations(self, batch_size: int = 500, fields: Optional[List[str]] = None):
+        """Stream all conversations in batches of at most batch_size."""
+        async with aclosing(self.resource.stream_conversations(batch_size, fields)) as batches:
+            async for conversations in batches:
+                yield conversations
+
+    async def delete_conversation(self, conversation_id: int):
         """Delete a conversation by its ID."""
         try:
-            self.resource.delete_conversation(conversation_id)
-            logger.info(f"Conversation with ID {conversation_id} deleted successfully")
+            await self.resource.delete_conversation(conversation_id)
+            self.counts.record_delete()
+            await self._publish(conversation_id, "conversation.deleted")
+            logger.info("Conversation with ID %s deleted successfully", conversation_id)
 
         except Exception as e:
             logger.exception(f"Error occurred while deleting conversation with ID: {conversation_id}")
             raise HTTPException(status_code=400, detail=f"Error deleting conversation: {str(e)}")
 
-    def get_total_conversation_count(self) -> int:
+    async def count_conversations(self, strategy: str = "cached") -> tuple:
+        """
+        Count conversations with the given CountService strategy.
+
+        :return: (total, strategy_used)
+        """
+        try:
+            total_count, strategy_used = await self.counts.count(strategy)
+            logger.info("Conversation count retrieved: %s (strategy: %s)", total_count, strategy_used)
+            return total_count, strategy_used
+
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.exception("Error occurred while counting conversations")
+            raise HTTPException(status_code=500, detail=f"Error retrieving total conversation count: {str(e)}")
+
+    async def get_total_conversation_count(self) -> int:
         """Get the total count of conversations."""
         try:
-            total_count = self.resource.get_total_conversation_count()
-            logger.info(f"Total conversation count retrieved: {total_count}")
+            total_count = await self.resource.get_total_conversation_count()
+            logger.info("Total conversation count retrieved: %s", total_count)
             return total_count
 
         except Exception as e:
             logger.exception("Error occurred while fetching total conversation count")
             raise HTTPException(status_code=500, detail=f"Error retrieving total conversation count: {str(e)}")
 
-    def get_paginated_conversations(self, page: int, limit: int):
+    async def get_paginated_conversations(self, page: int, limit: int, fields: Optional[List[str]] = None):
         """Get a paginated list of conversations."""
         try:
-            conversations = self.resource.get_paginated_conversations(page, limit)
+            conversations = await self.resource.get_paginated_conversations(page, limit, fields)
 
             if not conversations:
                 logger.warning(f"No conversations found for Page: {page}, Limit: {limit}")
                 raise HTTPException(status_code=404, detail="Conversations not found")
 
-            logger.info(f"Paginated conversations retrieved successfully - Page: {page}, Limit: {limit}")
+            logger.info("Paginated conversations retrieved successfully - Page: %s, Limit: %s", page, limit)
             return conversations
 
         except Exception as e:
             logger.exception(f"Error occurred while fetching paginated conversations - Page: {page}, Limit: {limit}")
-            raise HTTPException(status_code=500, detail=f"Error retrieving paginated conversations: {str(e)}")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=f"Error retrieving paginated conversations: {str(e)}")
+
+    async def get_conversations_by_cursor(self, cursor: Optional[str], limit: int,
+                                          fields: Optional[List[str]] = None) -> dict:
+        """
+        Get a page of conversations using keyset pagination.
+
+        :param cursor: Opaque cursor returned as next_cursor by the previous page, or None for the first page.
+        :return: A dict with the page's conversations and the next_cursor (None on the last page).
+        """
+        try:
+            last_convo_id = None
+            if cursor:
+                try:
+                    last_convo_id = int(decode_cursor(cursor)["convo_id"])
+                except (ValueError, KeyError, TypeError):
+                    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+            # Fetch one extra row to learn whether another page follows without a COUNT.
+            conversations = await self.resource.get_conversations_after(last_convo_id, limit + 1, fields)
+            next_cursor = None
+            if len(conversations) > limit:
+                conversations = conversations[:limit]
+                next_cursor = encode_cursor({"convo_id": conversations[-1]["convo_id"]})
+
+            logger.info("Cursor-paginated conversations retrieved successfully - Limit: %s", limit)
+            return {"conversations": conversations, "next_cursor": next_cursor}
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.exception(f"Error occurred while fetching cursor-paginated conversations - Limit: {limit}")
+            raise HTTPException(status_code=500, detail=f"Error retrieving paginated conversations: {str(e)}")
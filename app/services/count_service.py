@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+
+# Configure logger
+logger = logging.getLogger("CountService")
+logger.setLevel(logging.INFO)
+
+
+class CountService:
+    """
+    Answers "how many rows are there?" for one table with a choice of strategies:
+
+    - exact: run COUNT(*) every time.
+    - cached: exact count cached for ttl seconds; invalidated by every insert or delete.
+    - counter: in-process counter seeded from an exact count and then adjusted on each
+      insert/delete made through this service. It is re-seeded every resync_interval
+      seconds to pick up writes made by other instances.
+    - estimate: the table-statistics estimate from the database; no scan at all.
+
+    Callers choose a strategy per call and are told which one actually produced the
+    number, since cached/counter fall back to exact when they have nothing to serve.
+    """
+
+    STRATEGIES = ("exact", "cached", "counter", "estimate")
+
+    def __init__(self, exact_count, estimate_count, ttl: float = 30.0, resync_interval: float = 300.0):
+        """
+        :param exact_count: Coroutine function returning the exact row count.
+        :param estimate_count: Coroutine function returning the estimated row count.
+        :param ttl: Seconds a cached exact count stays valid.
+        :param resync_interval: Seconds between re-seeds of the incremental counter.
+        """
+        self._exact_count = exact_count
+        self._estimate_count = estimate_count
+        self.ttl = ttl
+        self.resync_interval = resync_interval
+
+        self._cached_total = None
+        self._cached_at = 0.0
+        self._counter = None
+        self._counter_seeded_at = 0.0
+        self._lock = None
+
+    async def count(self, strategy: str = "cached") -> tuple:
+        """
+        Count rows with the requested strategy.
+
+        :return: (total, strategy_used)
+        :raises ValueError: If the strategy is unknown.
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown count strategy '{strategy}'. Use one of: {', '.join(self.STRATEGIES)}.")
+
+        if strategy == "estimate":
+            return await self._estimate_count(), "estimate"
+
+        now = time.monotonic()
+        if strategy == "cached" and self._cached_total is not None and now - self._cached_at < self.ttl:
+            return self._cached_total, "cached"
+        if strategy == "counter" and self._counter is not None and now - self._counter_seeded_at < self.resync_interval:
+            return self._counter, "counter"
+        if strategy == "exact":
+            return await self._refresh(), "exact"
+
+        # Cache miss or stale counter: let one caller refresh while the others wait for it.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            if strategy == "cached" and self._cached_total is not None and now - self._cached_at < self.ttl:
+                return self._cached_total, "cached"
+            if strategy == "counter" and self._counter is not None and now - self._counter_seeded_at < self.resync_interval:
+                return self._counter, "counter"
+            return await self._refresh(), "exact"
+
+    def record_insert(self, count: int = 1):
+        """Account for rows inserted through this instance."""
+        self._cached_total = None
+        if self._counter is not None:
+            self._counter += count
+
+    def record_delete(self, count: int = 1):
+        """Account for rows deleted through this instance."""
+        self._cached_total = None
+        if self._counter is not None:
+            self._counter = max(0, self._counter - count)
+
+    def invalidate(self):
+        """Drop the cached count and the counter so the next call recounts."""
+        self._cached_total = None
+        self._counter = None
+
+    async def _refresh(self) -> int:
+        total = await self._exact_count()
+        now = time.monotonic()
+        self._cached_total, self._cached_at = total, now
+        self._counter, self._counter_seeded_at = total, now
+        logger.debug(f"Refreshed exact count: {total}")
+        return total
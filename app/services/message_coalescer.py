@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+# Configure logger
+logger = logging.getLogger("MessageWriteCoalescer")
+logger.setLevel(logging.INFO)
+
+
+class MessageWriteCoalescer:
+    """
+    Group commit for message appends.
+
+    Appends arriving within ``window`` seconds of the first pending one are buffered and
+    written together by a single call to ``flush`` (one transaction, one multi-row INSERT).
+    Each caller is resumed with its own message IDs once that write has committed, so an
+    acknowledged append is durable. A caller waits at most ``window`` seconds for the batch
+    to close, or less if ``max_batch`` messages accumulate first.
+    """
+
+    def __init__(self, flush, window: float = 0.005, max_batch: int = 500):
+        """
+        :param flush: Coroutine function taking a list of (conversation_id, messages) pairs and
+            returning, for each pair, the new message IDs or None if the conversation is missing.
+        :param window: Maximum seconds an append waits for others to join its batch. 0 disables coalescing.
+        :param max_batch: Number of buffered messages that closes a batch early.
+        """
+        self._flush = flush
+        self.window = window
+        self.max_batch = max_batch
+
+        self._pending = []          # (conversation_id, messages, future, enqueued_at)
+        self._pending_messages = 0
+        self._timer = None
+        self._writes = set()        # Batches being written
+
+        # Metrics
+        self._flushes = 0
+        self._appends = 0
+        self._messages = 0
+        self._batch_max = 0
+        self._flush_time_total = 0.0
+        self._flush_time_max = 0.0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def append(self, conversation_id: int, messages: List[dict]) -> Optional[List[int]]:
+        """
+        Buffer an append and wait until the batch containing it has been written.
+
+        :return: The IDs of the new messages, or None if the conversation does not exist.
+        """
+        if self.window <= 0:
+            return (await self._flush([(conversation_id, messages)]))[0]
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((conversation_id, messages, future, time.monotonic()))
+        self._pending_messages += len(messages)
+
+        if self._pending_messages >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._start_flush)
+        return await future
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_messages = self._pending, [], 0
+        if batch:
+            # Later appends start a new batch while this one is being written.
+            task = asyncio.get_running_loop().create_task(self._write(batch))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    async def drain(self):
+        """Write the pending appends now and wait for every batch being written, e.g. on shutdown."""
+        self._start_flush()
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    async def _write(self, batch: list):
+        started_at = time.monotonic()
+        try:
+            results = await self._flush([(conversation_id, messages) for conversation_id, messages, _, _ in batch])
+        except Exception as e:
+            logger.error(f"Coalesced write of {len(batch)} appends failed: {str(e)}")
+            for _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._record(batch, started_at)
+
+        for (_, _, future, _), message_ids in zip(batch, results):
+            if not future.done():
+                future.set_result(message_ids)
+
+    def _record(self, batch: list, started_at: float):
+        now = time.monotonic()
+        flush_time = now - started_at
+        messages = sum(len(messages) for _, messages, _, _ in batch)
+        self._flushes += 1
+        self._appends += len(batch)
+        self._messages += messages
+        self._batch_max = max(self._batch_max, messages)
+        self._flush_time_total += flush_time
+        self._flush_time_max = max(self._flush_time_max, flush_time)
+        for _, _, _, enqueued_at in batch:
+            waited = now - enqueued_at
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def stats(self) -> dict:
+        """Return batch size and latency metrics."""
+        return {
+            "window": self.window,
+            "max_batch": self.max_batch,
+            "pending_appends": len(self._pending),
+            "flushes": self._flushes,
+            "appends": self._appends,
+            "messages": self._messages,
+            "batch_messages_avg": self._messages / self._flushes if self._flushes else 0.0,
+            "batch_appends_avg": self._appends / self._flushes if self._flushes else 0.0,
+            "batch_messages_max": self._batch_max,
+            "flush_time_avg": self._flush_time_total / self._flushes if self._flushes else 0.0,
+            "flush_time_max": self._flush_time_max,
+            "ack_latency_avg": self._wait_total / self._appends if self._appends else 0.0,
+            "ack_latency_max": self._wait_max,
+        }
@@ -1,6 +1,17 @@
 from framework.services.service_factory import BaseServiceFactory
 from app.resources.conversation_resource import ConversationResource
 from framework.services.data_access.MySQLRDBDataService import MySQLRDBDataService
+from framework.services.data_access.SQLiteRDBDataService import SQLiteRDBDataService
+from framework.services.data_access.ReplicatedDataService import ReplicatedDataService
+from framework.services.data_access.QueryProfiler import QueryProfiler
+from framework.middleware.ReadYourWrites import ReadYourWrites
+from framework.services.cache.LRUCache import LRUCache
+from framework.services.cache.SharedCache import SharedCache, InMemoryKeyValueStore
+from framework.services.jobs.JobRunner import JobRunner
+from framework.services.jobs.SQLiteJobStore import SQLiteJobStore
+from framework.services.events.EventHub import EventHub
+from framework.services.events.InMemoryBroker import InMemoryBroker
+from framework.services.events.RedisBroker import RedisBroker
 from dotenv import load_dotenv
 import os
 import logging
@@ -10,54 +21,180 @@ logger = logging.getLogger("ServiceFactory")
 logger.setLevel(logging.DEBUG)  # Set to DEBUG for detailed logs; adjust as needed
 
 class ServiceFactory(BaseServiceFactory):
+    # Every service is a singleton: one pool, cache, job runner and event hub per process.
+    lifetimes = {}
+
+    # Started by the application's lifespan before it takes traffic, in this order
+    startup_services = ('ConversationService', 'JobRunner')
+
+    env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.env'))
+    _environment_loaded = False
+
     def __init__(self):
         super().__init__()
 
-    # Load environment variables from .env file
-    env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.env'))
-    if os.path.exists(env_path):
-        load_dotenv(dotenv_path=env_path)
-        logger.info(f"Loaded environment variables from {env_path}")
-    else:
-        logger.warning(f".env file not found at {env_path}")
+    @classmethod
+    def load_environment(cls):
+        """Load environment variables from the .env file, once. Variables already set take precedence."""
+        if cls._environment_loaded:
+            return
+        cls._environment_loaded = True
+        if os.path.exists(cls.env_path):
+            load_dotenv(dotenv_path=cls.env_path)
+            logger.info(f"Loaded environment variables from {cls.env_path}")
+        else:
+            logger.warning(f".env file not found at {cls.env_path}")
 
     @classmethod
-    def get_service(cls, service_name):
+    def create_service(cls, service_name):
         """
-        Retrieve a service instance based on the provided service name.
+        Create a new instance of the service with the provided name. Use get_service() to
+        get the shared instance instead.
         
         :param service_name: The name of the service to instantiate.
         :return: An instance of the requested service.
         :raises ValueError: If the service name is not supported.
         """
-        logger.info(f"Attempting to retrieve service: {service_name}")
+        cls.load_environment()
+        logger.info(f"Creating service: {service_name}")
 
         try:
             if service_name == 'ConversationResourceService':
+                backend = os.getenv("DB_BACKEND", "mysql")
+                if backend == "sqlite":
+                    # Embedded database file; the schema script creates missing tables on startup
+                    context = {
+                        "path": os.getenv("SQLITE_PATH", "p1_database.db"),
+                        "database": "p1_database",  # The name the resource's statements use
+                        "schema": os.getenv("SQLITE_SCHEMA", os.path.abspath(
+                            os.path.join(os.path.dirname(__file__), '../database/p1_database_sqlite.sql'))),
+                        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+                        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),  # Bytes
+                        "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", 64 * 1024)),  # KiB per connection
+                        "busy_timeout": float(os.getenv("SQLITE_BUSY_TIMEOUT", 10)),  # Seconds a writer waits for the lock
+                        "query_timeout": float(os.getenv("DB_QUERY_TIMEOUT", 30))
+                    }
+                    logger.debug(f"SQLite database context: {context}")
+                    service = SQLiteRDBDataService(context)
+                    logger.info(f"Successfully instantiated service: {service_name} (sqlite)")
+                    return service
+                elif backend != "mysql":
+                    raise ValueError(f"Unsupported DB_BACKEND {backend}.")
+
                 # Prepare database connection context
                 context = {
                     "host": os.getenv("DB_HOST"),
                     "port": int(os.getenv("DB_PORT", 3306)),  # Default to 3306 if not defined
                     "user": os.getenv("DB_USER"),
                     "password": os.getenv("DB_PASSWORD"),
-                    "database": os.getenv("DB_NAME")
+                    "database": os.getenv("DB_NAME"),
+                    "pool_min_size": int(os.getenv("DB_POOL_MIN_SIZE", 1)),
+                    "pool_max_size": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+                    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),  # Seconds to wait for a free connection
+                    "pool_recycle": float(os.getenv("DB_POOL_RECYCLE", 3600)),  # Max connection age in seconds
+                    "pool_health_check_interval": float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", 30)),
+                    "query_timeout": float(os.getenv("DB_QUERY_TIMEOUT", 30))  # Per-call timeout for async data access
                 }
                 # Mask sensitive data in logs
                 masked_context = {**context, "password": "******"}
                 logger.debug(f"Database connection context: {masked_context}")
 
+                # Per-statement timings for /diagnostics/queries and the slow-query log; DB_QUERY_PROFILE=false disables
+                if os.getenv("DB_QUERY_PROFILE", "true").lower() in ("true", "1", "yes"):
+                    context["query_profiler"] = QueryProfiler(
+                        slow_threshold=float(os.getenv("DB_SLOW_QUERY_SECONDS", 0.5)),
+                        explain=os.getenv("DB_SLOW_QUERY_EXPLAIN", "false").lower() in ("true", "1", "yes")
+                    )
+
                 service = MySQLRDBDataService(context)
+
+                # Read replicas, e.g. DB_REPLICA_HOSTS=replica1:3306,replica2; same credentials as the primary
+                replica_hosts = [host.strip() for host in os.getenv("DB_REPLICA_HOSTS", "").split(",") if host.strip()]
+                if replica_hosts:
+                    replicas = {}
+                    for replica_host in replica_hosts:
+                        host, _, port = replica_host.partition(":")
+                        replicas[replica_host] = MySQLRDBDataService({
+                            **context,
+                            "host": host,
+                            "port": int(port or context["port"]),
+                            # Fail fast, so that an unreachable replica is ejected quickly
+                            "connect_timeout": float(os.getenv("DB_REPLICA_CONNECT_TIMEOUT", 2))
+                        })
+                    service = ReplicatedDataService(
+                        service,
+                        replicas,
+                        eject_after=int(os.getenv("DB_REPLICA_EJECT_AFTER", 3)),  # Consecutive failures
+                        eject_seconds=float(os.getenv("DB_REPLICA_EJECT_SECONDS", 30))
+                    )
+                    logger.info(f"Routing reads to replicas {', '.join(replica_hosts)}.")
                 logger.info(f"Successfully instantiated service: {service_name}")
                 return service
 
+            elif service_name == 'ReadYourWrites':
+                # Seconds a client's reads go to the primary after it wrote; 0 disables pinning
+                service = ReadYourWrites(window=float(os.getenv("DB_READ_YOUR_WRITES_WINDOW", 5)))
+                logger.info(f"Successfully instantiated service: {service_name}")
+                return service
+
+            elif service_name == 'ConversationCache':
+                backend = os.getenv("CACHE_BACKEND", "lru")
+                ttl = float(os.getenv("CACHE_TTL", 60))
+                if backend == "lru":
+                    service = LRUCache(max_entries=int(os.getenv("CACHE_MAX_ENTRIES", 1024)), ttl=ttl)
+                elif backend == "shared":
+                    redis_url = os.getenv("CACHE_REDIS_URL")
+                    if redis_url:
+                        import redis.asyncio  # Optional dependency, only needed for a Redis-backed cache
+                        client = redis.asyncio.from_url(redis_url)
+                    else:
+                        logger.warning("CACHE_REDIS_URL is not set; using the in-memory stand-in for the shared cache.")
+                        client = InMemoryKeyValueStore()
+                    service = SharedCache(client, namespace="conversation", ttl=ttl)
+                else:
+                    raise ValueError(f"Unsupported CACHE_BACKEND {backend}.")
+                logger.info(f"Successfully instantiated service: {service_name} ({backend})")
+                return service
+
+            elif service_name == 'JobRunner':
+                # Processes sharing the task file renew a lease on their tasks every purge (60s)
+                store = SQLiteJobStore(os.getenv("TASK_DB_PATH", "tasks.db"), lease=float(os.getenv("JOB_OWNER_LEASE", 300)))
+                service = JobRunner(
+                    store,
+                    concurrency=int(os.getenv("JOB_CONCURRENCY", 4)),
+                    max_queue=int(os.getenv("JOB_MAX_QUEUE", 1000)),
+                    ttl=float(os.getenv("JOB_TTL", 3600)),  # Seconds finished tasks stay retrievable
+                    max_waiters=int(os.getenv("JOB_MAX_WAITERS", 1000))  # Concurrent long-poll/stream watchers
+                )
+                logger.info(f"Successfully instantiated service: {service_name}")
+                return service
+
+            elif service_name == 'EventHub':
+                backend = os.getenv("EVENT_BROKER", "memory")
+                if backend == "memory":
+                    broker = InMemoryBroker()
+                elif backend == "redis":
+                    import redis.asyncio  # Optional dependency, only needed to share events between instances
+                    broker = RedisBroker(redis.asyncio.from_url(os.environ["EVENT_REDIS_URL"]), namespace="conversation-events")
+                else:
+                    raise ValueError(f"Unsupported EVENT_BROKER {backend}.")
+                service = EventHub(broker, max_queue=int(os.getenv("EVENT_SUBSCRIBER_QUEUE", 100)))
+                logger.info(f"Successfully instantiated service: {service_name} ({backend})")
+                return service
+
             elif service_name == 'ConversationResource':
                 service = ConversationResource()
                 return service
 
+            elif service_name == 'ConversationService':
+                from app.services.conversation_service import ConversationService  # Imports this module
+                service = ConversationService()
+                return service
+
             else:
                 logger.error(f"Service {service_name} is not supported.")
                 raise ValueError(f"Service {service_name} is not supported.")
 
         except Exception as e:
-            logger.exception(f"Error occurred while retrieving service: {service_name}")
+            logger.exception(f"Error occurred while creating service: {service_name}")
             raise
\ No newline at end of file
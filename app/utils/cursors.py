@@ -0,0 +1,24 @@
+import base64
+import json
+
+
+def encode_cursor(position: dict) -> str:
+    """Encode a pagination position as an opaque, URL-safe cursor string."""
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    :raises ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor.")
+    if not isinstance(position, dict):
+        raise ValueError("Invalid cursor.")
+    return position
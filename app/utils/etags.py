@@ -0,0 +1,41 @@
+import hashlib
+import json
+from typing import Optional
+
+
+def conversation_etag(conversation_id: int, version: int, fields: Optional[list] = None) -> str:
+    """
+    Strong ETag of one conversation: "<convo_id>-<version>" for the full representation,
+    with a suffix identifying the field selection for projected ones.
+    """
+    tag = f"{conversation_id}-{version}"
+    if fields:
+        tag += "-" + hashlib.sha1(",".join(fields).encode("utf-8")).hexdigest()[:8]
+    return f'"{tag}"'
+
+
+def parse_conversation_etag(etag: str) -> Optional[tuple]:
+    """Return (convo_id, version) from a full-representation conversation ETag, or None."""
+    parts = etag.strip().strip('"').split("-")
+    if len(parts) != 2 or not all(part.isdigit() for part in parts):
+        return None
+    return int(parts[0]), int(parts[1])
+
+
+def content_etag(*parts) -> str:
+    """Strong ETag derived from a hash of the JSON-serializable parts, e.g. the (id, version) pairs of a listing."""
+    raw = json.dumps(parts, separators=(",", ":"), default=str).encode("utf-8")
+    return '"' + hashlib.sha1(raw).hexdigest()[:20] + '"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header value matches etag. Comparison is weak (a W/ prefix is
+    ignored), as RFC 9110 requires for If-None-Match.
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
@@ -0,0 +1,134 @@
+"""
+Micro-benchmark of MySQLRDBDataService statement building and the write path.
+
+Runs against an in-process stand-in connection that charges a fixed latency per statement,
+so it needs no database:
+
+    python -m benchmarks.data_service_writes [--iterations 2000] [--latency-ms 0.2]
+
+It compares, per operation:
+  * building SQL with the statement cache disabled vs. enabled;
+  * the former check-then-write path (fetch_one + update, two round trips) vs. the
+    single-statement update that detects a missing row from rowcount.
+"""
+import argparse
+import json
+import logging
+import time
+
+from framework.services.data_access.MySQLRDBDataService import MySQLRDBDataService
+
+
+class StandInCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.lastrowid = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.connection.round_trips += 1
+        if self.connection.latency:
+            time.sleep(self.connection.latency)
+        return 1
+
+    def fetchone(self):
+        return {"convo_id": 1}
+
+    def fetchall(self):
+        return [{"convo_id": 1}]
+
+    def close(self):
+        pass
+
+
+class StandInConnection:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.round_trips = 0
+
+    def cursor(self, cursorclass=None):
+        return StandInCursor(self)
+
+    def ping(self, reconnect=False):
+        pass
+
+    def begin(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class StandInDataService(MySQLRDBDataService):
+    def __init__(self, latency: float, statement_cache_size: int = 512):
+        self.connection = StandInConnection(latency)
+        super().__init__({"pool_min_size": 1, "pool_max_size": 1, "statement_cache_size": statement_cache_size})
+
+    def _get_connection(self):
+        return self.connection
+
+
+DATA = {"name": "n", "participants": "[]", "messages": None, "isGroup": 0}
+
+
+def measure(data_service, operation, iterations: int) -> dict:
+    connection = data_service.connection
+    round_trips, checkouts = connection.round_trips, data_service.pool_stats()["checkouts"]
+    started = time.perf_counter()
+    for i in range(iterations):
+        operation(data_service, i)
+    elapsed = time.perf_counter() - started
+    return {
+        "us_per_op": round(elapsed / iterations * 1e6, 2),
+        "round_trips_per_op": (connection.round_trips - round_trips) / iterations,
+        "checkouts_per_op": (data_service.pool_stats()["checkouts"] - checkouts) / iterations,
+    }
+
+
+def check_then_update(data_service, i):
+    if data_service.fetch_one("p1_database", "conversations", "convo_id", i):
+        data_service.update("p1_database", "conversations", DATA, "convo_id", i)
+
+
+def single_statement_update(data_service, i):
+    data_service.update("p1_database", "conversations", DATA, "convo_id", i)
+
+
+def build_statements(data_service, i):
+    data_service.fetch_one("p1_database", "conversations", "convo_id", i, columns=["convo_id", "name"])
+    data_service.fetch_range("p1_database", "messages", "message_id", 50, before=i, descending=True,
+                             filters={"convo_id": i})
+    data_service.update("p1_database", "conversations", DATA, "convo_id", i)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=0.2, help="Simulated round-trip time per statement")
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+    logging.disable(logging.INFO)  # Per-call log records would dominate the timings
+
+    results = {
+        # Statement building in isolation: no simulated latency.
+        "build_uncached": measure(StandInDataService(0, statement_cache_size=0), build_statements, args.iterations),
+        "build_cached": measure(StandInDataService(0), build_statements, args.iterations),
+        "update_check_then_write": measure(StandInDataService(latency), check_then_update, args.iterations),
+        "update_single_statement": measure(StandInDataService(latency), single_statement_update, args.iterations),
+    }
+    print(json.dumps({"iterations": args.iterations, "latency_ms": args.latency_ms, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,488 @@
+"""
+Load test of every route in app/routers/conversations.py against a local stand-in database.
+
+    python -m benchmarks.load_test [--conversations 1000] [--messages 20] [--participants 3]
+                                   [--concurrency 16] [--requests 400] [--output results.json]
+                                   [--baseline previous.json --max-regression 0.25]
+
+It creates and seeds a SQLite stand-in database (benchmarks.standin_db) in a temporary
+directory, starts app.main:app on it in a subprocess (benchmarks.standin_server), and runs
+one scenario per route, one after another. In each scenario --concurrency clients with
+keep-alive connections send --requests requests between them (listings of every
+conversation send a twentieth of that, bulk creation a tenth). The result is JSON with the throughput and the
+p50/p95/p99 latency of each scenario.
+
+--backend sqlite serves the database with SQLiteRDBDataService (DB_BACKEND=sqlite) instead
+of MySQLRDBDataService over the stand-in connection.
+
+With --baseline, p95 latencies are compared against an earlier result and the exit status
+is 1 if any scenario got slower by more than --max-regression (a fraction).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlencode
+
+from benchmarks.standin_db import SCHEMA_PATH, StandInDataService, create_database, seed
+from framework.services.data_access.SQLiteRDBDataService import SQLiteRDBDataService
+
+
+class HTTPClient:
+    """Minimal HTTP/1.1 client over one keep-alive connection; just enough for the benchmark."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        return self
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+            self.writer = None
+
+    async def send(self, method: str, path: str, body=None, headers: dict = None):
+        if self.writer is None:
+            await self.connect()
+        payload = b""
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        if body is not None:
+            payload = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+            lines += ["Content-Type: application/json", f"Content-Length: {len(payload)}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + payload)
+        await self.writer.drain()
+
+    async def read_head(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by the server")
+        status = int(status_line.split(b" ", 2)[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, value = line.decode("latin-1").split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+        return status, headers
+
+    async def read_chunk(self) -> bytes:
+        """Read one chunk of a chunked body; b"" at the end of the body."""
+        size = int((await self.reader.readline()).split(b";")[0], 16)
+        if size == 0:
+            while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # Trailers
+            return b""
+        chunk = await self.reader.readexactly(size)
+        await self.reader.readexactly(2)
+        return chunk
+
+    async def read_body(self, status: int, headers: dict) -> bytes:
+        if status in (204, 304):
+            return b""
+        if "content-length" in headers:
+            return await self.reader.readexactly(int(headers["content-length"]))
+        if headers.get("transfer-encoding") == "chunked":
+            chunks = []
+            while chunk := await self.read_chunk():
+                chunks.append(chunk)
+            return b"".join(chunks)
+        body = await self.reader.read()
+        await self.close()
+        return body
+
+    async def request(self, method: str, path: str, body=None, headers: dict = None):
+        """Send a request and read the whole response. Returns (status, headers, body)."""
+        await self.send(method, path, body, headers)
+        status, response_headers = await self.read_head()
+        response_body = await self.read_body(status, response_headers)
+        if response_headers.get("connection") == "close":
+            await self.close()
+        return status, response_headers, response_body
+
+    async def json(self, method: str, path: str, body=None, headers: dict = None):
+        status, _, response_body = await self.request(method, path, body, headers)
+        return status, json.loads(response_body) if response_body else None
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(1, math.ceil(fraction * len(sorted_values))) - 1]
+
+
+class LoadTest:
+    """Scenarios, each driving one route; state prepared for one scenario is kept in self.state."""
+
+    def __init__(self, host: str, port: int, args, conversation_ids: list, data_service):
+        self.host = host
+        self.port = port
+        self.args = args
+        self.ids = conversation_ids
+        self.data_service = data_service
+        self.state = {}
+
+    def conversation_id(self, i: int) -> int:
+        return self.ids[(i * 7919) % len(self.ids)]  # Spread requests over the table, not only its start
+
+    def conversation_body(self, i: int) -> dict:
+        return {
+            "name": f"Load test {i}",
+            "participants": [f"user{(i + n) % 50}" for n in range(self.args.participants)],
+            "messages": [
+                {"text": f"message {n} of {i}", "sender": f"user{n % 50}", "timestamp": f"{n % 24:02d}:00"}
+                for n in range(self.args.messages)
+            ],
+            "isGroup": self.args.participants > 2,
+        }
+
+    # Scenario operations: async (client, i) -> status code
+
+    async def get_conversation(self, client, i):
+        status, _, _ = await client.request("GET", f"/conversations/{self.conversation_id(i)}")
+        return status
+
+    async def get_conversation_summary(self, client, i):
+        status, _, _ = await client.request("GET", f"/conversations/{self.conversation_id(i)}?view=summary")
+        return status
+
+    async def prepare_not_modified(self, count):
+        client = await HTTPClient(self.host, self.port).connect()
+        try:
+            etags = []
+            for i in range(min(count, 200)):
+                _, headers, _ = await client.request("GET", f"/conversations/{self.conversation_id(i)}?view=summary")
+                etags.append((self.conversation_id(i), headers["etag"]))
+            self.state["etags"] = etags
+        finally:
+            await client.close()
+
+    async def get_conversation_not_modified(self, client, i):
+        conversation_id, etag = self.state["etags"][i % len(self.state["etags"])]
+        status, _, _ = await client.request("GET", f"/conversations/{conversation_id}?view=summary",
+                                            headers={"If-None-Match": etag})
+        return status
+
+    async def get_batch(self, client, i):
+        ids = ",".join(str(self.conversation_id(i * 10 + n)) for n in range(10))
+        status, _, _ = await client.request("GET", f"/conversations:batch?ids={ids}")
+        return status
+
+    async def post_batch(self, client, i):
+        ids = [self.conversation_id(i * 10 + n) for n in range(10)]
+        status, _, _ = await client.request("POST", "/conversations:batch", {"ids": ids})
+        return status
+
+    async def prepare_cursor_pages(self, count):
+        client = await HTTPClient(self.host, self.port).connect()
+        try:
+            cursors = [None]
+            while len(cursors) < 50:
+                query = {"limit": 20, **({"cursor": cursors[-1]} if cursors[-1] else {})}
+                _, page = await client.json("GET", "/conversations/?" + urlencode(query))
+                if not page["next_cursor"]:
+                    break
+                cursors.append(page["next_cursor"])
+            self.state["cursors"] = cursors
+        finally:
+            await client.close()
+
+    async def list_by_cursor(self, client, i):
+        cursor = self.state["cursors"][i % len(self.state["cursors"])]
+        query = {"limit": 20, **({"cursor": cursor} if cursor else {})}
+        status, _, _ = await client.request("GET", "/conversations/?" + urlencode(query))
+        return status
+
+    async def list_by_page(self, client, i):
+        pages = max(1, len(self.ids) // 20)
+        status, _, _ = await client.request("GET", f"/conversations/?page={i % pages + 1}&limit=20")
+        return status
+
+    async def list_all(self, client, i):
+        status, _, _ = await client.request("GET", "/conversations/")
+        return status
+
+    async def stream_all(self, client, i):
+        status, _, _ = await client.request("GET", "/conversations/?stream=ndjson")
+        return status
+
+    async def get_messages(self, client, i):
+        status, _, _ = await client.request("GET", f"/conversations/{self.conversation_id(i)}/messages?limit=50")
+        return status
+
+    async def subscribe_events(self, client, i):
+        # Time until the first event arrives, i.e. until the subscription is established
+        stream = await HTTPClient(self.host, self.port).connect()
+        try:
+            await stream.send("GET", f"/conversations/{self.conversation_id(i)}/events")
+            status, headers = await stream.read_head()
+            if status == 200:
+                await stream.read_chunk()
+            return status
+        finally:
+            await stream.close()
+
+    async def append_message(self, client, i):
+        message = {"text": f"load test message {i}", "sender": "loadtest", "timestamp": "12:00"}
+        status, _, _ = await client.request("POST", f"/conversations/{self.conversation_id(i)}/messages", message)
+        return status
+
+    async def update_conversation(self, client, i):
+        status, _, _ = await client.request("PUT", f"/conversations/{self.conversation_id(i)}",
+                                            self.conversation_body(i))
+        return status
+
+    async def create_conversation(self, client, i):
+        status, body = await client.json("POST", "/conversations/", self.conversation_body(i))
+        self.state.setdefault("tasks", []).append(body["task_id"])
+        return status
+
+    async def get_task(self, client, i):
+        status, _, _ = await client.request("GET", f"/tasks/{self.state['tasks'][i % len(self.state['tasks'])]}")
+        return status
+
+    async def create_and_wait(self, client, i):
+        # End-to-end latency of an asynchronous creation: accepted, queued, run and reported
+        _, body = await client.json("POST", "/conversations/", self.conversation_body(i))
+        status, task = await client.json("GET", f"/tasks/{body['task_id']}?wait=30")
+        return status if task["status"] == "completed" else 500
+
+    async def task_events(self, client, i):
+        task_id = self.state["tasks"][i % len(self.state["tasks"])]
+        await client.send("GET", f"/tasks/{task_id}/events")
+        status, headers = await client.read_head()
+        await client.read_body(status, headers)
+        return status
+
+    async def create_bulk(self, client, i):
+        items = [self.conversation_body(i * 10 + n) for n in range(10)]
+        status, _, _ = await client.request("POST", "/conversations/bulk", items)
+        return status
+
+    async def prepare_delete(self, count):
+        # Conversations of their own, seeded directly, so deleting them leaves the others intact
+        self.state["deletable"] = seed(self.data_service, count, self.args.messages, self.args.participants,
+                                       seed_value=len(self.ids))
+
+    async def delete_conversation(self, client, i):
+        status, _, _ = await client.request("DELETE", f"/conversations/{self.state['deletable'][i]}")
+        return status
+
+    def scenarios(self) -> list:
+        """(name, route, operation, share of --requests, prepare). Reads run before writes."""
+        return [
+            ("get_conversation", "GET /conversations/{id}", self.get_conversation, 1, None),
+            ("get_conversation_summary", "GET /conversations/{id}?view=summary", self.get_conversation_summary, 1, None),
+            ("get_conversation_not_modified", "GET /conversations/{id} (If-None-Match)",
+             self.get_conversation_not_modified, 1, self.prepare_not_modified),
+            ("get_batch", "GET /conversations:batch", self.get_batch, 1, None),
+            ("post_batch", "POST /conversations:batch", self.post_batch, 1, None),
+            ("list_by_cursor", "GET /conversations/?cursor=&limit=", self.list_by_cursor, 1, self.prepare_cursor_pages),
+            ("list_by_page", "GET /conversations/?page=&limit=", self.list_by_page, 1, None),
+            ("list_all", "GET /conversations/", self.list_all, 1 / 20, None),
+            ("stream_all", "GET /conversations/?stream=ndjson", self.stream_all, 1 / 20, None),
+            ("get_messages", "GET /conversations/{id}/messages", self.get_messages, 1, None),
+            ("subscribe_events", "GET /conversations/{id}/events", self.subscribe_events, 1, None),
+            ("append_message", "POST /conversations/{id}/messages", self.append_message, 1, None),
+            ("update_conversation", "PUT /conversations/{id}", self.update_conversation, 1, None),
+            ("create_conversation", "POST /conversations/", self.create_conversation, 1, None),
+            ("get_task", "GET /tasks/{task_id}", self.get_task, 1, None),
+            ("task_events", "GET /tasks/{task_id}/events", self.task_events, 1, None),
+            ("create_and_wait", "POST /conversations/ + GET /tasks/{task_id}?wait=", self.create_and_wait, 1, None),
+            ("create_bulk", "POST /conversations/bulk (10 per request)", self.create_bulk, 1 / 10, None),
+            ("delete_conversation", "DELETE /conversations/{id}", self.delete_conversation, 1, self.prepare_delete),
+        ]
+
+    async def run_scenario(self, operation, total: int, warmup: int) -> dict:
+        """Run operation for indices [0, warmup) unmeasured, then [warmup, warmup + total) measured."""
+        async def drive(indices, latencies, failures):
+            client = await HTTPClient(self.host, self.port).connect()
+            try:
+                for i in indices:
+                    started = time.perf_counter()
+                    try:
+                        status = await operation(client, i)
+                    except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError, KeyError) as e:
+                        failures[type(e).__name__] = failures.get(type(e).__name__, 0) + 1
+                        await client.close()
+                        continue
+                    latencies.append(time.perf_counter() - started)
+                    if status >= 400:
+                        failures[str(status)] = failures.get(str(status), 0) + 1
+            finally:
+                await client.close()
+
+        async def run(start, count, latencies, failures):
+            indices = iter(range(start, start + count))  # Shared, so clients take the next index when free
+            await asyncio.gather(*(drive(indices, latencies, failures)
+                                   for _ in range(min(self.args.concurrency, count))))
+
+        await run(0, warmup, [], {})
+        latencies, failures = [], {}
+        started = time.perf_counter()
+        await run(warmup, total, latencies, failures)
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        return {
+            "requests": total,
+            "errors": sum(failures.values()),
+            "error_kinds": failures,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.50) * 1000, 3),
+                "p95": round(percentile(latencies, 0.95) * 1000, 3),
+                "p99": round(percentile(latencies, 0.99) * 1000, 3),
+                "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+                "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            },
+        }
+
+    async def run(self, selected=None) -> dict:
+        results = {}
+        for name, route, operation, share, prepare in self.scenarios():
+            if selected and name not in selected:
+                continue
+            total = max(1, int(self.args.requests * share))
+            warmup = min(self.args.warmup, total)
+            if prepare is not None:
+                await prepare(total + warmup)
+            if name in ("get_task", "task_events") and not self.state.get("tasks"):
+                await self.run_scenario(self.create_conversation, total, 0)
+            results[name] = {"route": route, **await self.run_scenario(operation, total, warmup)}
+            print(f"{name:32} p50 {results[name]['latency_ms']['p50']:>9.2f} ms   "
+                  f"p99 {results[name]['latency_ms']['p99']:>9.2f} ms   "
+                  f"{results[name]['throughput_rps']:>8.1f} req/s   {results[name]['errors']} errors", file=sys.stderr)
+        return results
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_until_ready(host: str, port: int, server: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"The server exited with status {server.returncode}")
+        client = HTTPClient(host, port)
+        try:
+            await client.connect()
+            status, _, _ = await client.request("GET", "/")
+            if status == 200:
+                return
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            await client.close()
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f"The server did not start within {timeout}s")
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list:
+    """Scenarios whose p95 latency grew by more than max_regression relative to the baseline."""
+    regressions = []
+    for name, result in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before or not before["latency_ms"]["p95"]:
+            continue
+        ratio = result["latency_ms"]["p95"] / before["latency_ms"]["p95"]
+        result["p95_vs_baseline"] = round(ratio, 3)
+        if ratio > 1 + max_regression:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--conversations", type=int, default=1000, help="Conversations seeded before the run")
+    parser.add_argument("--messages", type=int, default=20, help="Messages per conversation")
+    parser.add_argument("--participants", type=int, default=3, help="Participants per conversation")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients per scenario")
+    parser.add_argument("--requests", type=int, default=400, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests before each scenario")
+    parser.add_argument("--scenarios", help="Comma-separated scenario names to run (default: all)")
+    parser.add_argument("--backend", choices=["standin", "sqlite"], default="standin",
+                        help="MySQLRDBDataService over a stand-in connection, or SQLiteRDBDataService")
+    parser.add_argument("--pool-size", type=int, default=10, help="Database connection pool size of the server")
+    parser.add_argument("--output", help="Write the JSON result to this file instead of stdout")
+    parser.add_argument("--baseline", help="Earlier JSON result to compare p95 latencies against")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="Allowed p95 growth over the baseline, as a fraction")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory(prefix="chat-load-test-") as directory:
+        database = os.path.join(directory, "p1_database.sqlite")
+        if args.backend == "sqlite":
+            data_service = SQLiteRDBDataService({"path": database, "database": "p1_database", "schema": SCHEMA_PATH})
+        else:
+            create_database(database)
+            data_service = StandInDataService({"path": database, "pool_min_size": 1, "pool_max_size": 1})
+        started = time.perf_counter()
+        conversation_ids = seed(data_service, args.conversations, args.messages, args.participants)
+        seed_seconds = time.perf_counter() - started
+
+        host, port = "127.0.0.1", free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.standin_server", "--database", database, "--host", host,
+             "--port", str(port), "--backend", args.backend, "--pool-size", str(args.pool_size)],
+            env={**os.environ, "TASK_DB_PATH": os.path.join(directory, "tasks.db")},
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        try:
+            asyncio.run(wait_until_ready(host, port, server))
+            load_test = LoadTest(host, port, args, conversation_ids, data_service)
+            scenarios = asyncio.run(load_test.run(set(args.scenarios.split(",")) if args.scenarios else None))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+            data_service.close()
+
+    results = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpus": os.cpu_count()},
+        "seed_s": round(seed_seconds, 3),
+        "scenarios": scenarios,
+    }
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        results["regressions"] = regressions
+
+    encoded = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(encoded + "\n")
+    else:
+        print(encoded)
+    if regressions:
+        print(f"p95 regressions over {args.max_regression:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
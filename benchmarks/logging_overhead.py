@@ -0,0 +1,110 @@
+"""
+Micro-benchmark of the logging done while handling one request.
+
+Each simulated request writes the records a GET /conversations/{id} writes: the completed
+request line, and one line each from the router, ConversationService and ConversationResource.
+
+    python -m benchmarks.logging_overhead [--requests 20000] [--write-latency-ms 0]
+
+It compares the time the request's thread spends logging with:
+  * the former setup: f-strings and a StreamHandler writing on the request's thread;
+  * configure_logging(): lazy arguments queued to a listener thread that writes JSON, with
+    every INFO record kept and with LOG_SAMPLE_INFO=0.1.
+--write-latency-ms simulates a slow log destination (e.g. a pipe to a busy log agent).
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+
+from framework.utils.StructuredLogging import configure_logging, stop_logging, trace_id_var
+
+LOGGERS = [logging.getLogger(name) for name in ("app.main", "app.routers.conversations", "ConversationService",
+                                                "ConversationResource")]
+
+
+class SlowStream:
+    """File that takes latency seconds per write."""
+
+    def __init__(self, stream, latency: float):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def eager_request(i: int):
+    main, router, service, resource = LOGGERS
+    trace_id = str(uuid.uuid4())
+    router.info(f"TRACE_ID={trace_id} - Successfully retrieved conversation with ID {i}")
+    service.info(f"Conversation with ID {i} retrieved successfully")
+    resource.info(f"Conversation with ID {i} retrieved successfully.")
+    main.info(f"TRACE_ID={trace_id} - Completed Request: GET http://localhost/conversations/{i} "
+              f"with Status 200 in {0.0012:.4f}s")
+
+
+def lazy_request(i: int):
+    main, router, service, resource = LOGGERS
+    trace_id = str(uuid.uuid4())
+    trace_id_var.set(trace_id)
+    router.info("TRACE_ID=%s - Successfully retrieved conversation with ID %s", trace_id, i)
+    service.info("Conversation with ID %s retrieved successfully", i)
+    resource.info("Conversation with ID %s retrieved successfully.", i)
+    main.info("TRACE_ID=%s - Completed Request: %s %s with Status %s in %.4fs",
+              trace_id, "GET", f"/conversations/{i}", 200, 0.0012,
+              extra={"method": "GET", "path": f"/conversations/{i}", "status": 200, "duration_s": 0.0012})
+
+
+def measure(request, requests: int, stop=None) -> dict:
+    started = time.perf_counter()
+    for i in range(requests):
+        request(i)
+    elapsed = time.perf_counter() - started
+    if stop:
+        stop()  # Waits for the listener to write out the queue
+    drained = time.perf_counter() - started
+    return {
+        "us_per_request": round(elapsed / requests * 1e6, 2),
+        "us_per_request_until_written": round(drained / requests * 1e6, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--write-latency-ms", type=float, default=0.0, help="Simulated time per log write")
+    args = parser.parse_args()
+    latency = args.write_latency_ms / 1000
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, open(os.path.join(directory, "log"), "w") as log:
+        stream = SlowStream(log, latency)
+
+        # The former configuration (logging.basicConfig in app/routers/conversations.py)
+        root = logging.getLogger()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        results["sync_fstring"] = measure(eager_request, args.requests)
+        root.removeHandler(handler)
+
+        for name, rates in (("queued_json", {}), ("queued_json_sampled_0.1", {logging.INFO: 0.1})):
+            configure_logging(level="INFO", log_format="json", sample_rates=rates,
+                              queue_size=args.requests * len(LOGGERS), stream=stream)
+            results[name] = measure(lazy_request, args.requests, stop=stop_logging)
+    print(json.dumps({"requests": args.requests, "write_latency_ms": args.write_latency_ms, "results": results},
+                     indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Local stand-in for the MySQL database, for benchmarks.
+
+StandInDataService is MySQLRDBDataService with its connections replaced by a thin
+PyMySQL-compatible wrapper around sqlite3, so the real data service code (statement cache,
+connection pool, transactions, row-count checks) runs unchanged against a SQLite file with
+the p1_database schema. Timings are not MySQL timings, but they are stable across runs and
+need nothing installed, which is what regression checks need.
+"""
+import json
+import os
+import random
+import sqlite3
+
+from framework.services.data_access.MySQLRDBDataService import MySQLRDBDataService
+
+# The schema DB_BACKEND=sqlite uses; it is written against the p1_database attachment as well
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "app", "database", "p1_database_sqlite.sql")
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class StandInCursor:
+    """The subset of a PyMySQL DictCursor the data service uses."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._cursor = connection.cursor()
+        self.lastrowid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def execute(self, sql, params=None):
+        # PyMySQL returns the affected (matched, with CLIENT.FOUND_ROWS) row count
+        self._cursor.execute(sql.replace("%s", "?"), tuple(params or ()))
+        if sql.startswith("INSERT"):
+            # MySQL reports the first ID of a multi-row INSERT, SQLite the last
+            self.lastrowid = self._cursor.lastrowid - self._cursor.rowcount + 1
+        return self._cursor.rowcount
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    def close(self):
+        self._cursor.close()
+
+
+class StandInConnection:
+    """A sqlite3 connection with the p1_database file attached, behaving like a PyMySQL connection."""
+
+    def __init__(self, path: str):
+        self._connection = sqlite3.connect(":memory:", isolation_level=None, check_same_thread=False)
+        self._connection.row_factory = _dict_row
+        self._connection.execute("ATTACH DATABASE ? AS p1_database", (path,))
+        self._connection.execute("PRAGMA p1_database.journal_mode = WAL")
+        self._connection.execute("PRAGMA busy_timeout = 10000")
+        self._connection.execute("PRAGMA foreign_keys = ON")
+
+    def cursor(self, cursorclass=None):
+        return StandInCursor(self._connection)
+
+    def ping(self, reconnect=False):
+        self._connection.execute("SELECT 1")
+
+    def begin(self):
+        # Take the write lock up front; a deferred transaction can fail to upgrade under concurrency.
+        self._connection.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        self._connection.execute("COMMIT")
+
+    def rollback(self):
+        self._connection.execute("ROLLBACK")
+
+    def close(self):
+        self._connection.close()
+
+
+class StandInDataService(MySQLRDBDataService):
+    """MySQLRDBDataService over StandInConnection. context["path"] is the SQLite file."""
+
+    def _get_connection(self):
+        return StandInConnection(self.context["path"])
+
+    def _autoinc_step(self, connection):
+        # The rows of one SQLite statement get consecutive rowids
+        return 1
+
+    def estimate_count(self, database_name: str, table: str) -> int:
+        # SQLite keeps no row estimate like information_schema.TABLES
+        return self.count_all(database_name, table)
+
+
+def create_database(path: str) -> None:
+    """Create the conversations and messages tables in the SQLite file at path."""
+    connection = StandInConnection(path)
+    try:
+        with open(SCHEMA_PATH) as f:
+            connection._connection.executescript(f.read())
+    finally:
+        connection.close()
+
+
+def seed(data_service, conversations: int, messages: int, participants: int,
+         seed_value: int = 0) -> list:
+    """
+    Insert synthetic conversations, each with the given number of messages and participants,
+    through a StandInDataService or SQLiteRDBDataService. The content depends only on the
+    arguments, so every run sees the same data.
+
+    :return: The IDs of the created conversations.
+    """
+    rng = random.Random(seed_value)
+    words = ["hello", "lunch", "meeting", "tomorrow", "ok", "thanks", "see", "you", "later", "deploy", "review", "done"]
+    conversation_ids = []
+    for start in range(0, conversations, 500):
+        count = min(500, conversations - start)
+        with data_service.transaction() as connection:
+            rows = []
+            for i in range(start, start + count):
+                people = [f"user{rng.randrange(10 * participants + 1)}" for _ in range(participants)]
+                rows.append({
+                    "name": f"Conversation {i}",
+                    "participants": json.dumps(people),
+                    "isGroup": participants > 2,
+                })
+            ids = data_service.insert_many("p1_database", "conversations", rows, connection=connection)
+            message_rows = [
+                {
+                    "convo_id": conversation_id,
+                    "sender": f"user{rng.randrange(10 * participants + 1)}",
+                    "text": " ".join(rng.choice(words) for _ in range(rng.randint(3, 20))),
+                    "timestamp": f"{(n // 60) % 24:02d}:{n % 60:02d}",
+                }
+                for conversation_id in ids
+                for n in range(messages)
+            ]
+            data_service.insert_many("p1_database", "messages", message_rows, connection=connection, return_ids=False)
+            conversation_ids.extend(ids)
+    return conversation_ids
@@ -0,0 +1,61 @@
+"""
+Serve app.main:app against the stand-in database (see benchmarks.standin_db):
+
+    python -m benchmarks.standin_server --database /tmp/bench.sqlite --port 8081
+
+benchmarks.load_test starts this in a subprocess, so the server does not share a process
+(or a GIL) with the load generator. The database file must already exist. With
+--backend sqlite the app's own SQLiteRDBDataService (DB_BACKEND=sqlite) serves the file
+instead of MySQLRDBDataService over the stand-in connection.
+"""
+import argparse
+import logging
+import os
+
+import uvicorn
+
+from app.services.service_factory import ServiceFactory
+from benchmarks.standin_db import StandInDataService
+from framework.services.data_access.QueryProfiler import QueryProfiler
+
+
+def install_standin_database(path: str, pool_size: int) -> None:
+    """Make ServiceFactory hand out a StandInDataService on the SQLite file at path instead of MySQL."""
+    create_service = ServiceFactory.create_service.__func__
+
+    def create_standin_service(cls, service_name):
+        if service_name == 'ConversationResourceService':
+            # Profiled like the MySQL service the factory builds, so /diagnostics/queries works here too
+            # (with DIAGNOSTICS_TOKEN set)
+            profiler = QueryProfiler(slow_threshold=float(os.getenv("DB_SLOW_QUERY_SECONDS", 0.5)))
+            return StandInDataService({"path": path, "pool_min_size": 1, "pool_max_size": pool_size,
+                                       "query_profiler": profiler})
+        return create_service(cls, service_name)
+
+    ServiceFactory.create_service = classmethod(create_standin_service)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database", required=True, help="SQLite file created by benchmarks.standin_db")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--backend", choices=["standin", "sqlite"], default="standin")
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--app-logs", action="store_true", help="Keep the application's INFO logs")
+    args = parser.parse_args()
+    if not args.app_logs:
+        logging.disable(logging.INFO)  # Per-request log records would dominate the timings
+
+    if args.backend == "sqlite":
+        os.environ["DB_BACKEND"] = "sqlite"
+        os.environ["SQLITE_PATH"] = args.database
+    else:
+        install_standin_database(args.database, args.pool_size)
+    from app.main import app  # Imported after the patch: ReadYourWrites is built at import time
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
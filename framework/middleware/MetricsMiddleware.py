@@ -0,0 +1,58 @@
+import time
+from framework.services.metrics.Metrics import registry
+
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving an HTTP request to sending the last byte of its response.",
+    ["method", "route", "status"],
+)
+IN_FLIGHT = registry.gauge("http_requests_in_flight", "HTTP requests being handled.")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the duration of every HTTP request by method, route template
+    (e.g. /conversations/{conversation_id}, so that IDs do not create a series each) and
+    status. Streaming responses are timed until their last chunk has been sent.
+
+    It is a plain ASGI middleware rather than an @app.middleware("http") function, which
+    would wrap every response in another streaming layer.
+    """
+
+    def __init__(self, app, exclude: tuple = ("/metrics",)):
+        self.app = app
+        self.exclude = exclude
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+        finished = False
+
+        def observe():
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            # FastAPI sets scope["route"] once the request has been routed
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            REQUEST_SECONDS.observe(time.perf_counter() - started, scope["method"], path, str(status))
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            # Requests that failed or whose client disconnected before the last chunk
+            observe()
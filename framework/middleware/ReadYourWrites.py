@@ -0,0 +1,64 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Mapping, Optional
+
+CLIENT_ID_HEADER = "x-client-id"
+
+
+class ReadYourWrites:
+    """
+    Remembers which clients wrote within the last ``window`` seconds, so that their reads can
+    be pinned to the primary until the replicas have caught up with those writes.
+
+    Clients are identified by an opaque key, the X-Client-Id header (see client_key). The
+    remote address is not used: behind a proxy every client has the proxy's address, and one
+    client's write would pin all of them. The record is per process: behind a load balancer without sticky sessions, a client's
+    next request may reach an instance that has not seen its write.
+    """
+
+    def __init__(self, window: float = 5.0, max_clients: int = 100000):
+        """
+        :param window: Seconds a client stays pinned after a write. 0 disables pinning.
+        :param max_clients: Clients remembered at most; the oldest writes are forgotten first.
+        """
+        self.window = window
+        self.max_clients = max_clients
+        self._writes = OrderedDict()    # client key -> monotonic deadline, oldest first
+        self._lock = threading.Lock()
+        self.pinned_requests = 0
+
+    @staticmethod
+    def client_key(headers: Mapping[str, str]) -> Optional[str]:
+        """The key of the client sending a request with these headers, or None if it sent no X-Client-Id."""
+        return headers.get(CLIENT_ID_HEADER) or None
+
+    def record_write(self, client_key: Optional[str]) -> None:
+        """Pin client_key to the primary for the next window seconds."""
+        if not client_key or self.window <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._writes[client_key] = now + self.window
+            self._writes.move_to_end(client_key)
+            # Deadlines grow in insertion order, so expired entries are at the front.
+            while self._writes and (next(iter(self._writes.values())) <= now or len(self._writes) > self.max_clients):
+                self._writes.popitem(last=False)
+
+    def pinned(self, client_key: Optional[str]) -> bool:
+        """Whether client_key wrote within the window; counts the pinned requests."""
+        if not client_key:
+            return False
+        with self._lock:
+            deadline = self._writes.get(client_key)
+            if deadline is None:
+                return False
+            if deadline <= time.monotonic():
+                del self._writes[client_key]
+                return False
+            self.pinned_requests += 1
+            return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"window": self.window, "clients": len(self._writes), "pinned_requests": self.pinned_requests}
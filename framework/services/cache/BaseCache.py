@@ -0,0 +1,63 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+
+class BaseCache(ABC):
+    """
+    Abstract base class for cache backends. Application code depends on this interface only,
+    so an in-process cache can be swapped for a shared one without code changes.
+
+    The interface is asynchronous because shared backends talk to a remote store.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        :param ttl: Default time-to-live in seconds for entries; None means no expiry.
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.invalidations = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached value for key, or None on a miss.
+        """
+        raise NotImplementedError('Abstract method get()')
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store value under key for ttl seconds (defaults to the cache's ttl).
+        """
+        raise NotImplementedError('Abstract method set()')
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Remove key from the cache, if present.
+        """
+        raise NotImplementedError('Abstract method delete()')
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """
+        Remove every entry owned by this cache.
+        """
+        raise NotImplementedError('Abstract method clear()')
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters. Backends add their own fields.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "sets": self.sets,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,113 @@
+import fnmatch
+import json
+import time
+from typing import Any, Optional
+
+from .BaseCache import BaseCache
+
+# Keys deleted per DEL while clearing a namespace
+CLEAR_BATCH_SIZE = 500
+
+
+class SharedCache(BaseCache):
+    """
+    Cache backed by a key/value store shared between service instances.
+
+    The client only needs the async get(name), set(name, value, px=milliseconds),
+    delete(*names) and scan_iter(match, count) calls of redis.asyncio.Redis, so a Redis
+    client can be passed in directly. InMemoryKeyValueStore provides the same calls for
+    local runs and tests. Values are stored as JSON.
+    """
+
+    def __init__(self, client, namespace: str = "cache", ttl: Optional[float] = 60.0):
+        super().__init__(ttl)
+        self.client = client
+        self.namespace = namespace
+        self.errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self.client.get(self._key(key))
+        except Exception:
+            # A cache outage degrades to a miss rather than failing the request.
+            self.errors += 1
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            # In milliseconds and at least 1: Redis rejects an expiry of 0, e.g. seconds rounded down from ttl < 1
+            await self.client.set(self._key(key), json.dumps(value, default=str),
+                                  px=max(1, int(ttl * 1000)) if ttl is not None else None)
+            self.sets += 1
+        except Exception:
+            self.errors += 1
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.client.delete(self._key(key))
+            self.invalidations += 1
+        except Exception:
+            # A failed invalidation may leave a stale entry until its TTL expires.
+            self.errors += 1
+
+    async def clear(self) -> None:
+        """Delete every key of this cache's namespace, a batch of keys at a time."""
+        try:
+            batch = []
+            async for name in self.client.scan_iter(match=f"{self.namespace}:*", count=CLEAR_BATCH_SIZE):
+                batch.append(name)
+                if len(batch) == CLEAR_BATCH_SIZE:
+                    await self.client.delete(*batch)
+                    batch = []
+            if batch:
+                await self.client.delete(*batch)
+        except Exception:
+            # As with delete(), entries left behind expire with their TTL.
+            self.errors += 1
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats.update({"namespace": self.namespace, "errors": self.errors})
+        return stats
+
+
+class InMemoryKeyValueStore:
+    """Local stand-in for a shared key/value store such as Redis, for development and tests."""
+
+    def __init__(self):
+        self._data = {}
+
+    async def get(self, name: str):
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[name]
+            return None
+        return value
+
+    async def set(self, name: str, value, ex: Optional[int] = None, px: Optional[int] = None):
+        if ex is not None:
+            px = ex * 1000
+        if px is not None and px <= 0:
+            raise ValueError("invalid expire time in 'set' command")  # As Redis does
+        self._data[name] = (value, time.monotonic() + px / 1000 if px is not None else None)
+        return True
+
+    async def delete(self, *names: str) -> int:
+        return sum(self._data.pop(name, None) is not None for name in names)
+
+    async def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None):
+        for name in list(self._data):
+            if match is None or fnmatch.fnmatchcase(name, match):
+                yield name
@@ -0,0 +1,145 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from framework.services.metrics.Metrics import FAST_BUCKETS, registry
+
+# Configure logger for this module
+logger = logging.getLogger("AsyncDataService")
+logger.setLevel(logging.INFO)
+
+CALL_SECONDS = registry.histogram(
+    "data_service_call_duration_seconds",
+    "Time data service calls spent running on a worker thread, by method and outcome.",
+    ["method", "outcome"],
+    buckets=FAST_BUCKETS,
+)
+QUEUE_SECONDS = registry.histogram(
+    "data_service_queue_wait_seconds",
+    "Time data service calls waited for a free worker thread.",
+    buckets=FAST_BUCKETS,
+)
+
+
+class AsyncDataService:
+    """
+    Asynchronous facade over a blocking data service.
+
+    Every data service method is exposed as a coroutine that runs the blocking call on a
+    dedicated, bounded thread pool, so database I/O never executes on the event loop
+    thread. Each call is bounded by a timeout; a call that exceeds it raises TimeoutError
+    to the caller while the worker thread finishes the statement in the background.
+    """
+
+    def __init__(self, data_service, max_workers: int = None, timeout: float = 30.0):
+        """
+        :param data_service: The blocking data service to wrap, e.g. a MySQLRDBDataService.
+        :param max_workers: Size of the executor. Defaults to the data service's pool size so
+            that worker threads never queue on the connection pool.
+        :param timeout: Default per-call timeout in seconds. None disables the timeout.
+        """
+        self.data_service = data_service
+        self.timeout = timeout
+        if max_workers is None:
+            # A data service spanning several pools (e.g. with replicas) reports its total
+            max_workers = getattr(data_service, "max_connections", None)
+        if max_workers is None:
+            pool = getattr(data_service, "pool", None)
+            max_workers = getattr(pool, "max_size", 10)
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="data-service")
+
+    async def run(self, fn, *args, timeout: float = None, **kwargs):
+        """
+        Run a blocking callable on the data service executor and await its result.
+
+        :param fn: The callable to run, typically a bound method of the data service.
+        :param timeout: Per-call timeout in seconds; defaults to the instance timeout.
+        :return: Whatever fn returns.
+        :raises TimeoutError: If the call did not complete within the timeout.
+        """
+        loop = asyncio.get_running_loop()
+        # Carry context variables (e.g. trace IDs) over to the worker thread, as asyncio.to_thread does.
+        context = contextvars.copy_context()
+        method = getattr(fn, "__name__", "call")
+        submitted = time.perf_counter()
+
+        def call():
+            started = time.perf_counter()
+            QUEUE_SECONDS.observe(started - submitted)
+            outcome = "error"
+            try:
+                result = context.run(fn, *args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                CALL_SECONDS.observe(time.perf_counter() - started, method, outcome)
+
+        future = loop.run_in_executor(self._executor, call)
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            name = getattr(fn, "__name__", repr(fn))
+            logger.error(f"Data service call {name} timed out after {timeout}s.")
+            raise TimeoutError(f"Data service call {name} timed out after {timeout}s.")
+
+    async def run_in_transaction(self, fn, timeout: float = None):
+        """
+        Run fn(data_service, connection) inside a single data service transaction.
+
+        The whole unit of work executes in one worker thread on one connection; it commits
+        when fn returns and rolls back if fn raises.
+        """
+        def transaction():
+            with self.data_service.transaction() as connection:
+                return fn(self.data_service, connection)
+
+        return await self.run(transaction, timeout=timeout)
+
+    async def stream(self, method_name: str, *args, timeout: float = None, **kwargs):
+        """
+        Async generator over a data service generator method such as stream_all().
+
+        Each item is produced on the executor, one at a time, so the next batch is only read
+        from the database once the consumer asks for it. The generator is closed on the
+        executor when iteration stops early.
+        """
+        iterator = getattr(self.data_service, method_name)(*args, **kwargs)
+        exhausted = object()
+
+        def next_item():
+            return next(iterator, exhausted)
+
+        # Report each batch under the name of the generator method
+        next_item.__name__ = method_name
+        try:
+            while True:
+                item = await self.run(next_item, timeout=timeout)
+                if item is exhausted:
+                    break
+                yield item
+        finally:
+            try:
+                await self.run(iterator.close, timeout=timeout)
+            except Exception:
+                # e.g. the generator is still running a batch that timed out
+                logger.warning(f"Could not close data service stream {method_name}.", exc_info=True)
+
+    def __getattr__(self, name):
+        """Expose data service methods as coroutines, e.g. ``await service.fetch_one(...)``."""
+        attribute = getattr(self.data_service, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def method(*args, timeout: float = None, **kwargs):
+            return await self.run(attribute, *args, timeout=timeout, **kwargs)
+
+        return method
+
+    def shutdown(self, wait: bool = True):
+        """Stop the executor, optionally waiting for in-flight calls to finish."""
+        self._executor.shutdown(wait=wait)
@@ -1,6 +1,15 @@
 from abc import ABC, abstractmethod, abstractclassmethod
 
-# TODO -- Add support for standard exceptions.
+
+
+class DataServiceError(Exception):
+    """Base class of the errors raised by data services and their connection pools."""
+    pass
+
+
+class StaleRecordError(DataServiceError):
+    """Raised by a conditional update when the record exists but no longer matches the expected values."""
+    pass
 
 
 class DataDataService(ABC):
@@ -0,0 +1,289 @@
+import threading
+import time
+import logging
+from .BaseDataService import DataServiceError
+
+# Configure logger for this module
+logger = logging.getLogger("ConnectionPool")
+logger.setLevel(logging.INFO)
+
+
+class PoolTimeoutError(DataServiceError):
+    """Raised when no connection could be checked out before the wait timeout expired."""
+    pass
+
+
+class PoolClosedError(DataServiceError):
+    """Raised when a connection is requested from a pool that has been closed."""
+    pass
+
+
+class _PooledConnection:
+    """Book-keeping wrapper around a raw DB-API connection."""
+
+    __slots__ = ("connection", "created_at", "last_used_at")
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of DB-API connections.
+
+    Connections are created through the ``connect`` callable passed by the owning data
+    service, validated with ``validate`` on checkout when they have been idle for more
+    than ``health_check_interval`` seconds, and recycled once they are older than
+    ``recycle`` seconds. Callers that find the pool exhausted wait up to ``timeout``
+    seconds for a connection to be returned.
+    """
+
+    def __init__(self, connect, validate=None, is_disconnect=None, min_size: int = 1, max_size: int = 10,
+                 timeout: float = 10.0, recycle: float = 3600.0, health_check_interval: float = 30.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+
+        self._connect = connect
+        self._validate = validate
+        self._is_disconnect = is_disconnect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.health_check_interval = health_check_interval
+
+        self._idle = []             # LIFO stack of _PooledConnection, most recently used last
+        self._in_use = {}           # id(connection) -> _PooledConnection for checked-out connections
+        self._size = 0              # Connections currently owned by the pool (idle + checked out)
+        self._closed = False
+        self._condition = threading.Condition(threading.Lock())
+
+        # Metrics
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._health_check_failures = 0
+        self._discarded = 0
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+
+    def warm(self):
+        """Open connections until the pool holds at least ``min_size`` of them."""
+        while True:
+            with self._condition:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                pooled = self._new_connection()
+            except Exception:
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._idle.append(pooled)
+                self._condition.notify()
+
+    def close(self):
+        """Close every idle connection and refuse further checkouts."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for pooled in idle:
+            self._close_quietly(pooled.connection)
+        logger.info("Connection pool closed.")
+
+    # ------------------------------------------------------------------ #
+    # Checkout / return
+    # ------------------------------------------------------------------ #
+
+    def acquire(self, timeout: float = None):
+        """
+        Check a connection out of the pool.
+
+        :param timeout: Seconds to wait for a free connection; defaults to the pool timeout.
+        :return: A live DB-API connection. It must be handed back through release().
+        :raises PoolTimeoutError: If no connection became available in time.
+        :raises PoolClosedError: If the pool has been closed.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited_since = None
+
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise PoolClosedError("Connection pool is closed.")
+                    if self._idle:
+                        pooled = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        pooled = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"Timed out after {timeout:.2f}s waiting for a database connection "
+                            f"(max_size={self.max_size})."
+                        )
+                    if waited_since is None:
+                        waited_since = time.monotonic()
+                        self._waits += 1
+                    self._condition.wait(remaining)
+
+                if waited_since is not None:
+                    waited = time.monotonic() - waited_since
+                    self._wait_time_total += waited
+                    self._wait_time_max = max(self._wait_time_max, waited)
+                    waited_since = None
+
+            # Connection I/O happens outside the lock.
+            if pooled is None:
+                try:
+                    pooled = self._new_connection()
+                except Exception:
+                    self._forget()
+                    raise
+                return self._checked_out(pooled)
+
+            if self._is_usable(pooled):
+                return self._checked_out(pooled)
+
+            # Stale or broken: drop it and loop to pick or open another one.
+            self._close_quietly(pooled.connection)
+            self._forget()
+
+    def release(self, connection, discard: bool = False):
+        """
+        Return a connection previously obtained from acquire().
+
+        :param connection: The connection to return.
+        :param discard: Close the connection instead of reusing it, e.g. after a network error.
+        """
+        with self._condition:
+            pooled = self._in_use.pop(id(connection), None)
+        if pooled is None:
+            # Not one of ours; nothing to track.
+            self._close_quietly(connection)
+            return
+
+        if discard or self._closed:
+            self._close_quietly(connection)
+            with self._condition:
+                self._discarded += int(discard)
+            self._forget()
+            return
+
+        pooled.last_used_at = time.monotonic()
+        with self._condition:
+            self._idle.append(pooled)
+            self._condition.notify()
+
+    def connection(self, timeout: float = None):
+        """Context manager that checks a connection out and returns it on exit."""
+        return _Checkout(self, timeout)
+
+    # ------------------------------------------------------------------ #
+    # Metrics
+    # ------------------------------------------------------------------ #
+
+    def stats(self) -> dict:
+        """Return a snapshot of pool occupancy and wait metrics."""
+        with self._condition:
+            idle = len(self._idle)
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": idle,
+                "in_use": self._size - idle,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_time_total": self._wait_time_total,
+                "wait_time_max": self._wait_time_max,
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "recycled": self._recycled,
+                "health_check_failures": self._health_check_failures,
+                "discarded": self._discarded,
+            }
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _new_connection(self) -> _PooledConnection:
+        connection = self._connect()
+        with self._condition:
+            self._created += 1
+        return _PooledConnection(connection)
+
+    def _checked_out(self, pooled: _PooledConnection):
+        # Counted here, so connections dropped by the health check are not checkouts
+        with self._condition:
+            self._in_use[id(pooled.connection)] = pooled
+            self._checkouts += 1
+        return pooled.connection
+
+    def should_discard(self, exc) -> bool:
+        """Connection-level failures leave the session in an unknown state; such connections are dropped."""
+        return exc is not None and self._is_disconnect is not None and self._is_disconnect(exc)
+
+    def _is_usable(self, pooled: _PooledConnection) -> bool:
+        now = time.monotonic()
+        if self.recycle and now - pooled.created_at > self.recycle:
+            with self._condition:
+                self._recycled += 1
+            logger.debug("Recycling a connection older than %ss.", self.recycle)
+            return False
+        if self._validate and now - pooled.last_used_at > self.health_check_interval:
+            try:
+                self._validate(pooled.connection)
+            except Exception:
+                with self._condition:
+                    self._health_check_failures += 1
+                logger.warning("Pooled connection failed its health check; replacing it.")
+                return False
+        return True
+
+    def _forget(self):
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+class _Checkout:
+
+    def __init__(self, pool: ConnectionPool, timeout: float = None):
+        self.pool = pool
+        self.timeout = timeout
+        self.connection = None
+
+    def __enter__(self):
+        self.connection = self.pool.acquire(self.timeout)
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        self.pool.release(self.connection, discard=self.pool.should_discard(exc))
+        return False
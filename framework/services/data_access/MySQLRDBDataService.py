@@ -1,11 +1,21 @@
 import pymysql
-from .BaseDataService import DataDataService
+from pymysql.constants import CLIENT
+from contextlib import contextmanager, nullcontext
+from .BaseDataService import DataDataService, StaleRecordError
+from .ConnectionPool import ConnectionPool, PoolTimeoutError
+from .StatementCache import StatementCache
 import logging
+import re
+import threading
+import time
+from typing import Optional
 
 # Configure logger for this module
 logger = logging.getLogger("MySQLRDBDataService")
 logger.setLevel(logging.INFO)  # Set to INFO for less verbose logs in production
 
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
 
 class MySQLRDBDataService(DataDataService):
     """
@@ -16,9 +26,24 @@ class MySQLRDBDataService(DataDataService):
 
     def __init__(self, context):
         super().__init__(context)
+        self.pool = ConnectionPool(
+            connect=self._get_connection,
+            validate=lambda connection: connection.ping(reconnect=False),
+            is_disconnect=lambda e: isinstance(e, (pymysql.err.OperationalError, pymysql.err.InterfaceError)),
+            min_size=int(context.get("pool_min_size", 1)),
+            max_size=int(context.get("pool_max_size", 10)),
+            timeout=float(context.get("pool_timeout", 10.0)),
+            recycle=float(context.get("pool_recycle", 3600.0)),
+            health_check_interval=float(context.get("pool_health_check_interval", 30.0))
+        )
+        self.statements = StatementCache(int(context.get("statement_cache_size", 512)))
+        # Optional QueryProfiler (or anything with its record() method) told about every statement
+        self.profiler = context.get("query_profiler")
+        self._acquired = threading.local()   # Seconds the thread last waited for a pooled connection
+        self._autoinc = None                  # (lock mode, increment) of the server, read on first use
 
     def _get_connection(self):
-        """Establish and return a MySQL connection."""
+        """Establish and return a new MySQL connection. Callers should borrow from self.pool instead."""
         try:
             logger.info("Connecting to the database...")
             connection = pymysql.connect(
@@ -27,7 +52,9 @@ class MySQLRDBDataService(DataDataService):
                 user=self.context["user"],
                 passwd=self.context["password"],
                 cursorclass=pymysql.cursors.DictCursor,
-                autocommit=True
+                autocommit=True,
+                client_flag=CLIENT.FOUND_ROWS,  # UPDATE rowcount counts matched rows, not only changed ones
+                connect_timeout=float(self.context.get("connect_timeout", 10))
             )
             logger.info("Database connection established.")
             return connection
@@ -35,15 +62,109 @@ class MySQLRDBDataService(DataDataService):
             logger.exception("Failed to connect to the database.")
             raise
 
+    @staticmethod
+    def is_unavailable(e: Exception) -> bool:
+        """Whether e means the server could not be reached, rather than that the statement failed."""
+        return isinstance(e, (pymysql.err.OperationalError, pymysql.err.InterfaceError, PoolTimeoutError, OSError))
+
+    def warm(self):
+        """Open the configured minimum number of pooled connections ahead of traffic."""
+        self.pool.warm()
+
+    def close(self):
+        """Close all idle pooled connections."""
+        self.pool.close()
+
+    def pool_stats(self) -> dict:
+        """Return connection pool occupancy and wait metrics."""
+        return self.pool.stats()
+
+    def statement_stats(self) -> dict:
+        """Return statement cache hit/miss counters."""
+        return self.statements.stats()
+
+    def _borrow(self, connection=None):
+        """Use the caller's connection (e.g. inside a transaction) or borrow one from the pool."""
+        if connection is not None:
+            return nullcontext(connection)
+        return self._pooled_connection() if self.profiler is not None else self.pool.connection()
+
+    @contextmanager
+    def _pooled_connection(self):
+        """Borrow a pooled connection, noting how long that took for the profiler."""
+        started = time.perf_counter()
+        with self.pool.connection() as connection:
+            self._acquired.seconds = time.perf_counter() - started
+            yield connection
+
+    def _execute(self, cursor, sql: str, params=None, connection=None):
+        """
+        Execute sql on cursor and return its row count, reporting the statement to the query
+        profiler if there is one. Pass connection to allow an EXPLAIN of a slow statement on it.
+        """
+        args = (sql,) if params is None else (sql, params)
+        if self.profiler is None:
+            return cursor.execute(*args)
+        # The wait for the connection is charged to the first statement run on it
+        acquire = getattr(self._acquired, "seconds", 0.0)
+        self._acquired.seconds = 0.0
+        started = time.perf_counter()
+        try:
+            rows = cursor.execute(*args)
+        except Exception as e:
+            self.profiler.record(sql, time.perf_counter() - started, acquire=acquire, error=e)
+            raise
+        self.profiler.record(sql, time.perf_counter() - started, rows, acquire, connection=connection, params=params)
+        return rows
+
+    def query_report(self, limit: int = 20, sort: str = "total") -> dict:
+        """Return the query profiler's report of the most expensive statement shapes, if profiling is on."""
+        return self.profiler.report(limit, sort) if self.profiler is not None else None
+
+    @staticmethod
+    def _select_list(columns: list = None) -> str:
+        """Build the SELECT column list; None selects every column."""
+        if not columns:
+            return "*"
+        for column in columns:
+            if not _IDENTIFIER.match(column):
+                raise ValueError(f"Invalid column name: {column!r}")
+        return ", ".join(columns)
+
+    def _select_all(self, database_name: str, table: str, order_by: str = None, columns: list = None) -> str:
+        def build():
+            sql = f"SELECT {self._select_list(columns)} FROM {database_name}.{table}"
+            return sql + f" ORDER BY {order_by}" if order_by else sql
+
+        return self.statements.get(("select_all", database_name, table, order_by, tuple(columns or ())), build)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Borrow a connection and run a transaction on it. Pass the yielded connection to the
+        data service methods through their ``connection`` argument; the transaction commits
+        when the block exits and rolls back if it raises.
+        """
+        with self._borrow() as connection:
+            connection.begin()
+            try:
+                yield connection
+                connection.commit()
+            except Exception:
+                logger.warning("Rolling back transaction.")
+                connection.rollback()
+                raise
+
     def get_data_object(self, database_name: str, collection_name: str, key_field: str, key_value: str):
         """Retrieve a single data object based on key_field and key_value."""
-        connection = None
         try:
-            sql_statement = f"SELECT * FROM {database_name}.{collection_name} WHERE {key_field}=%s"
+            sql_statement = self.statements.get(
+                ("fetch_one", database_name, collection_name, key_field, ()),
+                lambda: f"SELECT * FROM {database_name}.{collection_name} WHERE {key_field} = %s"
+            )
             logger.debug("Executing query to fetch a data object.")
-            connection = self._get_connection()
-            with connection.cursor() as cursor:
-                cursor.execute(sql_statement, [key_value])
+            with self._borrow() as connection, connection.cursor() as cursor:
+                self._execute(cursor, sql_statement, [key_value], connection=connection)
                 result = cursor.fetchone()
                 if result:
                     logger.info("Successfully retrieved a data object.")
@@ -53,19 +174,18 @@ class MySQLRDBDataService(DataDataService):
         except Exception as e:
             logger.exception("Error retrieving data object.")
             raise
-        finally:
-            if connection:
-                connection.close()
-                logger.debug("Database connection closed.")
 
-    def fetch_one(self, database_name: str, table: str, key_field: str, key_value: str):
-        """Fetch a single record from the specified table."""
-        connection = self._get_connection()
+    def fetch_one(self, database_name: str, table: str, key_field: str, key_value: str,
+                  columns: list = None, connection=None):
+        """Fetch a single record from the specified table, optionally only the given columns."""
         try:
-            sql = f"SELECT * FROM {database_name}.{table} WHERE {key_field} = %s"
+            sql = self.statements.get(
+                ("fetch_one", database_name, table, key_field, tuple(columns or ())),
+                lambda: f"SELECT {self._select_list(columns)} FROM {database_name}.{table} WHERE {key_field} = %s"
+            )
             logger.debug("Executing query to fetch a single record.")
-            with connection.cursor() as cursor:
-                cursor.execute(sql, (key_value,))
+            with self._borrow(connection) as connection, connection.cursor() as cursor:
+                self._execute(cursor, sql, (key_value,), connection=connection)
                 result = cursor.fetchone()
                 if result:
                     logger.info(f"Successfully fetched a record from {table}.")
@@ -75,126 +195,355 @@ class MySQLRDBDataService(DataDataService):
         except Exception as e:
             logger.exception("Error fetching a single record.")
             raise
-        finally:
-            connection.close()
-            logger.debug("Database connection closed.")
 
-    def insert(self, database_name: str, table: str, data: dict):
+    def fetch_many(self, database_name: str, table: str, key_field: str, key_values: list,
+                   order_by: str = None, columns: list = None, connection=None):
+        """Fetch every record whose key_field is one of key_values, in a single query."""
+        if not key_values:
+            return []
+        try:
+            def build():
+                placeholders = ", ".join(["%s"] * len(key_values))
+                sql = f"SELECT {self._select_list(columns)} FROM {database_name}.{table} WHERE {key_field} IN ({placeholders})"
+                return sql + f" ORDER BY {order_by}" if order_by else sql
+
+            sql = self.statements.get(
+                ("fetch_many", database_name, table, key_field, len(key_values), order_by, tuple(columns or ())),
+                build
+            )
+            logger.debug("Executing query to fetch multiple records by key.")
+            with self._borrow(connection) as connection, connection.cursor() as cursor:
+                self._execute(cursor, sql, tuple(key_values), connection=connection)
+                result = cursor.fetchall()
+                logger.info(f"Fetched {len(result)} records from {table} for {len(key_values)} keys.")
+                return result
+        except Exception as e:
+            logger.exception("Error fetching multiple records.")
+            raise
+
+    def existing_keys(self, database_name: str, table: str, key_field: str, key_values: list, connection=None) -> set:
+        """Return the subset of key_values present in the table, reading only the key column."""
+        if not key_values:
+            return set()
+        try:
+            sql = self.statements.get(
+                ("existing_keys", database_name, table, key_field, len(key_values)),
+                lambda: f"SELECT {key_field} FROM {database_name}.{table} "
+                        f"WHERE {key_field} IN ({', '.join(['%s'] * len(key_values))})"
+            )
+            with self._borrow(connection) as connection, connection.cursor() as cursor:
+                self._execute(cursor, sql, tuple(key_values), connection=connection)
+                return {row[key_field] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.exception("Error checking record existence.")
+            raise
+
+    def insert(self, database_name: str, table: str, data: dict, connection=None):
         """Insert a new record into the database."""
-        connection = self._get_connection()
         try:
-            columns = ", ".join(data.keys())
-            placeholders = ", ".join(["%s"] * len(data))
-            sql = f"INSERT INTO {database_name}.{table} ({columns}) VALUES ({placeholders})"
+            sql = self.statements.get(
+                ("insert", database_name, table, tuple(data)),
+                lambda: f"INSERT INTO {database_name}.{table} ({', '.join(data)}) VALUES ({', '.join(['%s'] * len(data))})"
+            )
             logger.debug("Executing query to insert a record.")
-            with connection.cursor() as cursor:
-                cursor.execute(sql, tuple(data.values()))
+            with self._borrow(connection) as connection, connection.cursor() as cursor:
+                self._execute(cursor, sql, tuple(data.values()), connection=connection)
                 inserted_id = cursor.lastrowid
                 logger.info(f"Record inserted into {table} with ID {inserted_id}.")
                 return inserted_id
         except Exception as e:
             logger.exception("Error inserting record.")
             raise
-        finally:
-            connection.close()
-            logger.debug("Database connection closed.")
 
-    def fetch_all(self, database_name: str, table: str):
+    def _autoinc_step(self, connection) -> Optional[int]:
+        """
+        The step between the auto-increment IDs InnoDB gives the rows of one multi-row INSERT,
+        or None if they may not be evenly spaced. That is only guaranteed with
+        innodb_autoinc_lock_mode 0 or 1; with 2 (interleaved, the MySQL 8 default) concurrent
+        inserts may take IDs from the middle of each other's range.
+        """
+        if self._autoinc is None:
+            with connection.cursor() as cursor:
+                self._execute(cursor, "SELECT @@innodb_autoinc_lock_mode AS lock_mode, "
+                                      "@@auto_increment_increment AS increment", connection=connection)
+                row = cursor.fetchone()
+            self._autoinc = (int(row["lock_mode"]), int(row["increment"]))
+            logger.info(f"innodb_autoinc_lock_mode is {self._autoinc[0]}, auto_increment_increment {self._autoinc[1]}.")
+        lock_mode, increment = self._autoinc
+        return increment if lock_mode in (0, 1) else None
+
+    def insert_many(self, database_name: str, table: str, rows: list, connection=None, chunk_size: int = 500,
+                    return_ids: bool = True) -> Optional[list]:
+        """
+        Insert several records with multi-row INSERT statements of at most chunk_size rows.
+
+        All rows must have the same columns. Run inside transaction() for all-or-nothing
+        semantics across chunks.
+
+        :param return_ids: Whether the caller needs the generated IDs. Unless the server
+            guarantees evenly spaced IDs within a statement (see _autoinc_step), they are only
+            known exactly for single-row INSERTs, so the rows are then inserted one at a time.
+        :return: The generated IDs in the order of rows, or None if return_ids is False.
+        """
+        if not rows:
+            return [] if return_ids else None
+        try:
+            columns = list(rows[0].keys())
+            row_placeholder = "(" + ", ".join(["%s"] * len(columns)) + ")"
+            inserted_ids = []
+            with self._borrow(connection) as connection, connection.cursor() as cursor:
+                step = self._autoinc_step(connection) if return_ids else None
+                if return_ids and step is None:
+                    chunk_size = 1
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    sql = self.statements.get(
+                        ("insert_many", database_name, table, tuple(columns), len(chunk)),
+                        lambda: f"INSERT INTO {database_name}.{table} ({', '.join(columns)}) "
+                                f"VALUES {', '.join([row_placeholder] * len(chunk))}"
+                    )
+                    params = tuple(row[column] for row in chunk for column in columns)
+                    logger.debug(f"Executing multi-row insert of {len(chunk)} records.")
+                    self._execute(cursor, sql, params, connection=connection)
+                    if return_ids:
+                        # MySQL reports the ID of the first row of the statement
+                        inserted_ids.extend(range(cursor.lastrowid, cursor.lastrowid + len(chunk) * (step or 1), step or 1))
+            logger.info(f"Inserted {len(rows)} records into {table}.")
+            return inserted_ids if return_ids else None
+        except Exception as e:
+            logger.exception("Error inserting records.")
+            raise
+
+    def fetch_all(self, database_name: str, table: str, order_by: str = None, columns: list = None):
         """Fetch all records from the specified table."""
-        connection = self._get_connection()
         try:
-            sql = f"SELECT * FROM {database_name}.{table}"
+            sql = self._select_all(database_name, table, order_by, columns)
             logger.debug("Executing query to fetch all records.")
-            with connection.cursor() as cursor:
-                cursor.execute(sql)
+            with self._borrow() as connection, connection.cursor() as cursor:
+                self._execute(cursor, sql, connection=connection)
                 result = cursor.fetchall()
                 logger.info(f"Fetched {len(result)} records from {table}.")
                 return result
         except Exception as e:
             logger.exception("Error fetching all records.")
             raise
+
+    def stream_all(self, database_name: str, table: str, batch_size: int = 500, order_by: str = None,
+                   columns: list = None):
+        """
+        Generator yielding all records of the table in lists of at most batch_size rows.
+
+        Rows are read through an unbuffered server-side cursor, so memory use is bounded by
+        batch_size regardless of table size. The pooled connection is held until the
+        generator is exhausted or closed; a stream closed early drops its connection rather
+        than draining the remaining rows.
+        """
+        sql = self._select_all(database_name, table, order_by, columns)
+        started = time.perf_counter()
+        connection = self.pool.acquire()
+        self._acquired.seconds = time.perf_counter() - started
+        discard = True
+        try:
+            logger.debug("Executing query to stream all records.")
+            cursor = connection.cursor(pymysql.cursors.SSDictCursor)
+            self._execute(cursor, sql)  # Unbuffered: no EXPLAIN while the rows are pending
+            streamed = 0
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                streamed += len(rows)
+                yield rows
+            cursor.close()
+            discard = False
+            logger.info(f"Streamed {streamed} records from {table}.")
+        except GeneratorExit:
+            logger.info(f"Stream of {table} closed before completion.")
+            raise
+        except Exception as e:
+            logger.exception("Error streaming records.")
+            raise
         finally:
-            connection.close()
-            logger.debug("Database connection closed.")
+            self.pool.release(connection, discard=discard)
 
-    def fetch_paginated(self, database_name: str, table: str, offset: int, limit: int):
+    def fetch_paginated(self, database_name: str, table: str, offset: int, limit: int, order_by: str = None,
+                        columns: list = None):
         """Fetch a paginated list of records from the table."""
-        connection = self._get_connection()
         try:
-            sql = f"SELECT * FROM {database_name}.{table} LIMIT %s OFFSET %s"
+            sql = self.statements.get(
+                ("fetch_paginated", database_name, table, order_by, tuple(columns or ())),
+                lambda: self._select_all(database_name, table, order_by, columns) + " LIMIT %s OFFSET %s"
+            )
             logger.debug("Executing query to fetch paginated records.")
-            with connection.cursor() as cursor:
-                cursor.execute(sql, (limit, offset))
+            with self._borrow() as connection, connection.cursor() as cursor:
+                self._execute(cursor, sql, (limit, offset), connection=connection)
                 result = cursor.fetchall()
                 logger.info(f"Fetched {len(result)} records from {table} (offset: {offset}, limit: {limit}).")
                 return result
         except Exception as e:
             logger.exception("Error fetching paginated data.")
             raise
-        finally:
-            connection.close()
-            logger.debug("Database connection closed.")
 
-    def update(self, database_name: str, table: str, data: dict, key_field: str, key_value: str):
-        """Update an existing record in the database."""
-        connection = self._get_connection()
+    def fetch_range(self, database_name: str, table: str, key_field: str, limit: int,
+                    after=None, before=None, descending: bool = False, columns: list = None,
+                    filters: dict = None):
+        """
+        Fetch up to limit records ordered by key_field, starting strictly after and/or before
+        the given key values (keyset pagination). With an index on key_field this is a range
+        seek, so its cost does not grow with how deep into the table the page is.
+
+        filters restricts the range to records whose fields equal the given values; with a
+        composite index on (filter fields..., key_field) the seek stays within that prefix.
+        """
         try:
-            existing_record = self.fetch_one(database_name, table, key_field, key_value)
-            if not existing_record:
+            filters = filters or {}
+
+            def build():
+                conditions = []
+                for field in filters:
+                    if not _IDENTIFIER.match(field):
+                        raise ValueError(f"Invalid column name: {field}")
+                    conditions.append(f"{field} = %s")
+                if after is not None:
+                    conditions.append(f"{key_field} > %s")
+                if before is not None:
+                    conditions.append(f"{key_field} < %s")
+                sql = f"SELECT {self._select_list(columns)} FROM {database_name}.{table}"
+                if conditions:
+                    sql += " WHERE " + " AND ".join(conditions)
+                return sql + f" ORDER BY {key_field} {'DESC' if descending else 'ASC'} LIMIT %s"
+
+            sql = self.statements.get(
+                ("fetch_range", database_name, table, key_field, tuple(filters), after is not None,
+                 before is not None, descending, tuple(columns or ())),
+                build
+            )
+            params = list(filters.values()) + [value for value in (after, before) if value is not None] + [limit]
+            logger.debug("Executing query to fetch a range of records.")
+            with self._borrow() as connection, connection.cursor() as cursor:
+                self._execute(cursor, sql, tuple(params), connection=connection)
+                result = cursor.fetchall()
+                logger.info(f"Fetched {len(result)} records from {table} (filters: {filters}, after: {after}, before: {before}, limit: {limit}).")
+                return result
+        except Exception as e:
+            logger.exception("Error fetching a range of records.")
+            raise
+
+    def update(self, database_name: str, table: str, data: dict, key_field: str, key_value: str, connection=None,
+               match: dict = None, increment: str = None):
+        """
+        Update an existing record in the database with a single statement. A missing record is
+        detected from the matched row count (connections are opened with CLIENT.FOUND_ROWS).
+
+        :param match: Further field values the record must still have, e.g. {"version": 3}, for
+            optimistic concurrency. If the record exists but does not match, StaleRecordError is raised.
+        :param increment: Name of a counter column to increment in the same statement, e.g. "version".
+        """
+        match = match or {}
+        try:
+            def build():
+                assignments = [f"{key} = %s" for key in data]
+                if increment:
+                    if not _IDENTIFIER.match(increment):
+                        raise ValueError(f"Invalid column name: {increment!r}")
+                    assignments.append(f"{increment} = {increment} + 1")
+                conditions = [f"{key_field} = %s"] + [f"{self._select_list([field])} = %s" for field in match]
+                return f"UPDATE {database_name}.{table} SET {', '.join(assignments)} WHERE {' AND '.join(conditions)}"
+
+            sql = self.statements.get(("update", database_name, table, tuple(data), key_field, tuple(match), increment), build)
+            logger.debug("Executing query to update a record.")
+            with self._borrow(connection) as borrowed, borrowed.cursor() as cursor:
+                matched = self._execute(cursor, sql, tuple(data.values()) + (key_value,) + tuple(match.values()),
+                                        connection=borrowed)
+            if not matched:
+                if match and self.fetch_one(database_name, table, key_field, key_value, columns=[key_field],
+                                            connection=connection):
+                    logger.warning(f"Record in {table} where {key_field} = {key_value} does not match {match}.")
+                    raise StaleRecordError(f"Record with {key_field} = {key_value} has been modified")
                 logger.warning(f"No record found in {table} for update where {key_field} = {key_value}.")
                 raise Exception(f"No record found with {key_field} = {key_value}")
-            
-            updates = ", ".join([f"{key} = %s" for key in data.keys()])
-            sql = f"UPDATE {database_name}.{table} SET {updates} WHERE {key_field} = %s"
-            logger.debug("Executing query to update a record.")
-            with connection.cursor() as cursor:
-                cursor.execute(sql, tuple(data.values()) + (key_value,))
-                logger.info(f"Record in {table} updated where {key_field} = {key_value}.")
+            logger.info(f"Record in {table} updated where {key_field} = {key_value}.")
         except Exception as e:
             logger.exception("Error updating record.")
             raise
-        finally:
-            connection.close()
-            logger.debug("Database connection closed.")
 
-    def delete(self, database_name: str, table: str, key_field: str, key_value: str):
-        """Delete a record from the specified table asynchronously."""
-        connection = self._get_connection()
+    def increment(self, database_name: str, table: str, field: str, key_field: str, key_values: list,
+                  connection=None) -> int:
+        """Add 1 to field of every record whose key_field is one of key_values; return how many matched."""
+        if not key_values:
+            return 0
+        try:
+            sql = self.statements.get(
+                ("increment", database_name, table, field, key_field, len(key_values)),
+                lambda: f"UPDATE {database_name}.{table} SET {self._select_list([field])} = {field} + 1 "
+                        f"WHERE {key_field} IN ({', '.join(['%s'] * len(key_values))})"
+            )
+            with self._borrow(connection) as connection, connection.cursor() as cursor:
+                return self._execute(cursor, sql, tuple(key_values), connection=connection)
+        except Exception as e:
+            logger.exception("Error incrementing records.")
+            raise
+
+    def delete(self, database_name: str, table: str, key_field: str, key_value: str, connection=None):
+        """Delete a record from the specified table with a single statement; raises if it does not exist."""
         try:
-            # Check if the record exists
-            existing_record = self.fetch_one(database_name, table, key_field, key_value)
-            if not existing_record:
+            deleted = self.delete_where(database_name, table, key_field, key_value, connection=connection)
+            if not deleted:
                 logger.warning(f"No record found in {table} for deletion where {key_field} = {key_value}.")
                 raise Exception(f"No record found with {key_field} = {key_value}")
-            
-            # Delete the record
-            sql = f"DELETE FROM {database_name}.{table} WHERE {key_field} = %s"
-            logger.debug("Executing query to delete a record.")
-            with connection.cursor() as cursor:
-                cursor.execute(sql, (key_value,))
-                logger.info(f"Record deleted from {table} where {key_field} = {key_value}.")
 
         except Exception as e:
             logger.exception("Error deleting record.")
             raise
-        finally:
-            connection.close()
-            logger.debug("Database connection closed.")
+
+    def delete_where(self, database_name: str, table: str, key_field: str, key_value: str, connection=None) -> int:
+        """Delete every record matching key_field = key_value and return how many were removed."""
+        try:
+            sql = self.statements.get(
+                ("delete", database_name, table, key_field),
+                lambda: f"DELETE FROM {database_name}.{table} WHERE {key_field} = %s"
+            )
+            logger.debug("Executing query to delete matching records.")
+            with self._borrow(connection) as connection, connection.cursor() as cursor:
+                deleted = self._execute(cursor, sql, (key_value,), connection=connection)
+                logger.info(f"Deleted {deleted} records from {table} where {key_field} = {key_value}.")
+                return deleted
+        except Exception as e:
+            logger.exception("Error deleting records.")
+            raise
 
     def count_all(self, database_name: str, table: str) -> int:
         """Count all records in the specified table."""
-        connection = self._get_connection()
         try:
-            sql = f"SELECT COUNT(*) AS total FROM {database_name}.{table}"
+            sql = self.statements.get(
+                ("count_all", database_name, table),
+                lambda: f"SELECT COUNT(*) AS total FROM {database_name}.{table}"
+            )
             logger.debug("Executing query to count records.")
-            with connection.cursor() as cursor:
-                cursor.execute(sql)
+            with self._borrow() as connection, connection.cursor() as cursor:
+                self._execute(cursor, sql, connection=connection)
                 result = cursor.fetchone()
                 logger.info(f"Table {table} contains {result['total']} records.")
                 return result['total']
         except Exception as e:
             logger.exception("Error counting records.")
             raise
-        finally:
-            connection.close()
-            logger.debug("Database connection closed.")
\ No newline at end of file
+
+    def estimate_count(self, database_name: str, table: str) -> int:
+        """
+        Return the approximate row count InnoDB keeps in its table statistics. This reads
+        metadata only and does not scan the table, but may be off by a large margin.
+        """
+        try:
+            sql = ("SELECT TABLE_ROWS AS total FROM information_schema.TABLES "
+                   "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s")
+            logger.debug("Executing query to estimate record count.")
+            with self._borrow() as connection, connection.cursor() as cursor:
+                self._execute(cursor, sql, (database_name, table), connection=connection)
+                result = cursor.fetchone()
+                total = int(result["total"] or 0) if result else 0
+                logger.info(f"Table {table} contains approximately {total} records.")
+                return total
+        except Exception as e:
+            logger.exception("Error estimating record count.")
+            raise
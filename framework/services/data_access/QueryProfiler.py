@@ -0,0 +1,198 @@
+import logging
+import re
+import threading
+import time
+from collections import deque
+
+# Configure logger for this module
+logger = logging.getLogger("QueryProfiler")
+logger.setLevel(logging.INFO)
+
+# Statements slower than the threshold are logged here, so they can be routed on their own
+slow_query_logger = logging.getLogger("SlowQueryLog")
+slow_query_logger.setLevel(logging.INFO)
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"\bVALUES (\([^()]*\))(?:, \1)+", re.IGNORECASE)
+
+# Shapes tracked at most; statements of further shapes are counted together under this one
+OTHER_SHAPE = "(other)"
+
+
+def query_shape(sql: str) -> str:
+    """
+    Normalize sql so that statements differing only in their values share a shape: literals
+    and placeholders become ?, IN lists collapse to IN (...), and the rows of a multi-row
+    INSERT to their first row followed by ...
+    """
+    shape = _STRING.sub("?", sql)
+    shape = _NUMBER.sub("?", shape)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _VALUES_ROWS.sub(r"VALUES \1, ...", shape)
+
+
+class _ShapeStats:
+    __slots__ = ("calls", "errors", "total", "max", "rows", "counted", "acquire", "slow", "explained_at")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.counted = 0            # Calls whose row count is known
+        self.acquire = 0.0
+        self.slow = 0
+        self.explained_at = None   # time.monotonic() of the last EXPLAIN of this shape
+
+
+class QueryProfiler:
+    """
+    Aggregates the statements a data service executes by shape (see query_shape): calls,
+    errors, total and maximum duration, rows and time spent waiting for a connection.
+    Statements slower than slow_threshold are logged to SlowQueryLog and kept in a short
+    list of recent slow queries, optionally with the EXPLAIN output of the statement.
+
+    Parameter values are never recorded, only the shape of the statement.
+    """
+
+    def __init__(self, slow_threshold: float = 0.5, explain: bool = False, explain_interval: float = 60.0,
+                 max_shapes: int = 1000, slow_log_size: int = 100):
+        """
+        :param slow_threshold: Seconds above which a statement counts as slow.
+        :param explain: Run EXPLAIN for slow statements, on the connection that ran them.
+        :param explain_interval: Seconds between two EXPLAINs of the same shape.
+        :param max_shapes: Shapes tracked at most; further shapes are counted under "(other)".
+        :param slow_log_size: Recent slow statements kept for report().
+        """
+        self.slow_threshold = slow_threshold
+        self.explain = explain
+        self.explain_interval = explain_interval
+        self.max_shapes = max_shapes
+        self._shapes = {}           # Statement text -> shape, since the same texts recur
+        self._stats = {}            # Shape -> _ShapeStats
+        self._slow = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+
+    def _shape(self, sql: str) -> str:
+        shape = self._shapes.get(sql)
+        if shape is None:
+            shape = query_shape(sql)
+            if len(self._shapes) < self.max_shapes * 4:
+                self._shapes[sql] = shape
+        return shape
+
+    def record(self, sql: str, duration: float, rows: int = None, acquire: float = 0.0, error: Exception = None,
+               connection=None, params=None) -> None:
+        """
+        Record one executed statement.
+
+        :param duration: Seconds the statement took, including reading a buffered result.
+        :param rows: Rows returned or affected, if known.
+        :param acquire: Seconds spent waiting for the connection the statement ran on.
+        :param connection: Connection to run EXPLAIN on; None if it cannot take another statement.
+        :param params: Parameters of the statement; only used to run EXPLAIN, never stored.
+        """
+        shape = self._shape(sql)
+        if rows is not None and rows < 0:
+            rows = None  # DB-API drivers report -1 when the count is unknown
+        slow = duration >= self.slow_threshold
+        explain = False
+        now = time.monotonic()
+        with self._lock:
+            stats = self._stats.get(shape)
+            if stats is None:
+                if len(self._stats) >= self.max_shapes:
+                    shape = OTHER_SHAPE
+                    stats = self._stats.get(shape)
+                if stats is None:
+                    stats = self._stats[shape] = _ShapeStats()
+            stats.calls += 1
+            stats.total += duration
+            stats.max = max(stats.max, duration)
+            stats.acquire += acquire
+            if rows is not None:
+                stats.rows += rows
+                stats.counted += 1
+            if error is not None:
+                stats.errors += 1
+            if slow:
+                stats.slow += 1
+                if (self.explain and connection is not None and error is None
+                        and (stats.explained_at is None or now - stats.explained_at >= self.explain_interval)):
+                    stats.explained_at = now
+                    explain = True
+        if not slow:
+            return
+
+        plan = self._explain(connection, sql, params) if explain else None
+        entry = {
+            "shape": shape,
+            "duration_s": round(duration, 6),
+            "rows": rows,
+            "acquire_s": round(acquire, 6),
+            "error": type(error).__name__ if error is not None else None,
+            "time": time.time(),
+        }
+        if plan is not None:
+            entry["explain"] = plan
+        with self._lock:
+            self._slow.append(entry)
+        slow_query_logger.warning(
+            "Slow query took %.3fs (%s rows, %.3fs waiting for a connection): %s",
+            duration, rows, acquire, shape,
+            extra={"shape": shape, "duration_s": entry["duration_s"], "rows": rows, "acquire_s": entry["acquire_s"],
+                   "explain": plan},
+        )
+
+    @staticmethod
+    def _explain(connection, sql: str, params) -> list:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("EXPLAIN " + sql, params)
+                return [row if isinstance(row, dict) else list(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.warning(f"Could not EXPLAIN a slow query: {str(e)}")
+            return None
+
+    def report(self, limit: int = 20, sort: str = "total") -> dict:
+        """
+        The limit shapes with the highest total, avg or max duration, calls or slow count,
+        and the recent slow statements.
+        """
+        if sort not in ("total", "avg", "max", "calls", "slow"):
+            raise ValueError(f"Unsupported sort {sort}.")
+        with self._lock:
+            rows = [
+                {
+                    "shape": shape,
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "slow": stats.slow,
+                    "total_s": stats.total,
+                    "avg_s": stats.total / stats.calls,
+                    "max_s": stats.max,
+                    "rows_avg": stats.rows / stats.counted if stats.counted else None,
+                    "acquire_avg_s": stats.acquire / stats.calls,
+                }
+                for shape, stats in self._stats.items()
+            ]
+            slow = list(self._slow)
+        key = {"total": "total_s", "avg": "avg_s", "max": "max_s", "calls": "calls", "slow": "slow"}[sort]
+        rows.sort(key=lambda row: row[key], reverse=True)
+        return {
+            "slow_threshold_s": self.slow_threshold,
+            "shapes": len(rows),
+            "queries": rows[:limit],
+            "recent_slow": slow[::-1][:limit],
+        }
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
@@ -0,0 +1,291 @@
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+from .BaseDataService import DataDataService
+from .ConnectionPool import PoolTimeoutError
+
+# Configure logger for this module
+logger = logging.getLogger("ReplicatedDataService")
+logger.setLevel(logging.INFO)
+
+# Set to True for a unit of work (e.g. an HTTP request) whose reads must see the primary's
+# latest writes. AsyncDataService carries it over to the worker threads.
+prefer_primary = contextvars.ContextVar("prefer_primary", default=False)
+
+
+class _Replica:
+    """Routing state of one replica."""
+
+    __slots__ = ("name", "service", "in_flight", "failures", "ejected_until", "on_probation",
+                 "reads", "errors", "ejections")
+
+    def __init__(self, name: str, service):
+        self.name = name
+        self.service = service
+        self.in_flight = 0
+        self.failures = 0           # Consecutive failed reads
+        self.ejected_until = 0.0    # time.monotonic() until which no reads are sent to it
+        self.on_probation = False   # Re-admitted after an ejection; one failure ejects it again
+        self.reads = 0
+        self.errors = 0
+        self.ejections = 0
+
+
+class ReplicatedDataService(DataDataService):
+    """
+    Routes the calls of a data service between a primary and read replicas, each a data
+    service of its own (e.g. MySQLRDBDataService with its own pool).
+
+    Writes, transactions and any call given a ``connection`` go to the primary. Reads go to
+    the healthy replica with the fewest reads in flight, or to the primary when there is none,
+    when prefer_primary is set, or when every replica failed the read. A replica is ejected
+    for eject_seconds after eject_after consecutive failures that look like it is unavailable;
+    after that it gets reads again, and a single further failure ejects it again.
+
+    Replication lag is not measured: a read from a replica may miss recent writes. Set
+    prefer_primary where that matters, e.g. for clients that have just written.
+    """
+
+    def __init__(self, primary, replicas: dict, eject_after: int = 3, eject_seconds: float = 30.0):
+        """
+        :param primary: Data service of the primary.
+        :param replicas: {name: data service} of the replicas, e.g. keyed by host:port. A replica
+            service's is_unavailable(e) tells whether an exception means it could not serve the
+            read, as opposed to e.g. an invalid query, which would fail on the primary as well.
+        """
+        super().__init__(primary.context)
+        self.primary = primary
+        self.replicas = [_Replica(name, service) for name, service in replicas.items()]
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        # Executor size for AsyncDataService: enough threads to use every pool at once
+        self.max_connections = sum(
+            getattr(getattr(service, "pool", None), "max_size", 10) for service in [primary, *replicas.values()]
+        )
+        self._lock = threading.Lock()
+        self._next = 0
+        self.primary_reads = 0
+        self.fallbacks = 0
+
+    def _get_connection(self):
+        return self.primary._get_connection()
+
+    @staticmethod
+    def _is_unavailable(replica: _Replica, e: Exception) -> bool:
+        is_unavailable = getattr(replica.service, "is_unavailable", None)
+        return is_unavailable(e) if is_unavailable else isinstance(e, (OSError, PoolTimeoutError))
+
+    def _choose(self, exclude: set):
+        """Pick the available replica with the fewest reads in flight, rotating between equals."""
+        now = time.monotonic()
+        with self._lock:
+            count = len(self.replicas)
+            self._next = (self._next + 1) % max(count, 1)
+            best = None
+            for offset in range(count):
+                replica = self.replicas[(self._next + offset) % count]
+                if replica in exclude or replica.ejected_until > now:
+                    continue
+                if best is None or replica.in_flight < best.in_flight:
+                    best = replica
+            if best is not None:
+                best.in_flight += 1
+                best.reads += 1
+            return best
+
+    def _finished(self, replica: _Replica, error: Exception = None):
+        with self._lock:
+            replica.in_flight -= 1
+            if error is None:
+                replica.failures = 0
+                replica.on_probation = False
+                return
+            replica.errors += 1
+            replica.failures += 1
+            if replica.on_probation or replica.failures >= self.eject_after:
+                replica.ejected_until = time.monotonic() + self.eject_seconds
+                replica.failures = 0
+                replica.on_probation = True
+                replica.ejections += 1
+                logger.warning(f"Ejected replica {replica.name} for {self.eject_seconds}s after: {error}")
+
+    def _count_primary_read(self, fallback: bool):
+        with self._lock:
+            self.primary_reads += 1
+            if fallback:
+                self.fallbacks += 1
+
+    def _read(self, method: str, *args, connection=None, **kwargs):
+        if connection is not None:
+            return getattr(self.primary, method)(*args, connection=connection, **kwargs)
+        tried = set()
+        if not prefer_primary.get():
+            while (replica := self._choose(tried)) is not None:
+                tried.add(replica)
+                try:
+                    result = getattr(replica.service, method)(*args, **kwargs)
+                except Exception as e:
+                    unavailable = self._is_unavailable(replica, e)
+                    self._finished(replica, e if unavailable else None)
+                    if not unavailable:
+                        raise
+                    logger.warning(f"Read {method} failed on replica {replica.name}; trying elsewhere: {e}")
+                    continue
+                self._finished(replica)
+                return result
+        self._count_primary_read(fallback=bool(tried))
+        return getattr(self.primary, method)(*args, **kwargs)
+
+    # Reads
+
+    def get_data_object(self, database_name: str, collection_name: str, key_field: str, key_value: str):
+        return self._read("get_data_object", database_name, collection_name, key_field, key_value)
+
+    def fetch_one(self, database_name: str, table: str, key_field: str, key_value: str,
+                  columns: list = None, connection=None):
+        return self._read("fetch_one", database_name, table, key_field, key_value, columns=columns,
+                          connection=connection)
+
+    def fetch_many(self, database_name: str, table: str, key_field: str, key_values: list,
+                   order_by: str = None, columns: list = None, connection=None):
+        return self._read("fetch_many", database_name, table, key_field, key_values, order_by=order_by,
+                          columns=columns, connection=connection)
+
+    def existing_keys(self, database_name: str, table: str, key_field: str, key_values: list, connection=None) -> set:
+        return self._read("existing_keys", database_name, table, key_field, key_values, connection=connection)
+
+    def fetch_all(self, database_name: str, table: str, order_by: str = None, columns: list = None):
+        return self._read("fetch_all", database_name, table, order_by=order_by, columns=columns)
+
+    def fetch_paginated(self, database_name: str, table: str, offset: int, limit: int, order_by: str = None,
+                        columns: list = None):
+        return self._read("fetch_paginated", database_name, table, offset, limit, order_by=order_by, columns=columns)
+
+    def fetch_range(self, database_name: str, table: str, key_field: str, limit: int,
+                    after=None, before=None, descending: bool = False, columns: list = None,
+                    filters: dict = None):
+        return self._read("fetch_range", database_name, table, key_field, limit, after=after, before=before,
+                          descending=descending, columns=columns, filters=filters)
+
+    def count_all(self, database_name: str, table: str) -> int:
+        return self._read("count_all", database_name, table)
+
+    def estimate_count(self, database_name: str, table: str) -> int:
+        return self._read("estimate_count", database_name, table)
+
+    def stream_all(self, database_name: str, table: str, batch_size: int = 500, order_by: str = None,
+                   columns: list = None):
+        """
+        Generator over stream_all() of a replica. A replica failing before its first batch is
+        skipped like a failed read; once rows have been yielded, a failure ends the stream.
+        """
+        kwargs = {"batch_size": batch_size, "order_by": order_by, "columns": columns}
+        tried = set()
+        while not prefer_primary.get() and (replica := self._choose(tried)) is not None:
+            tried.add(replica)
+            started = False
+            try:
+                for rows in replica.service.stream_all(database_name, table, **kwargs):
+                    started = True
+                    yield rows
+            except GeneratorExit:
+                self._finished(replica)
+                raise
+            except Exception as e:
+                unavailable = self._is_unavailable(replica, e)
+                self._finished(replica, e if unavailable else None)
+                if started or not unavailable:
+                    raise
+                logger.warning(f"Stream failed on replica {replica.name}; trying elsewhere: {e}")
+                continue
+            self._finished(replica)
+            return
+        self._count_primary_read(fallback=bool(tried))
+        yield from self.primary.stream_all(database_name, table, **kwargs)
+
+    # Writes
+
+    @contextmanager
+    def transaction(self):
+        with self.primary.transaction() as connection:
+            yield connection
+
+    def insert(self, database_name: str, table: str, data: dict, connection=None):
+        return self.primary.insert(database_name, table, data, connection=connection)
+
+    def insert_many(self, database_name: str, table: str, rows: list, connection=None, chunk_size: int = 500,
+                    return_ids: bool = True) -> Optional[list]:
+        return self.primary.insert_many(database_name, table, rows, connection=connection, chunk_size=chunk_size,
+                                        return_ids=return_ids)
+
+    def update(self, database_name: str, table: str, data: dict, key_field: str, key_value: str, connection=None,
+               match: dict = None, increment: str = None):
+        return self.primary.update(database_name, table, data, key_field, key_value, connection=connection,
+                                   match=match, increment=increment)
+
+    def increment(self, database_name: str, table: str, field: str, key_field: str, key_values: list,
+                  connection=None) -> int:
+        return self.primary.increment(database_name, table, field, key_field, key_values, connection=connection)
+
+    def delete(self, database_name: str, table: str, key_field: str, key_value: str, connection=None):
+        return self.primary.delete(database_name, table, key_field, key_value, connection=connection)
+
+    def delete_where(self, database_name: str, table: str, key_field: str, key_value: str, connection=None) -> int:
+        return self.primary.delete_where(database_name, table, key_field, key_value, connection=connection)
+
+    # Lifecycle and metrics
+
+    def warm(self):
+        """Warm the primary's pool, and the replicas' pools as far as they are reachable."""
+        self.primary.warm()
+        for replica in self.replicas:
+            try:
+                replica.service.warm()
+            except Exception as e:
+                logger.warning(f"Could not warm replica {replica.name}: {e}")
+
+    def close(self):
+        for service in [self.primary, *(replica.service for replica in self.replicas)]:
+            service.close()
+
+    def pool_stats(self) -> dict:
+        """Pool metrics of the primary and of each replica, with the replicas' routing state."""
+        now = time.monotonic()
+        with self._lock:
+            replicas = {
+                replica.name: {
+                    "ejected": replica.ejected_until > now,
+                    "in_flight": replica.in_flight,
+                    "reads": replica.reads,
+                    "errors": replica.errors,
+                    "ejections": replica.ejections,
+                }
+                for replica in self.replicas
+            }
+        for replica in self.replicas:
+            pool_stats = getattr(replica.service, "pool_stats", None)
+            replicas[replica.name]["pool"] = pool_stats() if pool_stats else None
+        return {
+            "primary": self.primary.pool_stats(),
+            "primary_reads": self.primary_reads,
+            "fallbacks": self.fallbacks,
+            "replicas": replicas,
+        }
+
+    @property
+    def profiler(self):
+        """The primary's query profiler, which the replicas share (see ServiceFactory)."""
+        return getattr(self.primary, "profiler", None)
+
+    def query_report(self, limit: int = 20, sort: str = "total") -> dict:
+        query_report = getattr(self.primary, "query_report", None)
+        return query_report(limit, sort) if query_report else None
+
+    def statement_stats(self) -> dict:
+        return {
+            "primary": self.primary.statement_stats(),
+            "replicas": {replica.name: replica.service.statement_stats() for replica in self.replicas},
+        }
@@ -0,0 +1,505 @@
+import sqlite3
+import threading
+from contextlib import contextmanager, nullcontext
+from .BaseDataService import DataDataService, StaleRecordError
+from .StatementCache import StatementCache
+import logging
+import re
+from typing import Optional
+
+# Configure logger for this module
+logger = logging.getLogger("SQLiteRDBDataService")
+logger.setLevel(logging.INFO)  # Set to INFO for less verbose logs in production
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Largest number of ? parameters in one statement (SQLITE_MAX_VARIABLE_NUMBER; 999 before 3.32)
+_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class SQLiteRDBDataService(DataDataService):
+    """
+    Data service on an embedded SQLite database, with the same methods and semantics as
+    MySQLRDBDataService, for single-node deployments, development and benchmarks.
+
+    Each database_name is a SQLite file attached under that name, so statements keep their
+    database.table form. Every thread keeps its own connection instead of borrowing from a
+    pool: connections are cheap, and in WAL mode readers run concurrently with the single
+    writer. sqlite3 also keeps prepared statements per connection, keyed by the SQL text the
+    statement cache hands out.
+
+    Context:
+        path: Database file of the default database (":memory:" is not shared between threads).
+        database: Name the default database is attached under, e.g. "p1_database".
+        databases: Optional {name: path} of further databases.
+        schema: Optional SQL script run on startup, e.g. CREATE TABLE IF NOT EXISTS statements.
+        synchronous: PRAGMA synchronous; NORMAL (default) is durable in WAL mode except on power loss.
+        mmap_size: Bytes of the database file read through memory mapping (default 256 MiB).
+        cache_size: Page cache per connection in KiB (default 64 MiB).
+        busy_timeout: Seconds a writer waits for the write lock (default 10).
+    """
+
+    def __init__(self, context):
+        super().__init__(context)
+        self.databases = {context.get("database", "p1_database"): context["path"], **context.get("databases", {})}
+        for name in self.databases:
+            if not _IDENTIFIER.match(name):
+                raise ValueError(f"Invalid database name: {name!r}")
+        self.statements = StatementCache(int(context.get("statement_cache_size", 512)))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._generation = 0  # Bumped by close(), so threads reopen their connections afterwards
+        self._created = 0
+        self._streams = 0
+        schema = context.get("schema")
+        if schema:
+            with open(schema) as f:
+                script = f.read()
+            with self._borrow() as connection:
+                connection.executescript(script)
+            logger.info(f"Applied schema {schema}.")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection with every database attached and the pragmas applied."""
+        try:
+            connection = sqlite3.connect(
+                ":memory:",
+                isolation_level=None,  # Autocommit; transaction() issues BEGIN/COMMIT itself
+                check_same_thread=False,  # A stream may be resumed on another executor thread
+                cached_statements=int(self.context.get("statement_cache_size", 512))
+            )
+            connection.row_factory = _dict_row
+            connection.execute(f"PRAGMA busy_timeout = {int(float(self.context.get('busy_timeout', 10)) * 1000)}")
+            connection.execute("PRAGMA foreign_keys = ON")
+            connection.execute("PRAGMA temp_store = MEMORY")
+            for name, path in self.databases.items():
+                connection.execute("ATTACH DATABASE ? AS " + name, (path,))
+                connection.execute(f"PRAGMA {name}.journal_mode = WAL")
+                connection.execute(f"PRAGMA {name}.synchronous = {self.context.get('synchronous', 'NORMAL')}")
+                connection.execute(f"PRAGMA {name}.mmap_size = {int(self.context.get('mmap_size', 256 * 1024 * 1024))}")
+                connection.execute(f"PRAGMA {name}.cache_size = {-int(self.context.get('cache_size', 64 * 1024))}")
+            with self._lock:
+                self._created += 1
+            return connection
+        except Exception as e:
+            logger.exception("Failed to open the SQLite database.")
+            raise
+
+    def _get_connection(self):
+        """Return the calling thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.generation != self._generation:
+            connection = self._connect()
+            with self._lock:
+                self._connections.append(connection)
+                self._local.generation = self._generation
+            self._local.connection = connection
+        return connection
+
+    def warm(self):
+        """Open the calling thread's connection ahead of traffic."""
+        self._get_connection()
+
+    def close(self):
+        """Close every thread's connection; threads open a new one on their next call."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for connection in connections:
+            connection.close()
+
+    def pool_stats(self) -> dict:
+        """Return connection counts; there is no pool, so nothing ever waits for a connection."""
+        with self._lock:
+            return {
+                "size": len(self._connections),
+                "in_use": self._streams,
+                "created": self._created,
+            }
+
+    def statement_stats(self) -> dict:
+        """Return statement cache hit/miss counters."""
+        return self.statements.stats()
+
+    def _borrow(self, connection=None):
+        """Use the caller's connection (e.g. inside a transaction) or the calling thread's connection."""
+        return nullcontext(connection if connection is not None else self._get_connection())
+
+    @staticmethod
+    def _select_list(columns: list = None) -> str:
+        """Build the SELECT column list; None selects every column."""
+        if not columns:
+            return "*"
+        for column in columns:
+            if not _IDENTIFIER.match(column):
+                raise ValueError(f"Invalid column name: {column!r}")
+        return ", ".join(columns)
+
+    def _select_all(self, database_name: str, table: str, order_by: str = None, columns: list = None) -> str:
+        def build():
+            sql = f"SELECT {self._select_list(columns)} FROM {database_name}.{table}"
+            return sql + f" ORDER BY {order_by}" if order_by else sql
+
+        return self.statements.get(("select_all", database_name, table, order_by, tuple(columns or ())), build)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run a transaction on the calling thread's connection. Pass the yielded connection to the
+        data service methods through their ``connection`` argument; the transaction commits
+        when the block exits and rolls back if it raises. The write lock is taken up front, so
+        the transaction never fails halfway on a lock upgrade.
+        """
+        connection = self._get_connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+            connection.execute("COMMIT")
+        except Exception:
+            logger.warning("Rolling back transaction.")
+            connection.execute("ROLLBACK")
+            raise
+
+    def get_data_object(self, database_name: str, collection_name: str, key_field: str, key_value: str):
+        """Retrieve a single data object based on key_field and key_value."""
+        try:
+            return self.fetch_one(database_name, collection_name, key_field, key_value)
+        except Exception as e:
+            logger.exception("Error retrieving data object.")
+            raise
+
+    def fetch_one(self, database_name: str, table: str, key_field: str, key_value: str,
+                  columns: list = None, connection=None):
+        """Fetch a single record from the specified table, optionally only the given columns."""
+        try:
+            sql = self.statements.get(
+                ("fetch_one", database_name, table, key_field, tuple(columns or ())),
+                lambda: f"SELECT {self._select_list(columns)} FROM {database_name}.{table} WHERE {key_field} = ?"
+            )
+            logger.debug("Executing query to fetch a single record.")
+            with self._borrow(connection) as connection:
+                result = connection.execute(sql, (key_value,)).fetchone()
+                if result:
+                    logger.info(f"Successfully fetched a record from {table}.")
+                else:
+                    logger.info(f"No record found in {table} where {key_field} = {key_value}.")
+                return result
+        except Exception as e:
+            logger.exception("Error fetching a single record.")
+            raise
+
+    def fetch_many(self, database_name: str, table: str, key_field: str, key_values: list,
+                   order_by: str = None, columns: list = None, connection=None):
+        """Fetch every record whose key_field is one of key_values, in a single query."""
+        if not key_values:
+            return []
+        try:
+            def build():
+                placeholders = ", ".join(["?"] * len(key_values))
+                sql = f"SELECT {self._select_list(columns)} FROM {database_name}.{table} WHERE {key_field} IN ({placeholders})"
+                return sql + f" ORDER BY {order_by}" if order_by else sql
+
+            sql = self.statements.get(
+                ("fetch_many", database_name, table, key_field, len(key_values), order_by, tuple(columns or ())),
+                build
+            )
+            logger.debug("Executing query to fetch multiple records by key.")
+            with self._borrow(connection) as connection:
+                result = connection.execute(sql, tuple(key_values)).fetchall()
+                logger.info(f"Fetched {len(result)} records from {table} for {len(key_values)} keys.")
+                return result
+        except Exception as e:
+            logger.exception("Error fetching multiple records.")
+            raise
+
+    def existing_keys(self, database_name: str, table: str, key_field: str, key_values: list, connection=None) -> set:
+        """Return the subset of key_values present in the table, reading only the key column."""
+        if not key_values:
+            return set()
+        try:
+            sql = self.statements.get(
+                ("existing_keys", database_name, table, key_field, len(key_values)),
+                lambda: f"SELECT {key_field} FROM {database_name}.{table} "
+                        f"WHERE {key_field} IN ({', '.join(['?'] * len(key_values))})"
+            )
+            with self._borrow(connection) as connection:
+                return {row[key_field] for row in connection.execute(sql, tuple(key_values)).fetchall()}
+        except Exception as e:
+            logger.exception("Error checking record existence.")
+            raise
+
+    def insert(self, database_name: str, table: str, data: dict, connection=None):
+        """Insert a new record into the database."""
+        try:
+            sql = self.statements.get(
+                ("insert", database_name, table, tuple(data)),
+                lambda: f"INSERT INTO {database_name}.{table} ({', '.join(data)}) VALUES ({', '.join(['?'] * len(data))})"
+            )
+            logger.debug("Executing query to insert a record.")
+            with self._borrow(connection) as connection:
+                inserted_id = connection.execute(sql, tuple(data.values())).lastrowid
+                logger.info(f"Record inserted into {table} with ID {inserted_id}.")
+                return inserted_id
+        except Exception as e:
+            logger.exception("Error inserting record.")
+            raise
+
+    def insert_many(self, database_name: str, table: str, rows: list, connection=None, chunk_size: int = 500,
+                    return_ids: bool = True) -> Optional[list]:
+        """
+        Insert several records with multi-row INSERT statements of at most chunk_size rows (fewer
+        if the statement would exceed SQLite's parameter limit).
+
+        All rows must have the same columns. Run inside transaction() for all-or-nothing
+        semantics across chunks.
+
+        :return: The generated IDs in the order of rows, or None if return_ids is False. The
+            rows of one statement get consecutive rowids, and SQLite reports the last of them.
+        """
+        if not rows:
+            return [] if return_ids else None
+        try:
+            columns = list(rows[0].keys())
+            chunk_size = max(1, min(chunk_size, _MAX_VARIABLES // len(columns)))
+            row_placeholder = "(" + ", ".join(["?"] * len(columns)) + ")"
+            inserted_ids = []
+            with self._borrow(connection) as connection:
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    sql = self.statements.get(
+                        ("insert_many", database_name, table, tuple(columns), len(chunk)),
+                        lambda: f"INSERT INTO {database_name}.{table} ({', '.join(columns)}) "
+                                f"VALUES {', '.join([row_placeholder] * len(chunk))}"
+                    )
+                    params = tuple(row[column] for row in chunk for column in columns)
+                    logger.debug(f"Executing multi-row insert of {len(chunk)} records.")
+                    last_id = connection.execute(sql, params).lastrowid
+                    inserted_ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+            logger.info(f"Inserted {len(inserted_ids)} records into {table}.")
+            return inserted_ids if return_ids else None
+        except Exception as e:
+            logger.exception("Error inserting records.")
+            raise
+
+    def fetch_all(self, database_name: str, table: str, order_by: str = None, columns: list = None):
+        """Fetch all records from the specified table."""
+        try:
+            sql = self._select_all(database_name, table, order_by, columns)
+            logger.debug("Executing query to fetch all records.")
+            result = self._get_connection().execute(sql).fetchall()
+            logger.info(f"Fetched {len(result)} records from {table}.")
+            return result
+        except Exception as e:
+            logger.exception("Error fetching all records.")
+            raise
+
+    def stream_all(self, database_name: str, table: str, batch_size: int = 500, order_by: str = None,
+                   columns: list = None):
+        """
+        Generator yielding all records of the table in lists of at most batch_size rows.
+
+        SQLite steps through the result as rows are fetched, so memory use is bounded by
+        batch_size. The stream reads on a connection of its own, since it may be resumed on
+        other threads while those threads' connections are in use.
+        """
+        sql = self._select_all(database_name, table, order_by, columns)
+        connection = self._connect()
+        with self._lock:
+            self._streams += 1
+        try:
+            logger.debug("Executing query to stream all records.")
+            cursor = connection.execute(sql)
+            streamed = 0
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                streamed += len(rows)
+                yield rows
+            logger.info(f"Streamed {streamed} records from {table}.")
+        except GeneratorExit:
+            logger.info(f"Stream of {table} closed before completion.")
+            raise
+        except Exception as e:
+            logger.exception("Error streaming records.")
+            raise
+        finally:
+            with self._lock:
+                self._streams -= 1
+            connection.close()
+
+    def fetch_paginated(self, database_name: str, table: str, offset: int, limit: int, order_by: str = None,
+                        columns: list = None):
+        """Fetch a paginated list of records from the table."""
+        try:
+            sql = self.statements.get(
+                ("fetch_paginated", database_name, table, order_by, tuple(columns or ())),
+                lambda: self._select_all(database_name, table, order_by, columns) + " LIMIT ? OFFSET ?"
+            )
+            logger.debug("Executing query to fetch paginated records.")
+            result = self._get_connection().execute(sql, (limit, offset)).fetchall()
+            logger.info(f"Fetched {len(result)} records from {table} (offset: {offset}, limit: {limit}).")
+            return result
+        except Exception as e:
+            logger.exception("Error fetching paginated data.")
+            raise
+
+    def fetch_range(self, database_name: str, table: str, key_field: str, limit: int,
+                    after=None, before=None, descending: bool = False, columns: list = None,
+                    filters: dict = None):
+        """
+        Fetch up to limit records ordered by key_field, starting strictly after and/or before
+        the given key values (keyset pagination), restricted to records whose fields equal
+        filters. See MySQLRDBDataService.fetch_range.
+        """
+        try:
+            filters = filters or {}
+
+            def build():
+                conditions = []
+                for field in filters:
+                    if not _IDENTIFIER.match(field):
+                        raise ValueError(f"Invalid column name: {field}")
+                    conditions.append(f"{field} = ?")
+                if after is not None:
+                    conditions.append(f"{key_field} > ?")
+                if before is not None:
+                    conditions.append(f"{key_field} < ?")
+                sql = f"SELECT {self._select_list(columns)} FROM {database_name}.{table}"
+                if conditions:
+                    sql += " WHERE " + " AND ".join(conditions)
+                return sql + f" ORDER BY {key_field} {'DESC' if descending else 'ASC'} LIMIT ?"
+
+            sql = self.statements.get(
+                ("fetch_range", database_name, table, key_field, tuple(filters), after is not None,
+                 before is not None, descending, tuple(columns or ())),
+                build
+            )
+            params = list(filters.values()) + [value for value in (after, before) if value is not None] + [limit]
+            logger.debug("Executing query to fetch a range of records.")
+            result = self._get_connection().execute(sql, tuple(params)).fetchall()
+            logger.info(f"Fetched {len(result)} records from {table} (filters: {filters}, after: {after}, before: {before}, limit: {limit}).")
+            return result
+        except Exception as e:
+            logger.exception("Error fetching a range of records.")
+            raise
+
+    def update(self, database_name: str, table: str, data: dict, key_field: str, key_value: str, connection=None,
+               match: dict = None, increment: str = None):
+        """
+        Update an existing record in the database with a single statement. SQLite counts every
+        row the WHERE clause matched, so a missing record is detected from the row count.
+
+        :param match: Further field values the record must still have, e.g. {"version": 3}, for
+            optimistic concurrency. If the record exists but does not match, StaleRecordError is raised.
+        :param increment: Name of a counter column to increment in the same statement, e.g. "version".
+        """
+        match = match or {}
+        try:
+            def build():
+                assignments = [f"{key} = ?" for key in data]
+                if increment:
+                    if not _IDENTIFIER.match(increment):
+                        raise ValueError(f"Invalid column name: {increment!r}")
+                    assignments.append(f"{increment} = {increment} + 1")
+                conditions = [f"{key_field} = ?"] + [f"{self._select_list([field])} = ?" for field in match]
+                return f"UPDATE {database_name}.{table} SET {', '.join(assignments)} WHERE {' AND '.join(conditions)}"
+
+            sql = self.statements.get(("update", database_name, table, tuple(data), key_field, tuple(match), increment), build)
+            logger.debug("Executing query to update a record.")
+            with self._borrow(connection) as borrowed:
+                matched = borrowed.execute(sql, tuple(data.values()) + (key_value,) + tuple(match.values())).rowcount
+            if not matched:
+                if match and self.fetch_one(database_name, table, key_field, key_value, columns=[key_field],
+                                            connection=connection):
+                    logger.warning(f"Record in {table} where {key_field} = {key_value} does not match {match}.")
+                    raise StaleRecordError(f"Record with {key_field} = {key_value} has been modified")
+                logger.warning(f"No record found in {table} for update where {key_field} = {key_value}.")
+                raise Exception(f"No record found with {key_field} = {key_value}")
+            logger.info(f"Record in {table} updated where {key_field} = {key_value}.")
+        except Exception as e:
+            logger.exception("Error updating record.")
+            raise
+
+    def increment(self, database_name: str, table: str, field: str, key_field: str, key_values: list,
+                  connection=None) -> int:
+        """Add 1 to field of every record whose key_field is one of key_values; return how many matched."""
+        if not key_values:
+            return 0
+        try:
+            sql = self.statements.get(
+                ("increment", database_name, table, field, key_field, len(key_values)),
+                lambda: f"UPDATE {database_name}.{table} SET {self._select_list([field])} = {field} + 1 "
+                        f"WHERE {key_field} IN ({', '.join(['?'] * len(key_values))})"
+            )
+            with self._borrow(connection) as connection:
+                return connection.execute(sql, tuple(key_values)).rowcount
+        except Exception as e:
+            logger.exception("Error incrementing records.")
+            raise
+
+    def delete(self, database_name: str, table: str, key_field: str, key_value: str, connection=None):
+        """Delete a record from the specified table with a single statement; raises if it does not exist."""
+        try:
+            deleted = self.delete_where(database_name, table, key_field, key_value, connection=connection)
+            if not deleted:
+                logger.warning(f"No record found in {table} for deletion where {key_field} = {key_value}.")
+                raise Exception(f"No record found with {key_field} = {key_value}")
+
+        except Exception as e:
+            logger.exception("Error deleting record.")
+            raise
+
+    def delete_where(self, database_name: str, table: str, key_field: str, key_value: str, connection=None) -> int:
+        """Delete every record matching key_field = key_value and return how many were removed."""
+        try:
+            sql = self.statements.get(
+                ("delete", database_name, table, key_field),
+                lambda: f"DELETE FROM {database_name}.{table} WHERE {key_field} = ?"
+            )
+            logger.debug("Executing query to delete matching records.")
+            with self._borrow(connection) as connection:
+                deleted = connection.execute(sql, (key_value,)).rowcount
+                logger.info(f"Deleted {deleted} records from {table} where {key_field} = {key_value}.")
+                return deleted
+        except Exception as e:
+            logger.exception("Error deleting records.")
+            raise
+
+    def count_all(self, database_name: str, table: str) -> int:
+        """Count all records in the specified table."""
+        try:
+            sql = self.statements.get(
+                ("count_all", database_name, table),
+                lambda: f"SELECT COUNT(*) AS total FROM {database_name}.{table}"
+            )
+            logger.debug("Executing query to count records.")
+            total = self._get_connection().execute(sql).fetchone()["total"]
+            logger.info(f"Table {table} contains {total} records.")
+            return total
+        except Exception as e:
+            logger.exception("Error counting records.")
+            raise
+
+    def estimate_count(self, database_name: str, table: str) -> int:
+        """
+        Return the largest rowid of the table, an upper bound of its row count (deleted rows
+        still count). It is read from the end of the table's B-tree, without a scan.
+        """
+        try:
+            sql = self.statements.get(
+                ("estimate_count", database_name, table),
+                lambda: f"SELECT MAX(rowid) AS total FROM {database_name}.{table}"
+            )
+            logger.debug("Executing query to estimate record count.")
+            total = int(self._get_connection().execute(sql).fetchone()["total"] or 0)
+            logger.info(f"Table {table} contains approximately {total} records.")
+            return total
+        except Exception as e:
+            logger.exception("Error estimating record count.")
+            raise
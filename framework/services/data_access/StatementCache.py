@@ -0,0 +1,51 @@
+import threading
+from collections import OrderedDict
+
+
+class StatementCache:
+    """
+    Thread-safe LRU cache of built SQL statements, keyed by (operation, database, table, column
+    set, ...). Building a statement validates identifiers and joins strings; with the cache that
+    happens once per statement shape instead of once per call.
+
+    The cache holds statement text only. PyMySQL speaks the text protocol and has no
+    server-side prepared statements, so a driver that does (e.g. mysql-connector's prepared
+    cursors) would key its prepared handles by the same cached text.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        """
+        :param max_entries: Number of statements kept. 0 disables caching.
+        """
+        self.max_entries = max_entries
+        self._statements = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple, build) -> str:
+        """Return the statement cached under key, building it with build() on a miss."""
+        with self._lock:
+            sql = self._statements.get(key)
+            if sql is not None:
+                self._statements.move_to_end(key)
+                self.hits += 1
+                return sql
+            self.misses += 1
+        sql = build()
+        if self.max_entries > 0:
+            with self._lock:
+                self._statements[key] = sql
+                if len(self._statements) > self.max_entries:
+                    self._statements.popitem(last=False)
+        return sql
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._statements),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
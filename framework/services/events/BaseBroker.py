@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+
+
+class BaseBroker(ABC):
+    """
+    Abstract base class for event brokers. The EventHub publishes through a broker and
+    receives events back from it, so the hub's local subscribers see events published by
+    any service instance connected to the same broker.
+
+    Callbacks are plain functions called on the event loop as callback(channel, event);
+    they must not block.
+    """
+
+    @abstractmethod
+    async def publish(self, channel: str, event: dict) -> None:
+        """
+        Send event to every subscriber of channel, on every connected instance.
+        """
+        raise NotImplementedError('Abstract method publish()')
+
+    @abstractmethod
+    async def subscribe(self, channel: str, callback) -> None:
+        """
+        Start calling callback(channel, event) for events published on channel.
+        """
+        raise NotImplementedError('Abstract method subscribe()')
+
+    @abstractmethod
+    async def unsubscribe(self, channel: str, callback) -> None:
+        """
+        Stop calling callback for events published on channel.
+        """
+        raise NotImplementedError('Abstract method unsubscribe()')
+
+    async def close(self) -> None:
+        """
+        Release the broker's connections, if it holds any.
+        """
+        pass
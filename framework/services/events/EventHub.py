@@ -0,0 +1,144 @@
+import asyncio
+import logging
+from typing import Optional
+
+# Configure logger for this module
+logger = logging.getLogger("EventHub")
+logger.setLevel(logging.INFO)
+
+
+class SubscriptionClosed(Exception):
+    """Raised by Subscription.get once the subscription is closed and its queue is drained."""
+    pass
+
+
+class Subscription:
+    """
+    One subscriber's bounded queue of events on a channel.
+
+    A subscriber that falls max_queue events behind is not allowed to buffer without bound:
+    its backlog is dropped, it receives a single {"type": "lagged"} event and the
+    subscription closes. The client is expected to reload what it missed and resubscribe.
+    """
+
+    def __init__(self, hub, channel: str, max_queue: int):
+        self.hub = hub
+        self.channel = channel
+        self.closed = False
+        self.dropped = 0
+        self._queue = asyncio.Queue(maxsize=max_queue)
+
+    def _offer(self, event: dict):
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped = self._queue.qsize() + 1
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait({"type": "lagged", "channel": self.channel, "dropped": self.dropped})
+            self.closed = True
+            self.hub._record_lagged(self)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """
+        Wait for the next event.
+
+        :return: The event, or None if timeout seconds pass without one.
+        :raises SubscriptionClosed: If the subscription is closed and no events are left.
+        """
+        if self.closed and self._queue.empty():
+            raise SubscriptionClosed(self.channel)
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        """Stop receiving events. Idempotent."""
+        await self.hub.unsubscribe(self)
+
+
+class EventHub:
+    """
+    In-process publish/subscribe hub with per-subscriber bounded queues.
+
+    Events are published through a broker (see BaseBroker). The hub subscribes to the broker
+    once per channel that has local subscribers, and fans each event out to their queues, so
+    the number of broker subscriptions does not grow with the number of clients.
+    """
+
+    def __init__(self, broker, max_queue: int = 100):
+        """
+        :param broker: BaseBroker implementation, e.g. InMemoryBroker or RedisBroker.
+        :param max_queue: Events a subscriber may fall behind before it is dropped as lagged.
+        """
+        self.broker = broker
+        self.max_queue = max_queue
+        self._subscribers = {}
+
+        # Metrics
+        self._published = 0
+        self._delivered = 0
+        self._lagged = 0
+        self._dropped = 0
+
+    async def publish(self, channel: str, event: dict) -> None:
+        """Publish event to every subscriber of channel."""
+        await self.broker.publish(channel, event)
+        self._published += 1
+
+    async def subscribe(self, channel: str) -> Subscription:
+        """Return a new subscription to channel. Close it when done."""
+        subscription = Subscription(self, channel, self.max_queue)
+        subscribers = self._subscribers.get(channel)
+        if subscribers is None:
+            subscribers = self._subscribers[channel] = set()
+            try:
+                await self.broker.subscribe(channel, self._deliver)
+            except Exception:
+                del self._subscribers[channel]
+                raise
+        subscribers.add(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.closed = True
+        subscribers = self._subscribers.get(subscription.channel)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.channel]
+            await self.broker.unsubscribe(subscription.channel, self._deliver)
+
+    def _deliver(self, channel: str, event: dict):
+        for subscription in list(self._subscribers.get(channel, ())):
+            subscription._offer(event)
+            self._delivered += 1
+
+    def _record_lagged(self, subscription: Subscription):
+        self._lagged += 1
+        self._dropped += subscription.dropped
+        logger.warning(f"Dropped lagging subscriber on {subscription.channel} ({subscription.dropped} events behind).")
+
+    async def close(self) -> None:
+        """Close every subscription and the broker."""
+        for channel, subscribers in list(self._subscribers.items()):
+            for subscription in list(subscribers):
+                await self.unsubscribe(subscription)
+        await self.broker.close()
+
+    def stats(self) -> dict:
+        """Return subscriber counts and delivery metrics."""
+        return {
+            "broker": type(self.broker).__name__,
+            "max_queue": self.max_queue,
+            "channels": len(self._subscribers),
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "published": self._published,
+            "delivered": self._delivered,
+            "lagged_subscribers": self._lagged,
+            "dropped_events": self._dropped,
+        }
@@ -0,0 +1,25 @@
+from .BaseBroker import BaseBroker
+
+
+class InMemoryBroker(BaseBroker):
+    """
+    Broker that only reaches subscribers in the same process. Enough for a single instance,
+    local runs and tests; use a shared broker such as RedisBroker to fan out across instances.
+    """
+
+    def __init__(self):
+        self._callbacks = {}
+
+    async def publish(self, channel: str, event: dict) -> None:
+        for callback in list(self._callbacks.get(channel, ())):
+            callback(channel, event)
+
+    async def subscribe(self, channel: str, callback) -> None:
+        self._callbacks.setdefault(channel, []).append(callback)
+
+    async def unsubscribe(self, channel: str, callback) -> None:
+        callbacks = self._callbacks.get(channel)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+            if not callbacks:
+                del self._callbacks[channel]
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import logging
+
+from .BaseBroker import BaseBroker
+
+# Configure logger for this module
+logger = logging.getLogger("RedisBroker")
+logger.setLevel(logging.INFO)
+
+
+class RedisBroker(BaseBroker):
+    """
+    Broker backed by Redis pub/sub, so events published by one service instance reach
+    subscribers connected to any instance.
+
+    The client only needs the publish(channel, message) and pubsub() calls of
+    redis.asyncio.Redis. Events are sent as JSON. A single reader task receives the
+    messages of every subscribed channel.
+    """
+
+    def __init__(self, client, namespace: str = "events"):
+        self.client = client
+        self.namespace = namespace
+        self._pubsub = None
+        self._reader = None
+        self._callbacks = {}
+        self.errors = 0
+
+    def _key(self, channel: str) -> str:
+        return f"{self.namespace}:{channel}"
+
+    async def publish(self, channel: str, event: dict) -> None:
+        await self.client.publish(self._key(channel), json.dumps(event, default=str))
+
+    async def subscribe(self, channel: str, callback) -> None:
+        callbacks = self._callbacks.setdefault(channel, [])
+        callbacks.append(callback)
+        if len(callbacks) > 1:
+            return
+        if self._pubsub is None:
+            self._pubsub = self.client.pubsub()
+        await self._pubsub.subscribe(self._key(channel))
+        if self._reader is None:
+            self._reader = asyncio.create_task(self._read())
+
+    async def unsubscribe(self, channel: str, callback) -> None:
+        callbacks = self._callbacks.get(channel)
+        if not callbacks or callback not in callbacks:
+            return
+        callbacks.remove(callback)
+        if not callbacks:
+            del self._callbacks[channel]
+            await self._pubsub.unsubscribe(self._key(channel))
+
+    async def _read(self):
+        prefix = f"{self.namespace}:"
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None:
+                    continue
+                key = message["channel"]
+                key = key.decode("utf-8") if isinstance(key, bytes) else key
+                channel = key[len(prefix):]
+                event = json.loads(message["data"])
+                for callback in list(self._callbacks.get(channel, ())):
+                    callback(channel, event)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception("Error reading events from Redis.")
+                await asyncio.sleep(1.0)
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
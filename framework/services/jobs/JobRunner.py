@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Optional
+
+# Configure logger for this module
+logger = logging.getLogger("JobRunner")
+logger.setLevel(logging.INFO)
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+    pass
+
+
+class TooManyWaitersError(Exception):
+    """Raised when a task is watched while max_waiters watchers are already waiting."""
+    pass
+
+
+class JobRunner:
+    """
+    Runs background jobs (coroutine functions) on a bounded pool of asyncio workers and
+    records their status in a persistent job store.
+
+    At most ``concurrency`` jobs run at once and at most ``max_queue`` wait to run; further
+    submissions are rejected. Finished tasks are purged from the store ``ttl`` seconds after
+    they finish. Clients can watch a task to be told about its status transitions instead
+    of polling the store; at most ``max_waiters`` watchers wait at once.
+    """
+
+    def __init__(self, store, concurrency: int = 4, max_queue: int = 1000,
+                 ttl: float = 3600.0, purge_interval: float = 60.0, max_waiters: int = 1000):
+        """
+        :param store: Blocking job store, e.g. SQLiteJobStore.
+        :param concurrency: Number of jobs that may run at the same time.
+        :param max_queue: Number of jobs that may wait for a worker.
+        :param ttl: Seconds a finished task stays retrievable.
+        :param purge_interval: Seconds between purges of expired tasks, which also renew the
+            store's lease on this runner's tasks (see SQLiteJobStore); keep it below the lease.
+        :param max_waiters: Number of watchers that may wait for task transitions at once.
+        """
+        self.store = store
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self.max_waiters = max_waiters
+
+        self._queue = None
+        self._workers = []
+        self._purger = None
+        self._running = 0
+        self._watchers = {}  # task_id -> queues of watchers waiting for its next transition
+        self._waiting = 0
+
+        # Metrics
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._rejected_waiters = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._run_time_total = 0.0
+        self._run_time_max = 0.0
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+
+    def start(self):
+        """Start the workers and the purge loop on the running event loop. Idempotent."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+        self._purger = asyncio.create_task(self._purge_loop())
+        logger.info(f"Job runner started with {self.concurrency} workers.")
+
+    async def stop(self, timeout: float = 30.0):
+        """
+        Wait up to timeout seconds for queued and running jobs to finish, then stop the workers
+        and close the store, which fails the jobs that did not finish.
+        """
+        if not self._workers:
+            await asyncio.to_thread(self.store.close)
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Stopping job runner with {self._queue.qsize()} queued and {self._running} running jobs.")
+        for task in self._workers + [self._purger]:
+            task.cancel()
+        await asyncio.gather(*self._workers, self._purger, return_exceptions=True)
+        self._workers, self._purger = [], None
+        await asyncio.to_thread(self.store.close)
+        logger.info("Job runner stopped.")
+
+    # ------------------------------------------------------------------ #
+    # Jobs
+    # ------------------------------------------------------------------ #
+
+    async def submit(self, job, *args, success_status: int = 200) -> str:
+        """
+        Queue job(*args) to run in the background.
+
+        :param job: Coroutine function. Its return value becomes the task result; an exception
+            fails the task with the exception's status_code attribute, or 500.
+        :param success_status: Status code recorded when the job succeeds.
+        :return: The task ID.
+        :raises QueueFullError: If max_queue jobs are already waiting.
+        """
+        self.start()
+        if self._queue.full():
+            self._rejected += 1
+            raise QueueFullError(f"Job queue is full ({self.max_queue} jobs waiting).")
+        task_id = str(uuid.uuid4())
+        await asyncio.to_thread(self.store.create, task_id)
+        try:
+            self._queue.put_nowait((task_id, job, args, success_status, time.monotonic()))
+        except asyncio.QueueFull:
+            # Filled up while the task row was being written.
+            self._rejected += 1
+            await asyncio.to_thread(self.store.fail, task_id, 503, "Job queue is full.")
+            raise QueueFullError(f"Job queue is full ({self.max_queue} jobs waiting).")
+        self._submitted += 1
+        return task_id
+
+    async def get(self, task_id: str) -> Optional[dict]:
+        """Return the stored task, or None if it does not exist or has been purged."""
+        return await asyncio.to_thread(self.store.get, task_id)
+
+    async def watch(self, task_id: str, timeout: float):
+        """
+        Async generator yielding the stored task now and again after each of its status
+        transitions (started, completed or failed), until it finishes or timeout seconds pass.
+        Yields nothing if the task does not exist.
+
+        :raises TooManyWaitersError: If max_waiters watchers are already waiting.
+        """
+        if self._waiting >= self.max_waiters:
+            self._rejected_waiters += 1
+            raise TooManyWaitersError(f"Too many task watchers ({self.max_waiters} waiting).")
+        # Register before reading the task so a transition in between is not missed.
+        transitions = asyncio.Queue()
+        self._watchers.setdefault(task_id, []).append(transitions)
+        self._waiting += 1
+        try:
+            task = await self.get(task_id)
+            if task is None:
+                return
+            yield task
+            deadline = asyncio.get_running_loop().time() + timeout
+            while task["status"] == "in_progress":
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    return
+                try:
+                    await asyncio.wait_for(transitions.get(), remaining)
+                except asyncio.TimeoutError:
+                    return
+                task = await self.get(task_id)
+                if task is None:
+                    return
+                yield task
+        finally:
+            self._waiting -= 1
+            watchers = self._watchers.get(task_id)
+            watchers.remove(transitions)
+            if not watchers:
+                del self._watchers[task_id]
+
+    def _notify(self, task_id: str):
+        for transitions in self._watchers.get(task_id, ()):
+            transitions.put_nowait(task_id)
+
+    async def _worker(self, number: int):
+        while True:
+            task_id, job, args, success_status, queued_at = await self._queue.get()
+            self._running += 1
+            started_at = time.monotonic()
+            waited = started_at - queued_at
+            self._queue_wait_total += waited
+            self._queue_wait_max = max(self._queue_wait_max, waited)
+            try:
+                await asyncio.to_thread(self.store.mark_started, task_id)
+                self._notify(task_id)
+                result = await job(*args)
+                await asyncio.to_thread(self.store.complete, task_id, success_status, result)
+                self._completed += 1
+                self._notify(task_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job {task_id} failed: {str(e)}")
+                self._failed += 1
+                status_code = getattr(e, "status_code", 500)
+                error = str(getattr(e, "detail", e))
+                try:
+                    await asyncio.to_thread(self.store.fail, task_id, status_code, error)
+                except Exception:
+                    logger.exception(f"Could not record failure of job {task_id}.")
+                self._notify(task_id)
+            finally:
+                run_time = time.monotonic() - started_at
+                self._run_time_total += run_time
+                self._run_time_max = max(self._run_time_max, run_time)
+                self._running -= 1
+                self._queue.task_done()
+
+    async def _purge_loop(self):
+        while True:
+            await asyncio.sleep(self.purge_interval)
+            try:
+                # Keep this process's tasks alive, and fail those of processes that died meanwhile
+                heartbeat = getattr(self.store, "heartbeat", None)
+                if heartbeat is not None:
+                    await asyncio.to_thread(heartbeat)
+                    await asyncio.to_thread(self.store.recover_interrupted)
+                purged = await asyncio.to_thread(self.store.purge_finished, time.time() - self.ttl)
+                if purged:
+                    logger.info(f"Purged {purged} expired tasks.")
+            except Exception:
+                logger.exception("Error purging expired tasks.")
+
+    # ------------------------------------------------------------------ #
+    # Metrics
+    # ------------------------------------------------------------------ #
+
+    def stats(self) -> dict:
+        """Return queue depth, throughput and latency metrics."""
+        started = self._completed + self._failed
+        return {
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "running": self._running,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "waiters": self._waiting,
+            "max_waiters": self.max_waiters,
+            "rejected_waiters": self._rejected_waiters,
+            "queue_wait_avg": self._queue_wait_total / started if started else 0.0,
+            "queue_wait_max": self._queue_wait_max,
+            "run_time_avg": self._run_time_total / started if started else 0.0,
+            "run_time_max": self._run_time_max,
+        }
@@ -0,0 +1,155 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional
+
+# Configure logger for this module
+logger = logging.getLogger("SQLiteJobStore")
+logger.setLevel(logging.INFO)
+
+
+class SQLiteJobStore:
+    """
+    Persistent task table kept in a local SQLite database.
+
+    The store is blocking; JobRunner calls it from worker threads. Several processes (e.g.
+    uvicorn --workers) may share the database file. Each store records the tasks it created
+    under its own owner ID and renews a lease on that owner with heartbeat(). The unfinished
+    tasks of owners whose lease has run out (a process that died) or that closed their store
+    are marked failed, since their work is lost; the tasks of live owners are left alone.
+    """
+
+    def __init__(self, path: str = "tasks.db", owner: Optional[str] = None, lease: float = 300.0):
+        """
+        :param path: SQLite database file, or ":memory:" for a throwaway store.
+        :param owner: ID of this store's tasks; defaults to one unique to this process.
+        :param lease: Seconds an owner counts as alive after its last heartbeat.
+        """
+        self.path = path
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease = lease
+        self._lock = threading.Lock()
+        self._closed = False
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+            """
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_tasks_finished_at ON tasks (finished_at)")
+        # Task tables created before tasks had owners
+        if "owner" not in {row["name"] for row in self._connection.execute("PRAGMA table_info(tasks)")}:
+            self._connection.execute("ALTER TABLE tasks ADD COLUMN owner TEXT")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS task_owners (owner TEXT PRIMARY KEY, heartbeat_at REAL NOT NULL)"
+        )
+        self.heartbeat()
+        self.recover_interrupted()
+
+    def heartbeat(self) -> None:
+        """Renew this store's lease on its tasks."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO task_owners (owner, heartbeat_at) VALUES (?, ?) "
+                "ON CONFLICT (owner) DO UPDATE SET heartbeat_at = excluded.heartbeat_at",
+                (self.owner, time.time())
+            )
+
+    def recover_interrupted(self) -> int:
+        """
+        Mark the unfinished tasks of owners without a live lease as failed, and forget those
+        owners. Tasks without an owner were created before owners were recorded.
+
+        :return: The number of tasks marked failed.
+        """
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute("DELETE FROM task_owners WHERE heartbeat_at < ?", (time.time() - self.lease,))
+                cursor = self._connection.execute(
+                    "UPDATE tasks SET status = 'failed', status_code = 500, error = ?, finished_at = ? "
+                    "WHERE status = 'in_progress' AND (owner IS NULL OR owner NOT IN (SELECT owner FROM task_owners))",
+                    ("Task was interrupted by a service restart.", time.time())
+                )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+        if cursor.rowcount:
+            logger.warning(f"Marked {cursor.rowcount} interrupted tasks as failed.")
+        return cursor.rowcount
+
+    def create(self, task_id: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO tasks (task_id, status, status_code, created_at, owner) "
+                "VALUES (?, 'in_progress', 202, ?, ?)",
+                (task_id, time.time(), self.owner)
+            )
+
+    def mark_started(self, task_id: str) -> None:
+        with self._lock:
+            self._connection.execute("UPDATE tasks SET started_at = ? WHERE task_id = ?", (time.time(), task_id))
+
+    def complete(self, task_id: str, status_code: int, result) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE tasks SET status = 'completed', status_code = ?, result = ?, finished_at = ? WHERE task_id = ?",
+                (status_code, json.dumps(result), time.time(), task_id)
+            )
+
+    def fail(self, task_id: str, status_code: int, error: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE tasks SET status = 'failed', status_code = ?, error = ?, finished_at = ? WHERE task_id = ?",
+                (status_code, error, time.time(), task_id)
+            )
+
+    def get(self, task_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        if row is None:
+            return None
+        task = dict(row)
+        task["result"] = json.loads(task["result"]) if task["result"] is not None else None
+        return task
+
+    def purge_finished(self, older_than: float) -> int:
+        """Delete finished tasks whose finished_at is before the older_than timestamp."""
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM tasks WHERE finished_at IS NOT NULL AND finished_at < ?", (older_than,)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Fail this store's unfinished tasks, which no one will run now, give up its lease and close."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._connection.execute(
+                "UPDATE tasks SET status = 'failed', status_code = 500, error = ?, finished_at = ? "
+                "WHERE status = 'in_progress' AND owner = ?",
+                ("Task was interrupted by a service shutdown.", time.time(), self.owner)
+            )
+            self._connection.execute("DELETE FROM task_owners WHERE owner = ?", (self.owner,))
+            self._connection.close()
@@ -1,22 +1,168 @@
 #
-# Placeholder for implementing the service factory and service locator patterns.
+# Service factory and service locator.
 #
 # https://medium.com/javarevisited/service-locator-factory-pattern-7bb9e835b709
 #
+import contextvars
+import inspect
+import logging
+import threading
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 
-# TODO -- Implement the framework.
-#
+# Configure logger for this module
+logger = logging.getLogger("BaseServiceFactory")
+logger.setLevel(logging.INFO)
+
+# Service lifetimes
+SINGLETON = "singleton"     # One instance per process, created on first use
+SCOPED = "scoped"           # One instance per scope (see BaseServiceFactory.scope), e.g. per request or job
+TRANSIENT = "transient"     # A new instance on every get_service()
+
+# Scoped instances of the current scope, {service name: instance}; None outside a scope
+_scope = contextvars.ContextVar("service_scope", default=None)
+
+
+class ServiceProxy:
+    """
+    Stands for a registered service, resolving it on each attribute access. Modules can bind
+    a proxy at import time without creating the service, which then happens at startup or on
+    first use.
+    """
+
+    __slots__ = ("_factory", "_name")
+
+    def __init__(self, factory, name: str):
+        self._factory = factory
+        self._name = name
+
+    def __getattr__(self, attribute):
+        return getattr(self._factory.get_service(self._name), attribute)
+
+    def __repr__(self):
+        return f"ServiceProxy({self._name!r})"
 
 
 class BaseServiceFactory(ABC):
+    """
+    Registry of the services of an application.
+
+    Subclasses build services in create_service() and may give a service name a lifetime in
+    ``lifetimes``; names not listed are singletons. get_service() hands out the singleton or
+    scoped instance, creating it on first use.
+
+    startup() creates the services listed in ``startup_services`` and calls their start()
+    method, if any, e.g. to open pooled connections before the first request. shutdown()
+    stops the singletons in the reverse order of their creation, through stop() or else
+    close() if they have either, and forgets them.
+    """
+
+    lifetimes = {}
+    startup_services = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Each factory keeps its own instances
+        cls._instances = {}
+        cls._order = []     # Singleton names in the order their creation completed
+        cls._lock = threading.RLock()   # Reentrant: creating a service may get the services it depends on
 
     def __init__(self):
         pass
 
     @classmethod
     @abstractmethod
-    def get_service(cls, service_name):
+    def create_service(cls, service_name):
+        """Build a new instance of the named service."""
         raise NotImplementedError()
 
+    @classmethod
+    def get_service(cls, service_name):
+        """
+        Return the instance of the named service for its lifetime.
+
+        :raises RuntimeError: For a scoped service requested outside a scope.
+        """
+        lifetime = cls.lifetimes.get(service_name, SINGLETON)
+        if lifetime == TRANSIENT:
+            return cls.create_service(service_name)
+        if lifetime == SCOPED:
+            instances = _scope.get()
+            if instances is None:
+                raise RuntimeError(f"Scoped service {service_name} requested outside a service scope.")
+            if service_name not in instances:
+                instances[service_name] = cls.create_service(service_name)
+            return instances[service_name]
+
+        instance = cls._instances.get(service_name)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(service_name)
+                if instance is None:
+                    instance = cls.create_service(service_name)
+                    cls._instances[service_name] = instance
+                    cls._order.append(service_name)
+        return instance
+
+    @classmethod
+    def lazy(cls, service_name) -> ServiceProxy:
+        """Return a proxy that resolves the named service when it is first used."""
+        return ServiceProxy(cls, service_name)
+
+    @classmethod
+    @asynccontextmanager
+    async def scope(cls):
+        """
+        Open a scope for scoped services; the instances created in it are stopped when it exits.
+        Scopes are per asyncio task and do not nest.
+        """
+        instances = {}
+        token = _scope.set(instances)
+        try:
+            yield
+        finally:
+            _scope.reset(token)
+            for name, instance in reversed(list(instances.items())):
+                await cls._stop(name, instance)
+
+    @classmethod
+    async def startup(cls) -> None:
+        """Create the startup services and start them, in order."""
+        for service_name in cls.startup_services:
+            instance = cls.get_service(service_name)
+            start = getattr(instance, "start", None)
+            if start is not None:
+                result = start()
+                if inspect.isawaitable(result):
+                    await result
+            logger.info(f"Started service: {service_name}")
 
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Stop every singleton, the most recently created first, and forget them."""
+        with cls._lock:
+            instances = [(name, cls._instances[name]) for name in reversed(cls._order)]
+            cls._instances.clear()
+            cls._order.clear()
+        for name, instance in instances:
+            await cls._stop(name, instance)
+
+    @staticmethod
+    async def _stop(name: str, instance) -> None:
+        stop = getattr(instance, "stop", None) or getattr(instance, "close", None)
+        if stop is None:
+            return
+        try:
+            result = stop()
+            if inspect.isawaitable(result):
+                await result
+            logger.info(f"Stopped service: {name}")
+        except Exception as e:
+            logger.warning(f"Error stopping service {name}: {str(e)}")
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget every singleton without stopping it, e.g. between tests."""
+        with cls._lock:
+            cls._instances.clear()
+            cls._order.clear()
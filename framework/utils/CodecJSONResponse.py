@@ -0,0 +1,15 @@
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+from .JSONCodec import get_codec
+
+
+class CodecJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered by the process-wide JSONCodec straight to bytes. RawJSON values in the
+    content (e.g. JSON columns as read from the database) are spliced in without re-encoding.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return get_codec().dumps(content)
@@ -0,0 +1,152 @@
+import json
+import logging
+import os
+import re
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Union
+
+# Configure logger for this module
+logger = logging.getLogger("JSONCodec")
+logger.setLevel(logging.INFO)
+
+
+class RawJSON:
+    """
+    A value that is already JSON-encoded, e.g. a JSON column read from MySQL. Codecs splice it
+    into their output as-is instead of decoding and re-encoding it, so it must be valid JSON.
+    """
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, encoded: Union[str, bytes]):
+        self.encoded = encoded.decode("utf-8") if isinstance(encoded, (bytes, bytearray)) else encoded
+
+    def __repr__(self):
+        return f"RawJSON({self.encoded!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, RawJSON) and other.encoded == self.encoded
+
+
+class JSONCodec(ABC):
+    """
+    Abstract JSON encoder/decoder. Output is compact UTF-8; RawJSON values are spliced in
+    verbatim and other values the backend cannot serialize are encoded as str(value).
+    """
+
+    name = "abstract"
+
+    def __init__(self):
+        # Placeholder for RawJSON values, for backends that cannot emit raw fragments themselves.
+        nonce = uuid.uuid4().hex
+        self._marker = f"\x00rawjson-{nonce}:"
+        # The NUL character is always escaped by the encoder, so the marker cannot occur in real text.
+        self._marker_pattern = re.compile(rb'"\\u0000rawjson-' + nonce.encode("ascii") + rb':(\d+)"')
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """
+        Encode value as JSON bytes.
+        """
+        raise NotImplementedError('Abstract method dumps()')
+
+    @abstractmethod
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """
+        Decode JSON text.
+        """
+        raise NotImplementedError('Abstract method loads()')
+
+    def dumps_str(self, value: Any) -> str:
+        """Encode value as a JSON string, e.g. for a JSON column."""
+        return self.dumps(value).decode("utf-8")
+
+    def _placeholder_default(self, fragments: list):
+        def default(value):
+            if isinstance(value, RawJSON):
+                fragments.append(value.encoded.encode("utf-8"))
+                return f"{self._marker}{len(fragments) - 1}"
+            return str(value)
+        return default
+
+    def _splice(self, encoded: bytes, fragments: list) -> bytes:
+        if not fragments:
+            return encoded
+        return self._marker_pattern.sub(lambda match: fragments[int(match.group(1))], encoded)
+
+
+class StdlibJSONCodec(JSONCodec):
+    """Codec on the standard library json module. Always available."""
+
+    name = "stdlib"
+
+    def dumps(self, value: Any) -> bytes:
+        fragments = []
+        encoded = json.dumps(value, default=self._placeholder_default(fragments), ensure_ascii=False,
+                             separators=(",", ":")).encode("utf-8")
+        return self._splice(encoded, fragments)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonJSONCodec(JSONCodec):
+    """
+    Codec on orjson, which encodes several times faster than the json module and produces
+    bytes directly. orjson 3.9+ splices RawJSON natively through orjson.Fragment.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        super().__init__()
+        import orjson  # Optional dependency; get_codec() falls back to the stdlib codec without it
+        self._orjson = orjson
+        self._fragment = getattr(orjson, "Fragment", None)
+
+    def dumps(self, value: Any) -> bytes:
+        if self._fragment is not None:
+            return self._orjson.dumps(value, default=self._fragment_default)
+        fragments = []
+        encoded = self._orjson.dumps(value, default=self._placeholder_default(fragments))
+        return self._splice(encoded, fragments)
+
+    def _fragment_default(self, value):
+        if isinstance(value, RawJSON):
+            return self._fragment(value.encoded)
+        return str(value)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._orjson.loads(data)
+
+
+_codec = None
+
+
+def get_codec() -> JSONCodec:
+    """
+    Return the process-wide codec. JSON_CODEC selects it: orjson, stdlib, or auto (default),
+    which uses orjson when it is installed and the standard library otherwise.
+    """
+    global _codec
+    if _codec is None:
+        choice = os.getenv("JSON_CODEC", "auto")
+        if choice not in ("auto", "orjson", "stdlib"):
+            raise ValueError(f"Unsupported JSON_CODEC {choice}.")
+        if choice != "stdlib":
+            try:
+                _codec = OrjsonJSONCodec()
+            except ImportError:
+                if choice == "orjson":
+                    raise
+        if _codec is None:
+            _codec = StdlibJSONCodec()
+        logger.info(f"Using the {_codec.name} JSON codec.")
+    return _codec
+
+
+def set_codec(codec: JSONCodec) -> None:
+    """Replace the process-wide codec, e.g. in tests."""
+    global _codec
+    _codec = codec
@@ -0,0 +1,187 @@
+import atexit
+import contextvars
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+import zlib
+from typing import Optional
+from framework.services.metrics.Metrics import registry
+from framework.utils.JSONCodec import get_codec
+
+# The trace ID of the request being handled. AsyncDataService carries it over to its worker threads.
+trace_id_var = contextvars.ContextVar("trace_id", default=None)
+
+DROPPED = registry.counter("log_records_dropped_total", "Log records dropped because the log queue was full.")
+
+# Attributes every LogRecord has; anything else on a record came from extra= and is logged as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "trace_id"}
+
+# Values whose formatting does not depend on when it happens, so it can be left to the listener thread
+_IMMUTABLE = (str, int, float, bool, type(None))
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class TraceIdFilter(logging.Filter):
+    """Stamp records with the trace ID of the current request, while still on its thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "trace_id"):
+            record.trace_id = trace_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fraction of the records of each level, e.g. {logging.INFO: 0.1} keeps one INFO
+    record in ten; levels without a rate are kept in full. Records are sampled by trace ID,
+    so a sampled request keeps all its records and a dropped one loses them all.
+    """
+
+    def __init__(self, rates: dict):
+        super().__init__()
+        # Rates as thresholds on a 32-bit hash
+        self.thresholds = {level: int(rate * 0xFFFFFFFF) for level, rate in rates.items() if rate < 1}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        threshold = self.thresholds.get(record.levelno)
+        if threshold is None:
+            return True
+        trace_id = getattr(record, "trace_id", None)
+        sample = zlib.crc32(trace_id.encode()) if trace_id else random.getrandbits(32)
+        return sample < threshold
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line: time, level, logger, message, trace_id and
+    any fields passed with extra=.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            entry["trace_id"] = trace_id
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES:
+                entry[name] = value if isinstance(value, _IMMUTABLE) else str(value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return get_codec().dumps_str(entry)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread and never blocks.
+
+    The standard QueueHandler formats every record before queueing it. This one only merges
+    the message with its arguments up front when an argument could change before the
+    listener gets to it (e.g. a dict); otherwise the record is queued as is. When the queue
+    is full, the record is dropped and counted in log_records_dropped_total.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        mutable_args = args and not all(
+            isinstance(arg, _IMMUTABLE) for arg in (args.values() if isinstance(args, dict) else args)
+        )
+        if not mutable_args and not record.exc_info:
+            return record
+        # Changes go to a copy, so that other handlers of the record still see the original
+        record = copy.copy(record)
+        if mutable_args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            # The traceback holds the frames of the failed call; render it before they change
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def __init__(self, max_size: int):
+        # SimpleQueue is implemented in C and much cheaper to put to than queue.Queue; the
+        # bound is enforced here instead, approximately when several threads log at once.
+        super().__init__(queue.SimpleQueue())
+        self.max_size = max_size
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.queue.qsize() >= self.max_size:
+            DROPPED.inc()
+            return
+        self.queue.put_nowait(record)
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(level: str = None, log_format: str = None, sample_rates: dict = None,
+                      queue_size: int = None, stream=None) -> None:
+    """
+    Send the records of every logger through a queue to a listener thread that formats and
+    writes them, so that logging never waits for the stream on the event loop.
+
+    Arguments default to the environment: LOG_LEVEL (INFO), LOG_FORMAT (json or text; json),
+    LOG_SAMPLE_<LEVEL> (fraction of the records of that level to keep, e.g. LOG_SAMPLE_INFO=0.1;
+    1 by default) and LOG_QUEUE_SIZE (records buffered before new ones are dropped; 10000).
+    Calling it again replaces the previous configuration. Records no longer carry the caller's
+    file name, line number and process.
+    """
+    global _listener
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    log_format = log_format or os.getenv("LOG_FORMAT", "json")
+    if log_format not in ("json", "text"):
+        raise ValueError(f"Unsupported LOG_FORMAT {log_format}.")
+    if sample_rates is None:
+        sample_rates = {
+            logging.getLevelName(name): float(os.getenv(f"LOG_SAMPLE_{name}"))
+            for name in ("DEBUG", "INFO", "WARNING") if os.getenv(f"LOG_SAMPLE_{name}")
+        }
+    queue_size = queue_size if queue_size is not None else int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+    stop_logging()
+    # Neither format shows the caller's file and line or the process, so skip collecting them
+    # for every record (see "Optimization" in the logging HOWTO).
+    logging._srcfile = None
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JSONFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    handler = LazyQueueHandler(queue_size)
+    # Filters run on the thread that logs: stamp the trace ID there, then sample before queueing
+    handler.addFilter(TraceIdFilter())
+    if sample_rates:
+        handler.addFilter(SamplingFilter(sample_rates))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    _listener = logging.handlers.QueueListener(handler.queue, output)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Write out the queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
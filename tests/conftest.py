@@ -0,0 +1,76 @@
+import asyncio
+import os
+
+import pytest
+from fastapi import FastAPI
+
+from app.resources.conversation_resource import ConversationResource
+from app.routers import conversations, diagnostics
+from app.services.conversation_service import ConversationService
+from app.services.service_factory import ServiceFactory
+from benchmarks.standin_db import StandInDataService, create_database
+from framework.services.cache.LRUCache import LRUCache
+from framework.services.events.EventHub import EventHub
+from framework.services.events.InMemoryBroker import InMemoryBroker
+from framework.utils.CodecJSONResponse import CodecJSONResponse
+
+
+@pytest.fixture(autouse=True)
+def fresh_services():
+    """Services are process-wide singletons; give every test its own, e.g. an empty conversation cache."""
+    ServiceFactory.reset()
+    yield
+    ServiceFactory.reset()
+
+
+@pytest.fixture
+def data_service(tmp_path):
+    """MySQLRDBDataService over the SQLite stand-in connection, on an empty database."""
+    path = os.path.join(tmp_path, "p1_database.db")
+    create_database(path)
+    service = StandInDataService({"path": path, "pool_min_size": 0, "pool_max_size": 2})
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def conversation_service(data_service):
+    """ConversationService over the stand-in data service, with its own cache and event hub."""
+    resource = ConversationResource(data_service=data_service, cache=LRUCache())
+    yield ConversationService(resource=resource, events=EventHub(InMemoryBroker()))
+    resource.data_service.shutdown()
+
+
+@pytest.fixture
+def api(conversation_service, monkeypatch):
+    """
+    Call the conversation and diagnostics routes, backed by conversation_service, through ASGI:
+    ``status, headers, body = await api("POST", "/conversations/1/messages", b"[...]")``.
+    """
+    monkeypatch.setattr(conversations, "conversation_service", conversation_service)
+    monkeypatch.setattr(diagnostics, "conversation_service", conversation_service)
+    app = FastAPI(default_response_class=CodecJSONResponse)
+    app.include_router(conversations.router)
+    app.include_router(diagnostics.router)
+
+    async def call(method: str, url: str, body: bytes = b"", headers: dict = None):
+        path, _, query = url.partition("?")
+        scope = {"type": "http", "method": method, "path": path, "raw_path": path.encode(),
+                 "query_string": query.encode(), "root_path": "", "scheme": "http", "server": ("test", 80),
+                 "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]}
+        messages, requests = [], [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await asyncio.Event().wait()  # The client stays connected until the response is complete
+
+        async def send(message):
+            messages.append(message)
+
+        await app(scope, receive, send)
+        start = next(message for message in messages if message["type"] == "http.response.start")
+        return (start["status"], {name.decode(): value.decode() for name, value in start["headers"]},
+                b"".join(message.get("body", b"") for message in messages if message["type"] == "http.response.body"))
+
+    return call
@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+JSON = {"content-type": "application/json"}
+
+
+def message(text: str) -> dict:
+    return {"sender": "a", "text": text, "timestamp": "t"}
+
+
+def test_appending_returns_201_stores_the_messages_and_bumps_the_version(api, conversation_service):
+    async def scenario():
+        created = await conversation_service.create_conversation(
+            {"name": "n", "participants": ["a"], "isGroup": False, "messages": [message("first")]})
+        conversation_id = created["convo_id"]
+        version = await conversation_service.resource.get_conversation_version(conversation_id)
+        _, headers, _ = await api("GET", f"/conversations/{conversation_id}")
+
+        single = await api("POST", f"/conversations/{conversation_id}/messages",
+                           json.dumps(message("second")).encode(), JSON)
+        several = await api("POST", f"/conversations/{conversation_id}/messages",
+                            json.dumps([message("third"), message("fourth")]).encode(), JSON)
+        stored = await conversation_service.resource.get_conversation(conversation_id)
+        _, new_headers, _ = await api("GET", f"/conversations/{conversation_id}")
+        new_version = await conversation_service.resource.get_conversation_version(conversation_id)
+        return (single, several, json.loads(stored["messages"]), (version, new_version),
+                (headers["etag"], new_headers["etag"]))
+
+    single, several, stored, versions, etags = asyncio.run(scenario())
+    assert single[0] == 201 and several[0] == 201
+    first_ids, more_ids = json.loads(single[2])["message_ids"], json.loads(several[2])["message_ids"]
+    assert len(first_ids) == 1 and len(more_ids) == 2 and first_ids[0] < more_ids[0] < more_ids[1]
+    assert [m["text"] for m in stored] == ["first", "second", "third", "fourth"]
+    assert versions[1] > versions[0] and etags[0] != etags[1]
+
+
+def test_appending_to_a_missing_conversation_returns_404(api):
+    status, _, body = asyncio.run(api("POST", "/conversations/42/messages",
+                                      json.dumps(message("lost")).encode(), JSON))
+    assert status == 404
+    assert "not found" in json.loads(body)["detail"]
+
+
+def test_appending_moves_a_legacy_message_column_into_the_table_first(api, conversation_service, data_service):
+    legacy = json.dumps([message("legacy 1"), {"sender": "a", "text": "legacy 2"}])
+    conversation_id = data_service.insert("p1_database", "conversations",
+                                          {"name": "n", "participants": '["a"]', "isGroup": False, "messages": legacy})
+
+    async def scenario():
+        before = await conversation_service.resource.get_conversation(conversation_id)
+        status, _, _ = await api("POST", f"/conversations/{conversation_id}/messages",
+                                 json.dumps(message("new")).encode(), JSON)
+        _, _, page = await api("GET", f"/conversations/{conversation_id}/messages")
+        return status, json.loads(before["messages"]), json.loads(page)["detail"]
+
+    status, before, after = asyncio.run(scenario())
+    assert status == 201 and [m["text"] for m in before] == ["legacy 1", "legacy 2"]
+    assert [m["text"] for m in after] == ["legacy 1", "legacy 2", "new"]
+    assert after[1]["timestamp"] == "" and after[0]["message_id"] < after[1]["message_id"] < after[2]["message_id"]
+    column = data_service.fetch_one("p1_database", "conversations", "convo_id", conversation_id, columns=["messages"])
+    assert column["messages"] is None
@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+from app.routers import conversations
+
+
+def seed(conversation_service, count: int = 3):
+    items = [{"name": f"c{i}", "participants": ["a"], "isGroup": False,
+              "messages": [{"sender": "a", "text": f"m{i}", "timestamp": "t"}]} for i in range(1, count + 1)]
+    asyncio.run(conversation_service.create_conversations_bulk(items))
+
+
+def test_fetch_many_returns_only_existing_rows(data_service, conversation_service):
+    seed(conversation_service)
+    rows = data_service.fetch_many("p1_database", "conversations", "convo_id", [3, 1, 99], order_by="convo_id")
+    assert [row["convo_id"] for row in rows] == [1, 3]
+    assert data_service.fetch_many("p1_database", "conversations", "convo_id", []) == []
+
+
+def test_batch_get_keeps_the_requested_order_and_reports_missing_ids(api, conversation_service):
+    seed(conversation_service)
+    status, _, body = asyncio.run(api("GET", "/conversations:batch?ids=3,1,99,2,1"))
+    assert status == 200
+    body = json.loads(body)
+    assert [conversation["convo_id"] for conversation in body["detail"]] == [3, 1, 2]
+    assert body["missing"] == [99]
+    assert body["detail"][0]["messages"][0]["text"] == "m3"
+
+
+def test_batch_post_keeps_the_requested_order_and_applies_the_view(api, conversation_service):
+    seed(conversation_service)
+    request = json.dumps({"ids": [2, 42, 1], "view": "summary"}).encode()
+    status, _, body = asyncio.run(api("POST", "/conversations:batch", request,
+                                      {"content-type": "application/json"}))
+    assert status == 200
+    body = json.loads(body)
+    assert [conversation["convo_id"] for conversation in body["detail"]] == [2, 1]
+    assert body["missing"] == [42]
+    assert all("messages" not in conversation for conversation in body["detail"])
+
+
+def test_batch_rejects_too_many_or_malformed_ids(api, conversation_service, monkeypatch):
+    seed(conversation_service)
+    monkeypatch.setattr(conversations, "BATCH_MAX_IDS", 2)
+
+    async def scenario():
+        return [
+            (await api("GET", "/conversations:batch?ids=1,2"))[0],
+            (await api("GET", "/conversations:batch?ids=1,2,3"))[0],
+            (await api("POST", "/conversations:batch", b'{"ids": [1, 2, 3]}',
+                       {"content-type": "application/json"}))[0],
+            (await api("GET", "/conversations:batch?ids=1,x"))[0],
+            (await api("POST", "/conversations:batch", b'{"ids": []}', {"content-type": "application/json"}))[0],
+        ]
+
+    assert asyncio.run(scenario()) == [200, 400, 400, 400, 400]
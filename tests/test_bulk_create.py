@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+from app.routers import conversations
+from framework.services.data_access.MySQLRDBDataService import MySQLRDBDataService
+
+
+def conversation(name: str, messages: int = 0) -> dict:
+    return {"name": name, "participants": ["a", "b"], "isGroup": False,
+            "messages": [{"sender": "a", "text": f"{name} {i}", "timestamp": "t"} for i in range(messages)]}
+
+
+def test_json_array_creates_every_conversation_in_input_order(api, conversation_service):
+    body = json.dumps([conversation("first", 2), conversation("second"), conversation("third", 1)]).encode()
+
+    async def scenario():
+        status, _, response = await api("POST", "/conversations/bulk", body, {"Content-Type": "application/json"})
+        stored = {i: await conversation_service.resource.get_conversation(i) for i in (1, 2, 3)}
+        return status, json.loads(response), stored
+
+    status, response, stored = asyncio.run(scenario())
+    assert status == 201 and response["created"] == 3 and response["failed"] == 0
+    assert [(result["index"], result["convo_id"]) for result in response["results"]] == [(0, 1), (1, 2), (2, 3)]
+    assert [stored[i]["name"] for i in (1, 2, 3)] == ["first", "second", "third"]
+    assert [m["text"] for m in json.loads(stored[1]["messages"])] == ["first 0", "first 1"]
+    assert [m["text"] for m in json.loads(stored[3]["messages"])] == ["third 0"]
+
+
+def test_ndjson_reports_invalid_lines_with_207(api):
+    lines = [json.dumps(conversation("first")), "{not json", json.dumps({"name": "no participants"}),
+             "", json.dumps(conversation("last"))]
+
+    async def scenario():
+        return await api("POST", "/conversations/bulk", "\n".join(lines).encode(),
+                         {"Content-Type": "application/x-ndjson"})
+
+    status, _, response = asyncio.run(scenario())
+    response = json.loads(response)
+    assert status == 207 and response["created"] == 2 and response["failed"] == 2
+    results = response["results"]
+    assert [result["status"] for result in results] == [201, 400, 400, 201]
+    assert results[0]["convo_id"] == 1 and results[3]["convo_id"] == 2
+    assert "Line 2" in results[1]["error"] and "participants" in results[2]["error"]
+
+
+def test_malformed_and_oversized_bodies_are_rejected(api, monkeypatch):
+    monkeypatch.setattr(conversations, "BULK_MAX_ITEMS", 2)
+
+    async def scenario():
+        return [(await api("POST", "/conversations/bulk", body))[0]
+                for body in (b"{", b"[]", b'{"conversations": 1}', json.dumps([conversation("c")] * 3).encode())]
+
+    assert asyncio.run(scenario()) == [400, 400, 400, 413]
+
+
+class AutoIncrementConnection:
+    """Stand-in MySQL connection that hands out auto-increment IDs as InnoDB would."""
+
+    def __init__(self, lock_mode: int, increment: int = 1):
+        self.lock_mode = lock_mode
+        self.increment = increment
+        self.next_id = 100
+        self.inserts = []
+        self.lastrowid = None
+        self._row = None
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        if sql.startswith("SELECT @@innodb_autoinc_lock_mode"):
+            self._row = {"lock_mode": self.lock_mode, "increment": self.increment}
+            return 1
+        rows = sql.count("(%s")
+        self.inserts.append(rows)
+        self.lastrowid = self.next_id
+        self.next_id += rows * self.increment + 7  # Another session's insert takes the IDs in between
+        return rows
+
+    def fetchone(self):
+        return self._row
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+
+class AutoIncrementDataService(MySQLRDBDataService):
+    def __init__(self, connection):
+        self.connection = connection
+        super().__init__({"pool_min_size": 0, "pool_max_size": 1})
+
+    def _get_connection(self):
+        return self.connection
+
+
+def test_insert_many_only_infers_ids_when_innodb_spaces_them_evenly():
+    rows = [{"name": str(i)} for i in range(3)]
+
+    consecutive = AutoIncrementConnection(lock_mode=1, increment=2)
+    assert AutoIncrementDataService(consecutive).insert_many("db", "t", rows) == [100, 102, 104]
+    assert consecutive.inserts == [3]
+
+    interleaved = AutoIncrementConnection(lock_mode=2)
+    data_service = AutoIncrementDataService(interleaved)
+    assert data_service.insert_many("db", "t", rows) == [100, 108, 116]
+    assert interleaved.inserts == [1, 1, 1]
+    assert data_service.insert_many("db", "t", rows, return_ids=False) is None
+    assert interleaved.inserts == [1, 1, 1, 3]
@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+
+from framework.services.data_access.BaseDataService import DataServiceError
+from framework.services.data_access.ConnectionPool import ConnectionPool, PoolClosedError, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_reuses_connections_and_bounds_size():
+    created = []
+
+    def connect():
+        created.append(FakeConnection())
+        return created[-1]
+
+    pool = ConnectionPool(connect, min_size=1, max_size=2, timeout=0.1)
+    pool.warm()
+    for _ in range(10):
+        with pool.connection():
+            pass
+    assert len(created) == 1
+
+    first, second = pool.acquire(), pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    threading.Timer(0.02, pool.release, args=(first,)).start()
+    assert pool.acquire(timeout=1) is first
+    stats = pool.stats()
+    assert stats["size"] == 2 and stats["waits"] >= 1 and stats["timeouts"] == 1
+
+
+def test_pool_recycles_stale_and_unhealthy_connections():
+    created = []
+
+    def connect():
+        created.append(FakeConnection())
+        return created[-1]
+
+    def validate(connection):
+        if connection is created[0]:
+            raise Exception("gone away")
+
+    pool = ConnectionPool(connect, validate=validate, min_size=0, max_size=1, health_check_interval=0)
+    with pool.connection():
+        pass
+    time.sleep(0.01)
+    with pool.connection() as connection:
+        assert connection is created[1]
+    assert created[0].closed
+    stats = pool.stats()
+    assert stats["health_check_failures"] == 1 and stats["checkouts"] == 2
+
+
+def test_closed_pools_refuse_checkouts():
+    pool = ConnectionPool(FakeConnection, min_size=1, max_size=1)
+    pool.warm()
+    pool.close()
+    with pytest.raises(PoolClosedError) as raised:
+        pool.acquire()
+    assert isinstance(raised.value, DataServiceError) and pool.stats()["checkouts"] == 0
@@ -0,0 +1,177 @@
+import asyncio
+import threading
+import time
+
+from app.resources.conversation_resource import ConversationResource
+from framework.services.data_access.ReplicatedDataService import prefer_primary
+from framework.services.cache.LRUCache import LRUCache
+from framework.services.cache import SharedCache as shared_cache
+from framework.services.cache.SharedCache import SharedCache, InMemoryKeyValueStore
+
+
+class RecordingDataService:
+    """Stand-in data service that counts conversation reads."""
+
+    context = {}
+
+    def __init__(self):
+        self.reads = 0
+        self.columns = []
+        self.message_reads = 0
+        self.primary_reads = 0
+
+    def fetch_one(self, database_name, table, key_field, key_value, columns=None):
+        self.reads += 1
+        self.columns.append(columns)
+        self.primary_reads += prefer_primary.get()
+        row = {"convo_id": key_value, "name": f"read {self.reads}", "participants": "[]", "messages": None, "isGroup": 0,
+               "version": self.reads}
+        return row if columns is None else {column: row[column] for column in columns}
+
+    def fetch_many(self, database_name, table, key_field, key_values, order_by=None, columns=None):
+        self.message_reads += 1
+        return []
+
+    def delete(self, database_name, table, key_field, key_value):
+        pass
+
+
+def test_lru_cache_evicts_least_recently_used_and_expires():
+    async def scenario():
+        cache = LRUCache(max_entries=2, ttl=0.05)
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        assert await cache.get("a") == 1
+        await cache.set("c", 3)
+        assert await cache.get("b") is None
+        time.sleep(0.06)
+        assert await cache.get("a") is None
+        return cache.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["evictions"] == 1 and stats["expirations"] == 1 and stats["hits"] == 1
+
+
+def test_shared_cache_keeps_sub_second_ttls():
+    async def scenario():
+        cache = SharedCache(InMemoryKeyValueStore(), ttl=0.05)
+        await cache.set("a", 1)
+        await cache.set("b", 2, ttl=0.0001)
+        assert await cache.get("a") == 1
+        time.sleep(0.06)
+        assert await cache.get("a") is None
+        return cache.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["sets"] == 2 and stats["hits"] == 1 and stats["errors"] == 0
+
+
+def test_shared_cache_clears_only_its_own_namespace(monkeypatch):
+    monkeypatch.setattr(shared_cache, "CLEAR_BATCH_SIZE", 2)  # Several DEL batches, and a partial last one
+    store = InMemoryKeyValueStore()
+    conversations, other = SharedCache(store, namespace="conversations"), SharedCache(store, namespace="other")
+
+    async def scenario():
+        for key in "abcde":
+            await conversations.set(key, key)
+        await other.set("a", 1)
+        await conversations.clear()
+        return [await conversations.get(key) for key in "abcde"], await other.get("a")
+
+    assert asyncio.run(scenario()) == ([None] * 5, 1)
+    assert conversations.stats()["errors"] == 0
+
+
+def test_resource_reads_through_cache_and_invalidates_on_write():
+    for cache in (LRUCache(), SharedCache(InMemoryKeyValueStore())):
+        data_service = RecordingDataService()
+        resource = ConversationResource(data_service=data_service, cache=cache)
+
+        async def scenario():
+            first = await resource.get_conversation(7)
+            first["name"] = "mutated by caller"
+            assert (await resource.get_conversation(7))["name"] == "read 1"
+            await resource.delete_conversation(7)
+            assert (await resource.get_conversation(7))["name"] == "read 2"
+
+        asyncio.run(scenario())
+        assert data_service.reads == 2
+        stats = resource.cache_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 2 and stats["invalidations"] == 1
+
+
+def test_summary_reads_push_columns_down_and_skip_messages():
+    data_service = RecordingDataService()
+    resource = ConversationResource(data_service=data_service, cache=LRUCache())
+
+    async def scenario():
+        summary = await resource.get_conversation(7, ["name", "participants", "isGroup"])
+        assert set(summary) == {"convo_id", "version", "name", "participants", "isGroup"}
+        full = await resource.get_conversation(7)
+        assert "messages" in full
+        # Served from the cached full row, projected in memory.
+        assert await resource.get_conversation(7, ["name"]) == {"convo_id": 7, "version": 2, "name": "read 2"}
+
+    asyncio.run(scenario())
+    assert data_service.columns == [["convo_id", "version", "name", "participants", "isGroup"], None]
+    assert data_service.message_reads == 1
+
+
+class BlockingDataService(RecordingDataService):
+    """Stand-in data service whose first read waits for release, as a read overtaken by a write."""
+
+    def __init__(self):
+        super().__init__()
+        self.reading = threading.Event()
+        self.release = threading.Event()
+
+    def fetch_one(self, *args, **kwargs):
+        row = super().fetch_one(*args, **kwargs)
+        if self.reads == 1:
+            self.reading.set()
+            self.release.wait(5)
+        return row
+
+
+def test_writes_fence_out_fills_by_earlier_reads():
+    data_service = BlockingDataService()
+    resource = ConversationResource(data_service=data_service, cache=LRUCache())
+
+    async def scenario():
+        read = asyncio.create_task(resource.get_conversation(7))
+        await asyncio.to_thread(data_service.reading.wait, 5)
+        await resource.delete_conversation(7)  # Invalidates while the read holds the old row
+        data_service.release.set()
+        assert (await read)["name"] == "read 1"
+        assert await resource.cache.get("conversation:7") is None
+        assert (await resource.get_conversation(7))["name"] == "read 2"
+        assert (await resource.get_conversation(7))["name"] == "read 2"  # A read after the write fills
+
+    asyncio.run(scenario())
+
+
+def test_rows_written_within_the_replica_lag_are_not_cached():
+    data_service = RecordingDataService()
+    resource = ConversationResource(data_service=data_service, cache=LRUCache(), replica_lag=60)
+
+    async def scenario():
+        await resource.delete_conversation(7)
+        await resource.get_conversation(7)
+        await resource.get_conversation(7)
+        await resource.get_conversation(8)
+        await resource.get_conversation(8)
+
+    asyncio.run(scenario())
+    assert data_service.reads == 3
+
+
+def test_versions_for_conditional_requests_come_from_the_primary():
+    data_service = RecordingDataService()
+    resource = ConversationResource(data_service=data_service, cache=LRUCache())
+
+    async def scenario():
+        await resource.get_conversation(7)  # Caches version 1
+        return await resource.get_conversation_version(7), prefer_primary.get()
+
+    assert asyncio.run(scenario()) == (2, False)
+    assert data_service.primary_reads == 1
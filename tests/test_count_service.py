@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.count_service import CountService
+
+
+class Table:
+    """Stand-in row counts: rows for COUNT(*), estimate for the table statistics."""
+
+    def __init__(self, rows: int = 10, estimate: int = 9):
+        self.rows = rows
+        self.estimate = estimate
+        self.exact_counts = 0
+
+    async def count_all(self):
+        self.exact_counts += 1
+        await asyncio.sleep(0.01)
+        return self.rows
+
+    async def estimate_count(self):
+        return self.estimate
+
+
+def service(table: Table, **kwargs) -> CountService:
+    return CountService(exact_count=table.count_all, estimate_count=table.estimate_count, **kwargs)
+
+
+def test_each_strategy_reports_where_the_total_came_from():
+    table = Table()
+    counts = service(table)
+
+    async def scenario():
+        results = [await counts.count("estimate"), await counts.count("exact")]
+        table.rows = 11  # Changed by another instance; only exact sees it before the TTL
+        results += [await counts.count("cached"), await counts.count("counter"), await counts.count("exact")]
+        return results
+
+    assert asyncio.run(scenario()) == [(9, "estimate"), (10, "exact"), (10, "cached"), (10, "counter"), (11, "exact")]
+    assert table.exact_counts == 2
+
+
+def test_stale_counts_are_refreshed_once_for_concurrent_callers():
+    table = Table()
+    counts = service(table, ttl=30, resync_interval=30)
+
+    async def scenario():
+        cached = await asyncio.gather(*[counts.count("cached") for _ in range(10)])
+        counts.invalidate()
+        counter = await asyncio.gather(*[counts.count("counter") for _ in range(10)])
+        return cached, counter
+
+    cached, counter = asyncio.run(scenario())
+    assert table.exact_counts == 2
+    # The first caller refreshes; the others wait for it and serve what it stored
+    assert cached[0] == (10, "exact") and set(cached[1:]) == {(10, "cached")}
+    assert counter[0] == (10, "exact") and set(counter[1:]) == {(10, "counter")}
+
+
+def test_writes_adjust_the_counter_and_invalidate_the_cache():
+    table = Table()
+    counts = service(table)
+
+    async def scenario():
+        await counts.count("counter")
+        counts.record_insert(3)
+        counts.record_delete()
+        counter = await counts.count("counter")
+        cached = await counts.count("cached")  # Invalidated by the writes, so counted again
+        counts.record_delete(100)
+        return counter, cached, await counts.count("counter")
+
+    assert asyncio.run(scenario()) == ((12, "counter"), (10, "exact"), (0, "counter"))
+    assert table.exact_counts == 2
+
+
+def test_unknown_strategies_are_rejected(conversation_service):
+    with pytest.raises(ValueError, match="Unknown count strategy"):
+        asyncio.run(service(Table()).count("guess"))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(conversation_service.count_conversations("guess"))
+    assert error.value.status_code == 400
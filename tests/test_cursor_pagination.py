@@ -0,0 +1,83 @@
+import asyncio
+import base64
+import json
+
+import pytest
+
+from app.utils.cursors import decode_cursor, encode_cursor
+
+
+def create_conversations(conversation_service, count: int) -> None:
+    async def create():
+        for i in range(count):
+            await conversation_service.create_conversation(
+                {"name": f"c{i}", "participants": ["a"], "isGroup": False, "messages": []})
+
+    asyncio.run(create())
+
+
+def walk(api, url: str) -> list:
+    """Follow next_cursor from url to the last page; return the convo_ids of each page."""
+    async def scenario():
+        pages, next_url = [], url
+        while next_url:
+            status, _, body = await api("GET", next_url)
+            assert status == 200
+            body = json.loads(body)
+            pages.append([conversation["convo_id"] for conversation in body["detail"]])
+            next_url = body["_links"]["next"]["href"] if body["next_cursor"] else None
+            assert ("next" in body["_links"]) == (body["next_cursor"] is not None)
+        return pages
+
+    return asyncio.run(scenario())
+
+
+def test_cursors_round_trip_and_reject_garbage():
+    assert decode_cursor(encode_cursor({"convo_id": 42})) == {"convo_id": 42}
+    for cursor in ("not base64!", base64.urlsafe_b64encode(b"[1]").decode(), "é"):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("count, pages", [
+    (7, [[1, 2, 3], [4, 5, 6], [7]]),
+    (6, [[1, 2, 3], [4, 5, 6]]),  # A full last page is not followed by an empty one
+    (0, [[]]),
+])
+def test_walking_every_page_returns_each_conversation_once(api, conversation_service, count, pages):
+    create_conversations(conversation_service, count)
+    assert walk(api, "/conversations/?limit=3") == pages
+
+
+def test_pages_are_anchored_on_the_last_row_not_an_offset(api, conversation_service):
+    create_conversations(conversation_service, 6)
+
+    async def scenario():
+        _, _, first = await api("GET", "/conversations/?limit=3&view=summary")
+        first = json.loads(first)
+        # Rows removed before the cursor do not shift the next page, as an offset would
+        await conversation_service.resource.delete_conversation(1)
+        await conversation_service.resource.delete_conversation(2)
+        _, _, second = await api("GET", first["_links"]["next"]["href"])
+        return first, json.loads(second)
+
+    first, second = asyncio.run(scenario())
+    assert [c["convo_id"] for c in first["detail"]] == [1, 2, 3] and "messages" not in first["detail"][0]
+    assert "view=summary" in first["_links"]["next"]["href"]
+    assert [c["convo_id"] for c in second["detail"]] == [4, 5, 6] and second["next_cursor"] is None
+
+
+def test_tampered_cursors_are_rejected_with_400(api, conversation_service):
+    create_conversations(conversation_service, 2)
+    tampered = [
+        "garbage",
+        encode_cursor({"id": 1}),
+        encode_cursor({"convo_id": "one"}),
+        encode_cursor({"convo_id": [1]}),
+        base64.urlsafe_b64encode(b'"convo_id"').decode(),
+    ]
+
+    async def scenario():
+        return [(await api("GET", f"/conversations/?cursor={cursor}&limit=1"))[0] for cursor in tampered]
+
+    assert asyncio.run(scenario()) == [400] * len(tampered)
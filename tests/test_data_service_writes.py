@@ -0,0 +1,60 @@
+import pytest
+
+from framework.services.data_access.MySQLRDBDataService import MySQLRDBDataService
+
+
+class RecordingConnection:
+    """Stand-in connection recording statements; execute returns the configured row count."""
+
+    def __init__(self):
+        self.statements = []
+        self.rowcount = 1
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+        return self.rowcount
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+
+class RecordingDataService(MySQLRDBDataService):
+    def __init__(self, connection):
+        self.connection = connection
+        super().__init__({"pool_min_size": 0, "pool_max_size": 1})
+
+    def _get_connection(self):
+        return self.connection
+
+
+def test_update_and_delete_are_single_statements_with_cached_sql():
+    connection = RecordingConnection()
+    data_service = RecordingDataService(connection)
+
+    data_service.update("p1_database", "conversations", {"name": "a"}, "convo_id", 1)
+    data_service.update("p1_database", "conversations", {"name": "b"}, "convo_id", 2)
+    data_service.delete("p1_database", "conversations", "convo_id", 1)
+    assert connection.statements == [
+        "UPDATE p1_database.conversations SET name = %s WHERE convo_id = %s",
+        "UPDATE p1_database.conversations SET name = %s WHERE convo_id = %s",
+        "DELETE FROM p1_database.conversations WHERE convo_id = %s",
+    ]
+    assert data_service.statement_stats()["hits"] == 1
+
+    connection.rowcount = 0
+    with pytest.raises(Exception, match="No record found"):
+        data_service.update("p1_database", "conversations", {"name": "c"}, "convo_id", 3)
+    with pytest.raises(Exception, match="No record found"):
+        data_service.delete("p1_database", "conversations", "convo_id", 3)
@@ -0,0 +1,18 @@
+import asyncio
+import json
+
+
+def test_diagnostics_require_the_configured_token(api, monkeypatch):
+    async def statuses(headers=None):
+        return [(await api(method, url, headers=headers))[0]
+                for method, url in (("GET", "/diagnostics/cache"), ("DELETE", "/diagnostics/queries"))]
+
+    monkeypatch.delenv("DIAGNOSTICS_TOKEN", raising=False)
+    assert asyncio.run(statuses({"X-Diagnostics-Token": ""})) == [404, 404]
+
+    monkeypatch.setenv("DIAGNOSTICS_TOKEN", "secret")
+    assert asyncio.run(statuses()) == [401, 401]
+    assert asyncio.run(statuses({"X-Diagnostics-Token": "guess"})) == [401, 401]
+
+    status, _, body = asyncio.run(api("GET", "/diagnostics/cache", headers={"X-Diagnostics-Token": "secret"}))
+    assert status == 200 and "hits" in json.loads(body)
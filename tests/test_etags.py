@@ -0,0 +1,80 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.resources.conversation_resource import ConversationResource
+from app.routers import conversations as router
+from app.services.conversation_service import ConversationService
+from framework.services.cache.LRUCache import LRUCache
+from framework.services.data_access.BaseDataService import StaleRecordError
+
+
+class VersionedDataService:
+    """Stand-in data service holding conversation 7 at version 3."""
+
+    context = {}
+
+    def __init__(self):
+        self.row = {"convo_id": 7, "name": "n", "participants": "[]", "messages": None, "isGroup": 0, "version": 3}
+        self.message_reads = 0
+
+    @contextmanager
+    def transaction(self):
+        yield None
+
+    def fetch_one(self, database_name, table, key_field, key_value, columns=None, connection=None):
+        if key_value != 7:
+            return None
+        return dict(self.row) if columns is None else {column: self.row[column] for column in columns}
+
+    def fetch_many(self, database_name, table, key_field, key_values, order_by=None, columns=None):
+        self.message_reads += 1
+        return []
+
+    def update(self, database_name, table, data, key_field, key_value, connection=None, match=None, increment=None):
+        if match and match["version"] != self.row["version"]:
+            raise StaleRecordError("modified")
+        self.row.update(data)
+        self.row["version"] += 1
+
+    def delete_where(self, database_name, table, key_field, key_value, connection=None):
+        return 0
+
+    def insert_many(self, database_name, table, rows, connection=None, return_ids=True):
+        return []
+
+
+def request(method: str, **headers) -> Request:
+    return Request({
+        "type": "http", "method": method, "path": "/conversations/7", "query_string": b"",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_conditional_get_and_put(monkeypatch):
+    data_service = VersionedDataService()
+    service = ConversationService(resource=ConversationResource(data_service=data_service, cache=LRUCache()))
+    monkeypatch.setattr(router, "conversation_service", service)
+    body = {"name": "m", "participants": [], "messages": [], "isGroup": False}
+
+    async def scenario():
+        response = await router.get_conversation(7, request("GET"), fields=None, view=None)
+        assert response.headers["etag"] == '"7-3"'
+        reads = data_service.message_reads
+
+        response = await router.get_conversation(7, request("GET", if_none_match='"7-3"'), fields=None, view=None)
+        assert response.status_code == 304 and data_service.message_reads == reads
+
+        response = await router.update_conversation(7, body, request("PUT", if_match='"7-3"'))
+        assert response.headers["etag"] == '"7-4"'
+        with pytest.raises(HTTPException) as error:
+            await router.update_conversation(7, body, request("PUT", if_match='"7-3"'))
+        assert error.value.status_code == 412
+
+        response = await router.get_conversation(7, request("GET", if_none_match='"7-3"'), fields=None, view=None)
+        assert response.status_code == 200 and response.headers["etag"] == '"7-4"'
+
+    asyncio.run(scenario())
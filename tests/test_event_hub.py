@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from app.services.conversation_service import ConversationService, conversation_channel
+from framework.services.events.EventHub import EventHub, SubscriptionClosed
+from framework.services.events.InMemoryBroker import InMemoryBroker
+
+
+class AppendingResource:
+    """Stand-in resource that accepts appends to conversation 1 only."""
+
+    async def get_total_conversation_count(self):
+        return 0
+
+    async def estimate_conversation_count(self):
+        return 0
+
+    async def append_messages_batch(self, appends):
+        return [list(range(10, 10 + len(messages))) if conversation_id == 1 else None
+                for conversation_id, messages in appends]
+
+
+def test_hub_fans_out_and_drops_lagging_subscribers():
+    async def scenario():
+        hub = EventHub(InMemoryBroker(), max_queue=2)
+        fast = await hub.subscribe("c")
+        slow = await hub.subscribe("c")
+        for i in range(3):
+            await hub.publish("c", {"type": "n", "i": i})
+            assert (await fast.get(timeout=1))["i"] == i
+
+        # The slow subscriber overflowed on the third event.
+        assert (await slow.get(timeout=1))["type"] == "lagged"
+        with pytest.raises(SubscriptionClosed):
+            await slow.get(timeout=1)
+        await slow.close()
+        await fast.close()
+        return hub.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["channels"] == 0 and stats["lagged_subscribers"] == 1 and stats["published"] == 3
+
+
+def test_appended_messages_are_published_to_the_conversation_channel():
+    async def scenario():
+        service = ConversationService(resource=AppendingResource(), events=EventHub(InMemoryBroker()))
+        subscription = await service.events.subscribe(conversation_channel(1))
+        await service.append_messages(1, [{"sender": "a", "text": "hi", "timestamp": "t"}])
+        event = await subscription.get(timeout=1)
+        await subscription.close()
+        return event
+
+    event = asyncio.run(scenario())
+    assert event["type"] == "messages.appended"
+    assert event["messages"] == [{"message_id": 10, "sender": "a", "text": "hi", "timestamp": "t"}]
+
+
+def test_created_conversations_are_published_to_their_channels(conversation_service):
+    conversation = {"name": "n", "participants": ["a", "b"], "isGroup": False, "messages": []}
+
+    async def scenario():
+        hub = conversation_service.events
+        first = await hub.subscribe(conversation_channel(1))
+        created = await conversation_service.create_conversation(conversation)
+        bulk = [await hub.subscribe(conversation_channel(i)) for i in (2, 3)]
+        results = await conversation_service.create_conversations_bulk([conversation, conversation])
+        events = [await subscription.get(timeout=1) for subscription in [first] + bulk]
+        for subscription in [first] + bulk:
+            await subscription.close()
+        return created, results, events
+
+    created, results, events = asyncio.run(scenario())
+    assert created == {"convo_id": 1} and [result["convo_id"] for result in results] == [2, 3]
+    assert [(event["type"], event["convo_id"]) for event in events] == [("conversation.created", i) for i in (1, 2, 3)]
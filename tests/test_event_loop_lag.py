@@ -0,0 +1,87 @@
+import asyncio
+import gc
+import time
+
+from app.resources.conversation_resource import ConversationResource
+from app.services.conversation_service import ConversationService
+
+
+class SlowDataService:
+    """Blocking stand-in for MySQLRDBDataService: every call sleeps like a slow query."""
+
+    context = {"query_timeout": 5.0}
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def fetch_one(self, database_name, table, key_field, key_value, columns=None):
+        time.sleep(self.latency)
+        return {"convo_id": key_value, "name": "n", "participants": "[]", "messages": "[]", "isGroup": 0}
+
+    def fetch_all(self, database_name, table, columns=None):
+        time.sleep(self.latency)
+        return [{"convo_id": 1}]
+
+    def fetch_many(self, database_name, table, key_field, key_values, order_by=None, columns=None):
+        time.sleep(self.latency)
+        return []
+
+    def count_all(self, database_name, table):
+        time.sleep(self.latency)
+        return 1
+
+
+async def measure_max_lag(workload, interval: float = 0.005) -> float:
+    """Run workload while a ticker measures how late the event loop wakes it up."""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - start - interval)
+
+    # A full garbage collection of the objects the test session has built up can pause for
+    # longer than the bound, so it is run before measuring rather than during
+    gc.collect()
+    gc.disable()
+    try:
+        ticker_task = asyncio.create_task(ticker())
+        await workload()
+        done.set()
+        await ticker_task
+    finally:
+        gc.enable()
+    return max(lags)
+
+
+def test_routes_do_not_block_the_event_loop_under_concurrent_load():
+    latency = 0.05
+    service = ConversationService(resource=ConversationResource(data_service=SlowDataService(latency)))
+
+    async def workload():
+        calls = []
+        for i in range(20):
+            calls.append(service.get_conversation(i + 1))
+            calls.append(service.get_all_conversations())
+            calls.append(service.get_total_conversation_count())
+        results = await asyncio.gather(*calls)
+        assert len(results) == 60
+
+    max_lag = asyncio.run(measure_max_lag(workload))
+    # A single blocking call on the loop thread would add at least `latency` of lag.
+    assert max_lag < latency / 2, f"event loop lag {max_lag:.4f}s"
+
+
+def test_data_service_calls_time_out():
+    resource = ConversationResource(data_service=SlowDataService(0.2))
+    resource.data_service.timeout = 0.01
+
+    async def call():
+        try:
+            await resource.get_conversation(1)
+        except Exception as e:
+            return str(e)
+
+    assert "timed out" in asyncio.run(call())
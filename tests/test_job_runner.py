@@ -0,0 +1,141 @@
+import asyncio
+import json
+import os
+import time
+from contextlib import aclosing
+
+import pytest
+
+from app.routers import conversations
+from framework.services.jobs.JobRunner import JobRunner, QueueFullError, TooManyWaitersError
+from framework.services.jobs.SQLiteJobStore import SQLiteJobStore
+
+
+def test_watch_reports_transitions_until_the_task_finishes():
+    async def scenario():
+        runner = JobRunner(SQLiteJobStore(":memory:"), concurrency=1, max_waiters=1)
+        release = asyncio.Event()
+
+        async def job():
+            await release.wait()
+            return {"ok": True}
+
+        task_id = await runner.submit(job, success_status=201)
+        seen = []
+        async with aclosing(runner.watch(task_id, timeout=5)) as transitions:
+            async for task in transitions:
+                seen.append((task["status"], task["started_at"] is not None))
+                if len(seen) == 1:
+                    # The only waiter slot is taken.
+                    with pytest.raises(TooManyWaitersError):
+                        await runner.watch(task_id, timeout=5).__anext__()
+                if task["started_at"]:
+                    release.set()
+        await runner.stop()
+        return seen, task, runner.stats()
+
+    seen, task, stats = asyncio.run(scenario())
+    assert seen[-1] == ("completed", True)
+    assert ("in_progress", True) in seen
+    assert task["status_code"] == 201 and task["result"] == {"ok": True}
+    assert stats["waiters"] == 0 and stats["rejected_waiters"] == 1
+
+
+def test_watch_gives_up_after_timeout():
+    async def scenario():
+        runner = JobRunner(SQLiteJobStore(":memory:"), concurrency=1)
+        task_id = await runner.submit(asyncio.sleep, 1)
+        started = asyncio.get_running_loop().time()
+        async with aclosing(runner.watch(task_id, timeout=0.05)) as transitions:
+            last = [task async for task in transitions][-1]
+        elapsed = asyncio.get_running_loop().time() - started
+        await runner.stop(timeout=0)
+        return last, elapsed
+
+    last, elapsed = asyncio.run(scenario())
+    assert last["status"] == "in_progress" and elapsed < 0.5
+
+
+def test_completed_tasks_persist_in_the_store(tmp_path):
+    path = os.path.join(tmp_path, "tasks.db")
+
+    async def scenario():
+        runner = JobRunner(SQLiteJobStore(path), concurrency=2)
+
+        async def job(value):
+            return {"value": value}
+
+        task_ids = [await runner.submit(job, i, success_status=201) for i in range(3)]
+        await runner.stop()
+        return task_ids, runner.stats()
+
+    task_ids, stats = asyncio.run(scenario())
+    store = SQLiteJobStore(path)  # As after a restart
+    tasks = [store.get(task_id) for task_id in task_ids]
+    assert [(task["status"], task["status_code"], task["result"]) for task in tasks] == [
+        ("completed", 201, {"value": i}) for i in range(3)
+    ]
+    assert stats["completed"] == 3 and stats["running"] == 0
+    store.close()
+
+
+def test_full_queue_rejects_jobs_with_503(api, monkeypatch):
+    runner = JobRunner(SQLiteJobStore(":memory:"), concurrency=1, max_queue=1)
+    monkeypatch.setattr(conversations, "job_runner", runner)
+    body = json.dumps({"name": "n", "participants": ["a"], "isGroup": False, "messages": []}).encode()
+
+    async def scenario():
+        release = asyncio.Event()
+        await runner.submit(release.wait)  # Running
+        await asyncio.sleep(0)
+        await runner.submit(release.wait)  # Waiting
+        with pytest.raises(QueueFullError):
+            await runner.submit(release.wait)
+        status, _, response = await api("POST", "/conversations/", body, {"Content-Type": "application/json"})
+        release.set()
+        await runner.stop()
+        return status, json.loads(response)
+
+    status, response = asyncio.run(scenario())
+    assert status == 503 and "full" in response["detail"]
+    assert runner.stats()["rejected"] == 2
+
+
+def test_recovery_only_fails_tasks_of_owners_that_are_gone(tmp_path):
+    path = os.path.join(tmp_path, "tasks.db")
+    crashed = SQLiteJobStore(path, owner="crashed", lease=60)
+    live = SQLiteJobStore(path, owner="live", lease=60)
+    crashed.create("lost")
+    live.create("running")
+    crashed._connection.execute("UPDATE task_owners SET heartbeat_at = ? WHERE owner = 'crashed'",
+                                (time.time() - 120,))
+
+    restarted = SQLiteJobStore(path, owner="restarted", lease=60)  # Recovers on startup
+    assert restarted.get("lost")["status"] == "failed" and restarted.get("lost")["status_code"] == 500
+    assert restarted.get("running")["status"] == "in_progress"
+
+    restarted.create("interrupted")
+    restarted.close()  # Shutting down fails its own unfinished tasks only
+    assert live.get("interrupted")["status"] == "failed"
+    assert live.get("running")["status"] == "in_progress"
+    live.close()
+    crashed._connection.close()
+
+
+def test_finished_tasks_are_purged_after_their_ttl():
+    store = SQLiteJobStore(":memory:")
+    for task_id in ("old", "recent", "running"):
+        store.create(task_id)
+    store.complete("old", 200, None)
+    store._connection.execute("UPDATE tasks SET finished_at = ? WHERE task_id = 'old'", (time.time() - 7200,))
+    store.fail("recent", 500, "boom")
+
+    async def scenario():
+        runner = JobRunner(store, ttl=3600, purge_interval=0.01)
+        runner.start()
+        await asyncio.sleep(0.1)
+        remaining = [task_id for task_id in ("old", "recent", "running") if await runner.get(task_id)]
+        await runner.stop()
+        return remaining
+
+    assert asyncio.run(scenario()) == ["recent", "running"]
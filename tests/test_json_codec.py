@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+import pytest
+
+from framework.utils.JSONCodec import OrjsonJSONCodec, RawJSON, StdlibJSONCodec
+
+
+def codecs():
+    available = [StdlibJSONCodec()]
+    try:
+        available.append(OrjsonJSONCodec())
+    except ImportError:
+        pass
+    return available
+
+
+@pytest.mark.parametrize("codec", codecs(), ids=lambda codec: codec.name)
+def test_raw_json_is_spliced_verbatim(codec):
+    content = {
+        "detail": {"convo_id": 1, "participants": RawJSON('["a", "b"]'), "messages": RawJSON(b"[]")},
+        "text": "\x00rawjson-0:0 é",
+        "amount": Decimal("1.50"),
+    }
+    encoded = codec.dumps(content)
+    assert encoded == (
+        b'{"detail":{"convo_id":1,"participants":["a", "b"],"messages":[]},'
+        b'"text":"\\u0000rawjson-0:0 \xc3\xa9","amount":"1.50"}'
+    )
+    assert codec.loads(encoded)["detail"]["participants"] == ["a", "b"]
+    assert codec.dumps_str(["x"]) == '["x"]'
@@ -0,0 +1,32 @@
+import logging
+import os
+
+from benchmarks.load_test import compare, percentile
+from benchmarks.standin_db import StandInDataService, create_database, seed
+
+
+def test_standin_database_runs_the_data_service(tmp_path):
+    path = os.path.join(tmp_path, "p1_database.sqlite")
+    create_database(path)
+    data_service = StandInDataService({"path": path, "pool_min_size": 0, "pool_max_size": 2})
+    logging.disable(logging.INFO)
+    try:
+        ids = seed(data_service, 3, messages=2, participants=2)
+        assert ids == [1, 2, 3]  # First ID of a multi-row INSERT, as MySQL reports it
+        data_service.update("p1_database", "conversations", {"name": "x"}, "convo_id", 2, increment="version")
+        assert data_service.fetch_one("p1_database", "conversations", "convo_id", 2, columns=["version"]) == {"version": 2}
+        data_service.delete("p1_database", "conversations", "convo_id", 2)
+        assert data_service.count_all("p1_database", "messages") == 4
+    finally:
+        logging.disable(logging.NOTSET)
+        data_service.close()
+
+
+def test_percentiles_and_baseline_comparison():
+    latencies = [i / 1000 for i in range(1, 101)]
+    assert (percentile(latencies, 0.5), percentile(latencies, 0.99)) == (0.05, 0.099)
+
+    results = {"scenarios": {"a": {"latency_ms": {"p95": 13.0}}, "b": {"latency_ms": {"p95": 10.0}}}}
+    baseline = {"scenarios": {"a": {"latency_ms": {"p95": 10.0}}, "b": {"latency_ms": {"p95": 10.0}}}}
+    assert compare(results, baseline, 0.25) == ["a"]
+    assert results["scenarios"]["a"]["p95_vs_baseline"] == 1.3
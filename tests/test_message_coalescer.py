@@ -0,0 +1,120 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.message_coalescer import MessageWriteCoalescer
+
+
+class RecordingFlush:
+    """Stand-in for append_messages_batch that records each batch, one per transaction."""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+        self.next_id = 1
+
+    async def __call__(self, appends):
+        self.batches.append(appends)
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("deadlock")
+        results = []
+        for _, messages in appends:
+            results.append(list(range(self.next_id, self.next_id + len(messages))))
+            self.next_id += len(messages)
+        return results
+
+
+def message(text: str) -> dict:
+    return {"sender": "a", "text": text, "timestamp": "t"}
+
+
+def test_concurrent_appends_are_written_in_one_transaction():
+    flush = RecordingFlush()
+    coalescer = MessageWriteCoalescer(flush, window=0.05)
+
+    async def scenario():
+        return await asyncio.gather(
+            coalescer.append(1, [message("a"), message("b")]),
+            coalescer.append(2, [message("c")]),
+            coalescer.append(1, [message("d")]),
+        )
+
+    assert asyncio.run(scenario()) == [[1, 2], [3], [4]]
+    assert len(flush.batches) == 1 and [conversation_id for conversation_id, _ in flush.batches[0]] == [1, 2, 1]
+    stats = coalescer.stats()
+    assert stats["flushes"] == 1 and stats["appends"] == 3 and stats["messages"] == 4
+
+
+def test_max_batch_closes_a_batch_early():
+    flush = RecordingFlush()
+    coalescer = MessageWriteCoalescer(flush, window=10, max_batch=2)
+
+    async def scenario():
+        return await asyncio.wait_for(asyncio.gather(*[coalescer.append(i, [message(str(i))]) for i in range(4)]), 1)
+
+    assert asyncio.run(scenario()) == [[1], [2], [3], [4]]
+    assert [len(batch) for batch in flush.batches] == [2, 2]
+
+
+def test_a_failed_write_fails_every_append_in_the_batch():
+    coalescer = MessageWriteCoalescer(RecordingFlush(fail=True), window=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*[coalescer.append(i, [message(str(i))]) for i in range(3)],
+                                    return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_drain_writes_pending_appends_without_waiting_for_the_window():
+    flush = RecordingFlush()
+    coalescer = MessageWriteCoalescer(flush, window=10)
+
+    async def scenario():
+        appends = [asyncio.create_task(coalescer.append(i, [message(str(i))])) for i in range(2)]
+        await asyncio.sleep(0)
+        await asyncio.wait_for(coalescer.drain(), 1)
+        assert all(append.done() for append in appends)
+        return [append.result() for append in appends]
+
+    assert asyncio.run(scenario()) == [[1], [2]]
+    assert len(flush.batches) == 1
+
+
+def test_zero_window_writes_each_append_on_its_own():
+    flush = RecordingFlush()
+    coalescer = MessageWriteCoalescer(flush, window=0)
+
+    async def scenario():
+        return await asyncio.gather(*[coalescer.append(i, [message(str(i))]) for i in range(2)])
+
+    assert asyncio.run(scenario()) == [[1], [2]]
+    assert len(flush.batches) == 2
+    with pytest.raises(RuntimeError):
+        asyncio.run(MessageWriteCoalescer(RecordingFlush(fail=True), window=0).append(1, [message("a")]))
+
+
+def test_concurrent_appends_through_the_service_share_one_transaction(conversation_service, data_service, monkeypatch):
+    transactions = []
+    transaction = data_service.transaction
+
+    def counting_transaction(*args, **kwargs):
+        transactions.append(1)
+        return transaction(*args, **kwargs)
+
+    conversation = {"name": "n", "participants": ["a"], "isGroup": False, "messages": []}
+
+    async def scenario():
+        for _ in range(2):
+            await conversation_service.create_conversation(conversation)
+        monkeypatch.setattr(data_service, "transaction", counting_transaction)
+        message_ids = await asyncio.gather(*[conversation_service.append_messages(i, [message(f"m{i}")])
+                                             for i in (1, 2, 1)])
+        return message_ids, await conversation_service.resource.get_conversation(1)
+
+    message_ids, stored = asyncio.run(scenario())
+    assert message_ids == [[1], [2], [3]] and len(transactions) == 1
+    assert [m["text"] for m in json.loads(stored["messages"])] == ["m1", "m1"]
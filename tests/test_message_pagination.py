@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.resources.conversation_resource import ConversationResource
+from app.services.conversation_service import ConversationService
+from framework.services.cache.LRUCache import LRUCache
+
+
+class MessageTableDataService:
+    """Stand-in data service holding one conversation with 7 messages."""
+
+    context = {}
+
+    def __init__(self):
+        self.messages = [{"message_id": i, "convo_id": 1, "sender": "a", "text": f"m{i}", "timestamp": "t"}
+                         for i in range(1, 8)]
+        self.limits = []
+
+    def fetch_range(self, database_name, table, key_field, limit, after=None, before=None,
+                    descending=False, columns=None, filters=None):
+        self.limits.append(limit)
+        rows = [row for row in self.messages
+                if all(row[field] == value for field, value in filters.items())
+                and (before is None or row[key_field] < before)]
+        rows.sort(key=lambda row: row[key_field], reverse=descending)
+        return [{column: row[column] for column in columns} for row in rows[:limit]]
+
+    def existing_keys(self, database_name, table, key_field, key_values):
+        return {value for value in key_values if value == 1}
+
+
+def test_messages_are_paged_newest_first_with_a_cursor():
+    data_service = MessageTableDataService()
+    service = ConversationService(resource=ConversationResource(data_service=data_service, cache=LRUCache()))
+
+    async def scenario():
+        pages = []
+        before = None
+        while True:
+            page = await service.get_messages(1, before, 3)
+            pages.append([message["text"] for message in page["messages"]])
+            before = page["next_cursor"]
+            if before is None:
+                return pages
+
+    assert asyncio.run(scenario()) == [["m5", "m6", "m7"], ["m2", "m3", "m4"], ["m1"]]
+    assert data_service.limits == [4, 4, 4]
+
+
+def test_messages_of_missing_conversation_is_404():
+    service = ConversationService(resource=ConversationResource(data_service=MessageTableDataService(), cache=LRUCache()))
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(service.get_messages(2, None, 3))
+    assert error.value.status_code == 404
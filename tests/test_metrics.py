@@ -0,0 +1,72 @@
+import asyncio
+
+from fastapi import FastAPI
+
+from framework.middleware.MetricsMiddleware import REQUEST_SECONDS, MetricsMiddleware
+from framework.services.metrics.Metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("query_seconds", "Query time.", ["method"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "fetch_one")
+    registry.counter("queries_total", "Queries.").inc(amount=2)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE query_seconds histogram" in lines
+    assert 'query_seconds_bucket{method="fetch_one",le="0.1"} 2' in lines  # Upper bounds are inclusive
+    assert 'query_seconds_bucket{method="fetch_one",le="1"} 3' in lines
+    assert 'query_seconds_bucket{method="fetch_one",le="+Inf"} 4' in lines
+    assert 'query_seconds_sum{method="fetch_one"} 3.65' in lines
+    assert 'query_seconds_count{method="fetch_one"} 4' in lines
+    assert "queries_total 2" in lines
+
+
+def test_collectors_and_label_escaping():
+    registry = MetricsRegistry()
+
+    def pools():
+        yield "db_pool_in_use_connections", "gauge", "Checked out.", [({"pool": 'a"b'}, 3)]
+
+    def broken():
+        raise RuntimeError("unavailable")
+
+    registry.register_collector(broken)
+    registry.register_collector(pools)
+    assert 'db_pool_in_use_connections{pool="a\\"b"} 3' in registry.render().splitlines()
+
+
+def test_middleware_labels_requests_by_route_template():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"item_id": item_id}
+
+    app.add_middleware(MetricsMiddleware)
+
+    async def request(path: str):
+        scope = {"type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+                 "headers": [], "root_path": "", "scheme": "http", "server": ("test", 80)}
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        await app(scope, receive, send)
+        return messages[0]["status"]
+
+    def count(*labels) -> int:
+        return dict(((suffix, tuple(labels.values())), value) for suffix, labels, value in REQUEST_SECONDS.samples()
+                    ).get(("_count", labels), 0)
+
+    before = count("GET", "/items/{item_id}", "200"), count("GET", "unmatched", "404")
+    assert asyncio.run(request("/items/1")) == 200
+    assert asyncio.run(request("/items/2")) == 200
+    assert asyncio.run(request("/missing")) == 404
+    assert count("GET", "/items/{item_id}", "200") == before[0] + 2
+    assert count("GET", "unmatched", "404") == before[1] + 1
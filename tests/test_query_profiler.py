@@ -0,0 +1,34 @@
+import os
+
+from benchmarks.standin_db import StandInDataService, create_database
+from framework.services.data_access.QueryProfiler import QueryProfiler, query_shape
+
+
+def test_query_shape_redacts_values_and_collapses_lists():
+    assert query_shape("SELECT * FROM p1_database.messages WHERE convo_id IN (%s, %s, %s) AND name = 'x' LIMIT 50") == \
+        "SELECT * FROM p1_database.messages WHERE convo_id IN (...) AND name = ? LIMIT ?"
+    assert query_shape("INSERT INTO p1_database.messages (convo_id, text) VALUES (%s, %s), (%s, %s), (%s, %s)") == \
+        "INSERT INTO p1_database.messages (convo_id, text) VALUES (?, ?), ..."
+
+
+def test_statements_are_profiled_and_slow_ones_explained(tmp_path):
+    path = os.path.join(tmp_path, "profile.sqlite")
+    create_database(path)
+    profiler = QueryProfiler(slow_threshold=0.0, explain=True)
+    data_service = StandInDataService({"path": path, "query_profiler": profiler})
+    for name in ("secret-a", "secret-b", "secret-c"):
+        data_service.insert("p1_database", "conversations", {"name": name, "participants": "[]", "isGroup": 0})
+    data_service.fetch_many("p1_database", "conversations", "convo_id", [1, 2])
+    data_service.fetch_many("p1_database", "conversations", "convo_id", [1, 2, 3])
+
+    report = profiler.report(sort="calls")
+    insert, fetch_many = report["queries"][:2]
+    assert insert["calls"] == 3 and insert["rows_avg"] == 1 and insert["shape"].startswith("INSERT")
+    assert fetch_many["calls"] == 2 and "IN (...)" in fetch_many["shape"]
+    # Every statement is slow at a 0s threshold; each shape is explained once per explain_interval
+    slow = [entry for entry in report["recent_slow"] if entry["shape"] == fetch_many["shape"]]
+    assert len(slow) == 2 and [bool(entry.get("explain")) for entry in slow] == [False, True]
+    assert "secret" not in str(report)  # Parameters are never kept
+
+    profiler.reset()
+    assert profiler.report()["queries"] == []
@@ -0,0 +1,82 @@
+import contextvars
+import os
+
+import pytest
+from starlette.datastructures import Headers
+
+from framework.middleware.ReadYourWrites import ReadYourWrites
+from framework.services.data_access.ReplicatedDataService import ReplicatedDataService, prefer_primary
+from framework.services.data_access.SQLiteRDBDataService import SQLiteRDBDataService
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS p1_database.conversations (convo_id INTEGER PRIMARY KEY, name TEXT);"
+
+
+class UnreachableReplica:
+    """Stand-in replica whose every read fails as if the server were down."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_one(self, *args, **kwargs):
+        self.calls += 1
+        raise ConnectionRefusedError("replica down")
+
+
+def database(tmp_path, name: str) -> SQLiteRDBDataService:
+    # Separate files with no replication between them, so the routing is visible in the results
+    path = os.path.join(tmp_path, f"{name}.db")
+    with open(os.path.join(tmp_path, "schema.sql"), "w") as f:
+        f.write(SCHEMA)
+    return SQLiteRDBDataService({"path": path, "schema": os.path.join(tmp_path, "schema.sql")})
+
+
+def test_reads_go_to_replicas_and_writes_to_the_primary(tmp_path):
+    primary, replica_a, replica_b = (database(tmp_path, name) for name in ("primary", "a", "b"))
+    replica_a.insert("p1_database", "conversations", {"convo_id": 1, "name": "on a"})
+    replica_b.insert("p1_database", "conversations", {"convo_id": 1, "name": "on b"})
+    service = ReplicatedDataService(primary, {"a": replica_a, "b": replica_b})
+
+    service.insert("p1_database", "conversations", {"convo_id": 1, "name": "on primary"})
+    names = {service.fetch_one("p1_database", "conversations", "convo_id", 1)["name"] for _ in range(4)}
+    assert names == {"on a", "on b"}
+
+    with service.transaction() as connection:
+        row = service.fetch_one("p1_database", "conversations", "convo_id", 1, connection=connection)
+    assert row["name"] == "on primary"
+
+    context = contextvars.copy_context()
+    context.run(prefer_primary.set, True)
+    assert context.run(service.fetch_one, "p1_database", "conversations", "convo_id", 1)["name"] == "on primary"
+    assert service.pool_stats()["primary_reads"] == 1
+
+
+def test_unreachable_replica_is_ejected(tmp_path):
+    primary = database(tmp_path, "primary")
+    primary.insert("p1_database", "conversations", {"convo_id": 1, "name": "on primary"})
+    replica = UnreachableReplica()
+    service = ReplicatedDataService(primary, {"down": replica}, eject_after=2, eject_seconds=60)
+
+    for _ in range(4):
+        assert service.fetch_one("p1_database", "conversations", "convo_id", 1)["name"] == "on primary"
+    assert replica.calls == 2  # Ejected after the second failure
+    stats = service.pool_stats()
+    assert stats["replicas"]["down"]["ejected"] and stats["fallbacks"] == 2
+
+
+def test_read_your_writes_window():
+    read_your_writes = ReadYourWrites(window=60)
+    read_your_writes.record_write("client-1")
+    assert read_your_writes.pinned("client-1") and not read_your_writes.pinned("client-2")
+    assert not ReadYourWrites(window=0).pinned("client-1")
+
+
+def test_only_clients_that_send_an_id_are_pinned():
+    read_your_writes = ReadYourWrites(window=60)
+    # Two clients behind the same proxy, which do not send an ID: the writer does not pin the reader
+    writer, reader = Headers({"X-Forwarded-For": "10.0.0.1"}), Headers({"X-Forwarded-For": "10.0.0.2"})
+    read_your_writes.record_write(read_your_writes.client_key(writer))
+    assert not read_your_writes.pinned(read_your_writes.client_key(reader))
+    assert read_your_writes.stats()["clients"] == 0
+
+    read_your_writes.record_write(read_your_writes.client_key(Headers({"X-Client-Id": "client-1"})))
+    assert read_your_writes.pinned(read_your_writes.client_key(Headers({"x-client-id": "client-1"})))
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from framework.services.service_factory import SCOPED, TRANSIENT, BaseServiceFactory
+
+
+class Service:
+    def __init__(self, name: str, events: list):
+        self.name = name
+        self.events = events
+
+
+class Startable(Service):
+    async def start(self):
+        self.events.append(f"start {self.name}")
+
+    async def stop(self):
+        self.events.append(f"stop {self.name}")
+
+
+class Closeable(Service):
+    def close(self):
+        self.events.append(f"close {self.name}")
+
+
+def factory(events: list):
+    class Factory(BaseServiceFactory):
+        lifetimes = {"request": SCOPED, "connection": TRANSIENT}
+        startup_services = ("api",)
+
+        @classmethod
+        def create_service(cls, service_name):
+            if service_name == "api":
+                cls.get_service("pool")  # Dependencies are created, and so stopped, around it
+                return Startable("api", events)
+            if service_name == "pool":
+                return Closeable("pool", events)
+            return Startable(service_name, events)
+
+    return Factory
+
+
+def test_singletons_are_created_once_and_transients_every_time():
+    Factory = factory([])
+    assert Factory.get_service("pool") is Factory.get_service("pool")
+    assert Factory.get_service("connection") is not Factory.get_service("connection")
+    assert Factory.lazy("pool").name == "pool"
+
+
+def test_scoped_services_live_as_long_as_their_scope():
+    events = []
+    Factory = factory(events)
+
+    async def request():
+        async with Factory.scope():
+            assert Factory.get_service("request") is Factory.get_service("request")
+            assert events == []
+        assert events == ["stop request"]
+
+    asyncio.run(request())
+    with pytest.raises(RuntimeError):
+        Factory.get_service("request")
+
+
+def test_startup_starts_and_shutdown_stops_in_reverse_creation_order():
+    events = []
+    Factory = factory(events)
+
+    async def lifespan():
+        await Factory.startup()
+        events.append("serving")
+        await Factory.shutdown()
+
+    asyncio.run(lifespan())
+    assert events == ["start api", "serving", "stop api", "close pool"]
+    assert Factory._instances == {}
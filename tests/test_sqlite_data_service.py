@@ -0,0 +1,69 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.service_factory import ServiceFactory
+from framework.services.data_access.BaseDataService import StaleRecordError
+from framework.services.data_access.SQLiteRDBDataService import SQLiteRDBDataService
+
+
+@pytest.fixture
+def data_service(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", os.path.join(tmp_path, "p1_database.db"))
+    service = ServiceFactory.create_service('ConversationResourceService')
+    yield service
+    service.close()
+
+
+def test_factory_selects_sqlite_with_schema(data_service):
+    assert isinstance(data_service, SQLiteRDBDataService)
+    assert data_service.count_all("p1_database", "conversations") == 0
+
+
+def test_writes_match_the_mysql_semantics(data_service):
+    rows = [{"name": f"c{i}", "participants": "[]", "isGroup": 0} for i in range(3)]
+    with data_service.transaction() as connection:
+        ids = data_service.insert_many("p1_database", "conversations", rows, connection=connection, chunk_size=2)
+        data_service.insert_many("p1_database", "messages", [
+            {"convo_id": ids[0], "sender": "a", "text": str(n), "timestamp": "t"} for n in range(5)
+        ], connection=connection)
+    assert ids == [1, 2, 3]
+
+    data_service.update("p1_database", "conversations", {"name": "x"}, "convo_id", 1, match={"version": 1},
+                        increment="version")
+    with pytest.raises(StaleRecordError):
+        data_service.update("p1_database", "conversations", {"name": "y"}, "convo_id", 1, match={"version": 1})
+    with pytest.raises(Exception, match="No record found"):
+        data_service.update("p1_database", "conversations", {"name": "y"}, "convo_id", 9)
+    assert data_service.increment("p1_database", "conversations", "version", "convo_id", [1, 2, 9]) == 2
+    assert data_service.fetch_one("p1_database", "conversations", "convo_id", 1, columns=["name", "version"]) == \
+        {"name": "x", "version": 3}
+
+    page = data_service.fetch_range("p1_database", "messages", "message_id", 2, before=5, descending=True,
+                                    filters={"convo_id": 1}, columns=["message_id"])
+    assert page == [{"message_id": 4}, {"message_id": 3}]
+
+    with pytest.raises(RuntimeError):
+        with data_service.transaction() as connection:
+            data_service.delete("p1_database", "conversations", "convo_id", 2, connection=connection)
+            raise RuntimeError("roll back")
+    assert data_service.existing_keys("p1_database", "conversations", "convo_id", [1, 2, 3, 4]) == {1, 2, 3}
+
+    data_service.delete("p1_database", "conversations", "convo_id", 1)
+    assert data_service.count_all("p1_database", "messages") == 0  # ON DELETE CASCADE
+    with pytest.raises(Exception, match="No record found"):
+        data_service.delete("p1_database", "conversations", "convo_id", 1)
+
+
+def test_threads_get_their_own_connections_and_streams_can_move(data_service):
+    data_service.insert_many("p1_database", "conversations",
+                             [{"name": f"c{i}", "participants": "[]", "isGroup": 0} for i in range(5)])
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        counts = list(executor.map(lambda _: data_service.count_all("p1_database", "conversations"), range(6)))
+        stream = data_service.stream_all("p1_database", "conversations", batch_size=2, order_by="convo_id")
+        batches = [executor.submit(next, stream).result() for _ in range(3)]
+    assert counts == [5] * 6
+    assert [[row["convo_id"] for row in batch] for batch in batches] == [[1, 2], [3, 4], [5]]
+    assert 2 <= data_service.pool_stats()["size"] <= 4
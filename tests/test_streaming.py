@@ -0,0 +1,102 @@
+import asyncio
+import json
+import os
+from contextlib import aclosing
+
+import pytest
+
+from app.resources.conversation_resource import ConversationResource
+from app.routers import conversations
+from benchmarks.standin_db import StandInDataService, create_database
+from framework.services.cache.LRUCache import LRUCache
+from framework.services.data_access.ReplicatedDataService import ReplicatedDataService
+
+
+@pytest.fixture
+def seeded(data_service):
+    """The stand-in data service holding 5 conversations of 2 messages."""
+    with data_service.transaction() as connection:
+        ids = data_service.insert_many("p1_database", "conversations", [
+            {"name": f"c{i}", "participants": '["a", "b"]', "isGroup": False} for i in range(5)
+        ], connection=connection)
+        data_service.insert_many("p1_database", "messages", [
+            {"convo_id": conversation_id, "sender": "a", "text": f"m{n}", "timestamp": "t"}
+            for conversation_id in ids for n in range(2)
+        ], connection=connection)
+    return data_service
+
+
+def in_use(data_service) -> int:
+    return data_service.pool_stats()["in_use"]
+
+
+@pytest.mark.parametrize("stream_format", ["ndjson", "json"])
+def test_streamed_listings_are_well_formed(api, conversation_service, monkeypatch, stream_format):
+    monkeypatch.setattr(conversations, "STREAM_BATCH_SIZE", 2)  # Several chunks, and a partial last one
+
+    async def create():
+        for i in range(5):
+            await conversation_service.create_conversation(
+                {"name": f"c{i}", "participants": ["a"], "isGroup": False,
+                 "messages": [{"sender": "a", "text": f"m{i}", "timestamp": "t"}]})
+
+    asyncio.run(create())
+    status, headers, body = asyncio.run(api("GET", f"/conversations/?stream={stream_format}"))
+    assert status == 200
+    if stream_format == "ndjson":
+        assert headers["content-type"].startswith("application/x-ndjson") and body.endswith(b"\n")
+        listed = [json.loads(line) for line in body.splitlines()]
+    else:
+        assert headers["content-type"].startswith("application/json")
+        listed = json.loads(body)["detail"]
+    assert [c["convo_id"] for c in listed] == [1, 2, 3, 4, 5]
+    assert listed[4]["messages"] == [{"sender": "a", "text": "m4", "timestamp": "t"}]
+
+
+def test_empty_streams_are_well_formed(api):
+    assert asyncio.run(api("GET", "/conversations/?stream=ndjson"))[2] == b""
+    assert json.loads(asyncio.run(api("GET", "/conversations/?stream=json"))[2]) == {"detail": []}
+
+
+def test_stream_all_holds_one_connection_and_releases_it(seeded):
+    batches = seeded.stream_all("p1_database", "conversations", batch_size=2, order_by="convo_id")
+    assert [len(rows) for rows in batches] == [2, 2, 1]
+    assert in_use(seeded) == 0 and seeded.pool_stats()["discarded"] == 0
+
+    batches = seeded.stream_all("p1_database", "conversations", batch_size=2, order_by="convo_id")
+    next(batches)
+    assert in_use(seeded) == 1
+    batches.close()  # Closed early: the connection, with rows still pending, is dropped
+    assert in_use(seeded) == 0 and seeded.pool_stats()["discarded"] == 1
+
+
+def test_closing_a_streamed_listing_early_releases_its_connection(seeded):
+    resource = ConversationResource(data_service=seeded, cache=LRUCache())
+
+    async def scenario():
+        async with aclosing(resource.stream_conversations(batch_size=2)) as batches:
+            async for first in batches:
+                assert in_use(seeded) == 1
+                break
+        return first
+
+    first = asyncio.run(scenario())
+    assert [c["convo_id"] for c in first] == [1, 2] and len(json.loads(first[0]["messages"])) == 2
+    assert in_use(seeded) == 0
+    resource.data_service.shutdown()
+
+
+def test_replicated_streams_release_the_replica(seeded, tmp_path):
+    path = os.path.join(tmp_path, "primary.sqlite")
+    create_database(path)
+    primary = StandInDataService({"path": path, "pool_min_size": 0, "pool_max_size": 1})
+    service = ReplicatedDataService(primary, {"replica": seeded})
+
+    batches = service.stream_all("p1_database", "conversations", batch_size=2, order_by="convo_id")
+    assert [row["convo_id"] for row in next(batches)] == [1, 2]  # Read from the replica
+    assert service.pool_stats()["replicas"]["replica"]["in_flight"] == 1 and in_use(seeded) == 1
+    batches.close()
+    stats = service.pool_stats()
+    assert stats["replicas"]["replica"]["in_flight"] == 0 and in_use(seeded) == 0
+    assert stats["primary"]["checkouts"] == 0
+    primary.close()
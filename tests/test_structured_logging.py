@@ -0,0 +1,58 @@
+import contextvars
+import json
+import logging
+import logging.handlers
+
+from framework.utils.StructuredLogging import (JSONFormatter, LazyQueueHandler, SamplingFilter, TraceIdFilter,
+                                               trace_id_var)
+
+
+def queued_logger(name: str, max_size: int = 100):
+    handler = LazyQueueHandler(max_size)
+    handler.addFilter(TraceIdFilter())
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    return logger, handler.queue
+
+
+def test_records_are_queued_unformatted_and_carry_the_trace_id():
+    logger, records = queued_logger("test_structured_logging.lazy")
+    participants = ["a"]
+
+    def handle_request():
+        trace_id_var.set("trace-1")
+        logger.info("Conversation %s retrieved", 7, extra={"status": 200})
+        logger.info("Participants %s", participants)
+
+    contextvars.copy_context().run(handle_request)
+    participants.append("b")
+
+    lazy, eager = records.get_nowait(), records.get_nowait()
+    assert lazy.args == (7,)  # Immutable arguments are left for the listener to format
+    assert eager.getMessage() == "Participants ['a']"  # ... mutable ones are merged at the call
+    entry = json.loads(JSONFormatter().format(lazy))
+    assert entry["message"] == "Conversation 7 retrieved"
+    assert entry["trace_id"] == "trace-1" and entry["status"] == 200 and entry["level"] == "INFO"
+
+
+def test_full_queue_drops_records():
+    logger, records = queued_logger("test_structured_logging.full", max_size=2)
+    for i in range(5):
+        logger.info("record %s", i)
+    assert records.qsize() == 2
+
+
+def test_sampling_keeps_or_drops_whole_requests():
+    sampling = SamplingFilter({logging.INFO: 0.5})
+
+    def record(level: int, trace_id: str) -> logging.LogRecord:
+        record = logging.LogRecord("test", level, "", 0, "message", (), None)
+        record.trace_id = trace_id
+        return record
+
+    kept = [trace_id for trace_id in map(str, range(1000)) if sampling.filter(record(logging.INFO, trace_id))]
+    assert 400 < len(kept) < 600
+    assert all(sampling.filter(record(logging.INFO, trace_id)) for trace_id in kept)
+    assert all(sampling.filter(record(logging.WARNING, str(i))) for i in range(100))